@@ -0,0 +1,12 @@
+"""
+Performance benchmarks for verboselib.
+
+Each module is runnable on its own from the root of the repository, e.g.:
+
+  python -m benchmarks.bench_contention
+
+The suite of benchmarks with results stored as JSON is run by:
+
+  python -m benchmarks run --output results.json
+
+"""
@@ -0,0 +1,284 @@
+"""
+Run the suite of benchmarks and store results as JSON, or compare results of
+two runs.
+
+  python -m benchmarks run --output results.json
+  python -m benchmarks compare baseline.json results.json --threshold 0.1
+
+"""
+import argparse
+import datetime
+import fnmatch
+import json
+import os
+import platform
+import sys
+
+if sys.version_info >= (3, 9):
+  Dict = dict
+  List = list
+else:
+  from typing import Dict
+  from typing import List
+
+from typing import NamedTuple
+from typing import Optional
+
+from verboselib.version import VERSION
+
+
+RESULTS_FORMAT_VERSION = 1
+
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.1
+
+QUICK_REPEAT = 1
+QUICK_SCALE = 0.05
+
+STATUS_OK          = "ok"
+STATUS_REGRESSION  = "regression"
+STATUS_IMPROVEMENT = "improvement"
+STATUS_NEW         = "new"
+STATUS_MISSING     = "missing"
+
+
+class Comparison(NamedTuple):
+  name:     str
+  baseline: Optional[float]
+  current:  Optional[float]
+  status:   str
+
+  @property
+  def ratio(self) -> Optional[float]:
+    if self.baseline is None or self.current is None:
+      return None
+    return self.current / self.baseline
+
+
+def get_environment() -> Dict[str, object]:
+  return {
+    "python":         platform.python_version(),
+    "implementation": platform.python_implementation(),
+    "platform":       platform.platform(),
+    "machine":        platform.machine(),
+    "cpu_count":      os.cpu_count(),
+    "verboselib":     VERSION,
+  }
+
+
+def select_benchmarks(patterns: Optional[List[str]]):
+  from .suite import BENCHMARKS
+
+  if not patterns:
+    return list(BENCHMARKS)
+
+  return [
+    x
+    for x in BENCHMARKS
+    if any(fnmatch.fnmatchcase(x.name, pattern) for pattern in patterns)
+  ]
+
+
+def run_benchmarks(patterns: Optional[List[str]], repeat: int, scale: float, verbose: bool=True) -> Dict[str, object]:
+  from .suite import Config
+
+  config = Config(repeat=repeat, scale=scale)
+  results = {}
+
+  for benchmark in select_benchmarks(patterns):
+    seconds = benchmark.func(config)
+    results[benchmark.name] = {
+      "seconds":     seconds,
+      "description": benchmark.description,
+    }
+
+    if verbose:
+      print(f"{benchmark.name:<28} {format_seconds(seconds):>12}", flush=True)
+
+  return {
+    "format":      RESULTS_FORMAT_VERSION,
+    "created_at":  datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    "environment": get_environment(),
+    "config":      {"repeat": repeat, "scale": scale},
+    "results":     results,
+  }
+
+
+def compare_results(
+  baseline: Dict[str, object],
+  current: Dict[str, object],
+  threshold: float,
+) -> List[Comparison]:
+  """
+  Compare times of benchmarks of two runs. A benchmark is regressed if its
+  time has grown by more than ``threshold`` (a fraction of the baseline
+  time), and is improved if its baseline time is that much greater.
+
+  """
+  baseline_results = baseline["results"]
+  current_results = current["results"]
+  result = []
+
+  for name in sorted(baseline_results.keys() | current_results.keys()):
+    if name not in current_results:
+      result.append(Comparison(name, baseline_results[name]["seconds"], None, STATUS_MISSING))
+      continue
+
+    if name not in baseline_results:
+      result.append(Comparison(name, None, current_results[name]["seconds"], STATUS_NEW))
+      continue
+
+    old = baseline_results[name]["seconds"]
+    new = current_results[name]["seconds"]
+
+    if new > old * (1 + threshold):
+      status = STATUS_REGRESSION
+    elif old > new * (1 + threshold):
+      status = STATUS_IMPROVEMENT
+    else:
+      status = STATUS_OK
+
+    result.append(Comparison(name, old, new, status))
+
+  return result
+
+
+def format_seconds(value: Optional[float]) -> str:
+  if value is None:
+    return "-"
+
+  for unit, multiplier in [("s", 1), ("ms", 1e3), ("us", 1e6), ]:
+    if value * multiplier >= 1:
+      return f"{value * multiplier:.3f} {unit}"
+
+  return f"{value * 1e9:.1f} ns"
+
+
+def load_results(path: str) -> Dict[str, object]:
+  with open(path, "r", encoding="utf-8") as f:
+    result = json.load(f)
+
+  if result.get("format") != RESULTS_FORMAT_VERSION:
+    raise ValueError(f"unsupported format of results (path={path})")
+
+  return result
+
+
+def run(args: argparse.Namespace) -> int:
+  if args.quick:
+    repeat, scale = QUICK_REPEAT, QUICK_SCALE
+  else:
+    repeat, scale = args.repeat, 1.0
+
+  results = run_benchmarks(args.benchmarks, repeat=repeat, scale=scale)
+
+  if args.output:
+    with open(args.output, "w", encoding="utf-8") as f:
+      json.dump(results, f, indent=2, sort_keys=True)
+      f.write("\n")
+
+  return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+  baseline = load_results(args.baseline)
+  current = load_results(args.current)
+
+  if baseline["environment"] != current["environment"]:
+    print("warning: results were taken in different environments", file=sys.stderr)
+  if baseline["config"] != current["config"]:
+    print("warning: results were taken with different configs", file=sys.stderr)
+
+  comparisons = compare_results(baseline, current, args.threshold)
+
+  print(f"{'benchmark':<28} {'baseline':>12} {'current':>12} {'ratio':>7}  status")
+  for x in comparisons:
+    ratio = "-" if x.ratio is None else f"{x.ratio:.2f}"
+    print(
+      f"{x.name:<28} {format_seconds(x.baseline):>12} {format_seconds(x.current):>12} "
+      f"{ratio:>7}  {x.status}"
+    )
+
+  regressions = [x for x in comparisons if x.status == STATUS_REGRESSION]
+  if regressions:
+    print(
+      f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}",
+      file=sys.stderr,
+    )
+    return 1
+
+  return 0
+
+
+def list_benchmarks(args: argparse.Namespace) -> int:
+  for x in select_benchmarks(args.benchmarks):
+    print(f"{x.name:<28} {x.description}")
+
+  return 0
+
+
+def make_parser() -> argparse.ArgumentParser:
+  parser = argparse.ArgumentParser(
+    prog="python -m benchmarks",
+    description=__doc__.strip().splitlines()[0],
+  )
+  subparsers = parser.add_subparsers(dest="command")
+  subparsers.required = True
+
+  run_parser = subparsers.add_parser("run", help="run benchmarks")
+  run_parser.set_defaults(func=run)
+  run_parser.add_argument(
+    "-b", "--benchmark",
+    dest="benchmarks",
+    action="append",
+    help="glob-style pattern of names of benchmarks to run, ex: 'lookup.*'; can be specified multiple times (default: all)",
+  )
+  run_parser.add_argument(
+    "-o", "--output",
+    help="path to a JSON file to store results to",
+  )
+  run_parser.add_argument(
+    "-r", "--repeat",
+    type=int,
+    default=DEFAULT_REPEAT,
+    help=f"number of measurements to take the best one from (default: {DEFAULT_REPEAT})",
+  )
+  run_parser.add_argument(
+    "--quick",
+    action="store_true",
+    help="run a single measurement of scaled down inputs, e.g., as a smoke test",
+  )
+
+  compare_parser = subparsers.add_parser("compare", help="compare results of two runs")
+  compare_parser.set_defaults(func=compare)
+  compare_parser.add_argument("baseline", help="path to a JSON file with baseline results")
+  compare_parser.add_argument("current", help="path to a JSON file with current results")
+  compare_parser.add_argument(
+    "-t", "--threshold",
+    type=float,
+    default=DEFAULT_THRESHOLD,
+    help=(
+      "max allowed growth of time as a fraction of the baseline time; "
+      f"the command fails if it's exceeded (default: {DEFAULT_THRESHOLD})"
+    ),
+  )
+
+  list_parser = subparsers.add_parser("list", help="list benchmarks")
+  list_parser.set_defaults(func=list_benchmarks)
+  list_parser.add_argument(
+    "-b", "--benchmark",
+    dest="benchmarks",
+    action="append",
+    help="glob-style pattern of names of benchmarks to list; can be specified multiple times (default: all)",
+  )
+
+  return parser
+
+
+def main() -> None:
+  args = make_parser().parse_args()
+  sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,84 @@
+"""
+Compare per-message overhead of batch translation methods with loops.
+
+"""
+import argparse
+import timeit
+
+from verboselib import Translations
+from verboselib import set_language
+
+from tests.constants import LOCALE_DIR_PATH
+from tests.constants import LOCALE_DOMAIN
+
+
+DEFAULT_MESSAGES_COUNTS = [10, 100, 1000, ]
+DEFAULT_REPEAT = 5
+
+
+def make_cases(translations: Translations, count: int):
+  messages = ["verboselib test string", "Good morning, {:}!", "missing", ] * count
+  messages = messages[:count]
+
+  plurals = [("window", "windows", i) for i in range(count)]
+  contexts = [("abbrev. month", "Jan")] * count
+
+  _ = translations.gettext
+  N_ = translations.ngettext
+  P_ = translations.pgettext
+
+  return [
+    (
+      "gettext",
+      lambda: [_(x) for x in messages],
+      lambda: translations.gettext_many(messages),
+    ),
+    (
+      "ngettext",
+      lambda: [N_(s, p, n) for s, p, n in plurals],
+      lambda: translations.ngettext_many(plurals),
+    ),
+    (
+      "pgettext",
+      lambda: [P_(c, m) for c, m in contexts],
+      lambda: translations.pgettext_many(contexts),
+    ),
+  ]
+
+
+def measure(func, count: int, repeat: int) -> float:
+  number = max(1, 100000 // count)
+  best = min(timeit.repeat(func, number=number, repeat=repeat))
+  return best / number / count * 1e9
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument(
+    "-c", "--count",
+    type=int,
+    action="append",
+    help=f"number of messages per batch; can be specified multiple times (default: {DEFAULT_MESSAGES_COUNTS})",
+  )
+  parser.add_argument(
+    "-r", "--repeat",
+    type=int,
+    default=DEFAULT_REPEAT,
+    help=f"number of measurements to take the best one from (default: {DEFAULT_REPEAT})",
+  )
+  args = parser.parse_args()
+
+  translations = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH)
+  set_language("uk")
+
+  print(f"{'method':>10} {'messages':>10} {'loop, ns/msg':>14} {'batch, ns/msg':>14}")
+
+  for count in (args.count or DEFAULT_MESSAGES_COUNTS):
+    for name, loop, batch in make_cases(translations, count):
+      loop_ns = measure(loop, count, args.repeat)
+      batch_ns = measure(batch, count, args.repeat)
+      print(f"{name:>10} {count:>10} {loop_ns:>14.1f} {batch_ns:>14.1f}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,102 @@
+"""
+Compare preloading of catalogs of many locales from a locale dir and from
+a single bundle file.
+
+"""
+import argparse
+import itertools
+import string
+import tempfile
+import time
+
+from pathlib import Path
+
+from verboselib import CatalogBundle
+from verboselib import DictTranslations
+from verboselib import MmapTranslations
+from verboselib import Translations
+
+
+DEFAULT_LOCALES_COUNT = 500
+DEFAULT_ROUNDS = 5
+
+DOMAIN = "messages"
+
+MO_FILE_PATH = Path(__file__).absolute().parent.parent / "tests" / "locale" / "uk" / "LC_MESSAGES" / "tests.mo"
+
+
+def make_locale_names(count: int):
+  names = (
+    "".join(x)
+    for x in itertools.product(string.ascii_lowercase, repeat=3)
+  )
+  return list(itertools.islice(names, count))
+
+
+def make_locale_dir(root: Path, locales) -> None:
+  content = MO_FILE_PATH.read_bytes()
+
+  for locale in locales:
+    dir_path = root / locale / "LC_MESSAGES"
+    dir_path.mkdir(parents=True)
+    (dir_path / f"{DOMAIN}.mo").write_bytes(content)
+
+
+def preload_from_dir(root: Path, catalog_class) -> int:
+  translations = Translations(DOMAIN, root, catalog_class=catalog_class)
+  return len(translations.preload())
+
+
+def preload_from_bundle(bundle_path: Path, catalog_class) -> int:
+  translations = Translations(DOMAIN, CatalogBundle.open(bundle_path), catalog_class=catalog_class)
+  return len(translations.preload())
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument(
+    "-l", "--locales",
+    type=int,
+    default=DEFAULT_LOCALES_COUNT,
+    help=f"number of locales (default: {DEFAULT_LOCALES_COUNT})",
+  )
+  parser.add_argument(
+    "-r", "--rounds",
+    type=int,
+    default=DEFAULT_ROUNDS,
+    help=f"number of rounds, the best one is reported (default: {DEFAULT_ROUNDS})",
+  )
+  args = parser.parse_args()
+
+  locales = make_locale_names(args.locales)
+
+  with tempfile.TemporaryDirectory() as dir_path:
+    root = Path(dir_path) / "locale"
+    make_locale_dir(root, locales)
+
+    content = MO_FILE_PATH.read_bytes()
+    bundle_path = Path(dir_path) / "locale.bundle"
+    bundle_path.write_bytes(CatalogBundle.pack({
+      DOMAIN: {locale: content for locale in locales},
+    }))
+
+    print(f"{'source':>8} {'catalog class':>18} {'catalogs':>9} {'best, ms':>9}")
+
+    for catalog_class in [DictTranslations, MmapTranslations, ]:
+      for name, func, path in [
+        ("dir",    preload_from_dir,    root),
+        ("bundle", preload_from_bundle, bundle_path),
+      ]:
+        best = None
+
+        for __ in range(args.rounds):
+          started = time.perf_counter()
+          count = func(path, catalog_class)
+          total = time.perf_counter() - started
+          best = total if best is None else min(best, total)
+
+        print(f"{name:>8} {catalog_class.__name__:>18} {count:>9} {best * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+  main()
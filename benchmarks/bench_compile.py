@@ -0,0 +1,97 @@
+"""
+Compare compilation of '.po' files via 'msgfmt' subprocesses and in-process.
+
+'msgfmt' is measured only if GNU gettext tools are installed.
+
+"""
+import argparse
+import tempfile
+import time
+
+from pathlib import Path
+
+from verboselib.cli.gettext_tools import compile_translations
+from verboselib.cli.mo import compile_po_file
+from verboselib.cli.utils import find_executable
+
+
+DEFAULT_FILES_COUNT = 50
+DEFAULT_MESSAGES_COUNT = 500
+
+PO_HEADER = """\
+msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+"Plural-Forms: nplurals=3; plural=n%10==1 && n%100!=11 ? 0 : n%10>=2 && n%10<=4 && (n%100<10 || n%100>=20) ? 1 : 2\\n"
+
+"""
+
+
+def make_po_files(dir_path: Path, files_count: int, messages_count: int):
+  lines = [PO_HEADER]
+
+  for i in range(messages_count):
+    if i % 10 == 0:
+      lines.append(
+        f'#, python-format\n'
+        f'msgid "%d item {i}"\nmsgid_plural "%d items {i}"\n'
+        f'msgstr[0] "%d елемент {i}"\nmsgstr[1] "%d елементи {i}"\nmsgstr[2] "%d елементів {i}"\n\n'
+      )
+    else:
+      lines.append(f'#: module.py:{i}\nmsgid "message number {i}"\nmsgstr "повідомлення номер {i}"\n\n')
+
+  content = "".join(lines)
+
+  paths = []
+  for i in range(files_count):
+    path = dir_path / f"file_{i}.po"
+    path.write_text(content, encoding="utf-8")
+    paths.append(path)
+
+  return paths
+
+
+def measure(func, paths) -> float:
+  started = time.perf_counter()
+  for path in paths:
+    func(path.with_suffix(".mo"), path)
+  return time.perf_counter() - started
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument(
+    "-f", "--files",
+    type=int,
+    default=DEFAULT_FILES_COUNT,
+    help=f"number of '.po' files (default: {DEFAULT_FILES_COUNT})",
+  )
+  parser.add_argument(
+    "-m", "--messages",
+    type=int,
+    default=DEFAULT_MESSAGES_COUNT,
+    help=f"number of messages per file (default: {DEFAULT_MESSAGES_COUNT})",
+  )
+  args = parser.parse_args()
+
+  variants = [
+    ("native", lambda mo, po: compile_po_file(mo, po, fuzzy=False)),
+  ]
+  if find_executable("msgfmt"):
+    variants.insert(0, (
+      "msgfmt",
+      lambda mo, po: compile_translations(mo, po, fuzzy=False, msgfmt_extra_args=[]),
+    ))
+
+  with tempfile.TemporaryDirectory() as dir_path:
+    paths = make_po_files(Path(dir_path), args.files, args.messages)
+
+    print(f"{'engine':>8} {'total, s':>10} {'per file, ms':>13}")
+
+    for name, func in variants:
+      total = measure(func, paths)
+      print(f"{name:>8} {total:>10.3f} {total / len(paths) * 1000:>13.2f}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,101 @@
+"""
+Compare throughput of lookups in ``Translations`` under thread contention.
+
+The "locked" variant reproduces the previous implementation, which acquired
+a single ``RLock`` around every lookup, including lookups of catalogs which
+had already been loaded. The "lock-free" variant is the current
+``Translations`` class.
+
+"""
+import argparse
+import threading
+import time
+
+from verboselib import NotThreadSafeTranslations
+from verboselib import Translations
+from verboselib import set_language
+
+from tests.constants import LOCALE_DIR_PATH
+from tests.constants import LOCALE_DOMAIN
+
+
+DEFAULT_THREADS_COUNTS = [1, 8, 64, ]
+DEFAULT_CALLS_PER_THREAD = 20000
+
+LANGUAGES = ["en", "en-gb", "ru", "uk", ]
+
+
+class LockedTranslations(NotThreadSafeTranslations):
+
+  def __init__(self, domain, locale_dir_path):
+    super().__init__(domain=domain, locale_dir_path=locale_dir_path)
+    self._lock = threading.RLock()
+
+  def gettext(self, message):
+    with self._lock:
+      return super().gettext(message=message)
+
+
+def measure(translations, threads_count: int, calls_per_thread: int) -> float:
+  barrier = threading.Barrier(threads_count)
+  started_at = []
+  finished_at = []
+
+  def target(language):
+    set_language(language)
+    _ = translations.gettext
+    _("verboselib test string")  # make sure catalog is loaded
+
+    barrier.wait()
+    started_at.append(time.perf_counter())
+
+    for __ in range(calls_per_thread):
+      _("verboselib test string")
+
+    finished_at.append(time.perf_counter())
+
+  threads = [
+    threading.Thread(target=target, args=(LANGUAGES[i % len(LANGUAGES)], ))
+    for i in range(threads_count)
+  ]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+
+  return max(finished_at) - min(started_at)
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument(
+    "-t", "--threads",
+    type=int,
+    action="append",
+    help=f"number of threads; can be specified multiple times (default: {DEFAULT_THREADS_COUNTS})",
+  )
+  parser.add_argument(
+    "-n", "--calls",
+    type=int,
+    default=DEFAULT_CALLS_PER_THREAD,
+    help=f"number of calls per thread (default: {DEFAULT_CALLS_PER_THREAD})",
+  )
+  args = parser.parse_args()
+
+  variants = [
+    ("locked",    LockedTranslations),
+    ("lock-free", Translations),
+  ]
+
+  print(f"{'threads':>8} {'variant':>10} {'total, s':>10} {'ns/call':>10}")
+
+  for threads_count in (args.threads or DEFAULT_THREADS_COUNTS):
+    for name, cls in variants:
+      translations = cls(LOCALE_DOMAIN, LOCALE_DIR_PATH)
+      elapsed = measure(translations, threads_count, args.calls)
+      per_call = elapsed / (threads_count * args.calls) * 1e9
+      print(f"{threads_count:>8} {name:>10} {elapsed:>10.3f} {per_call:>10.1f}")
+
+
+if __name__ == "__main__":
+  main()
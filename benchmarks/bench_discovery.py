@@ -0,0 +1,93 @@
+"""
+Compare discovery of source files by 'os.walk' with matching of each name
+against each ignore pattern and by the 'os.scandir' based walker.
+
+"""
+import argparse
+import fnmatch
+import os
+import tempfile
+import time
+
+from pathlib import Path
+
+from verboselib.cli.defaults import DEFAULT_IGNORE_PATTERNS
+from verboselib.cli.paths import iter_source_files_paths
+
+
+DEFAULT_DIRS_COUNT = 2000
+DEFAULT_FILES_PER_DIR = 20
+
+IGNORE_PATTERNS = DEFAULT_IGNORE_PATTERNS + ["node_modules", "*.min.js", "build", "dist"]
+
+
+def make_tree(root: Path, dirs_count: int, files_per_dir: int) -> None:
+  for i in range(dirs_count):
+    dir_path = root / f"package_{i % 20}" / f"module_{i}"
+    dir_path.mkdir(parents=True)
+
+    for j in range(files_per_dir):
+      suffix = ".py" if j % 2 else ".js"
+      (dir_path / f"file_{j}{suffix}").touch()
+
+
+def walk(root_dir_path: Path):
+  result = []
+
+  for dir_path, dir_names, file_names in os.walk(root_dir_path):
+    for dir_name in dir_names[:]:
+      path = Path(os.path.normpath(os.path.join(dir_path, dir_name)))
+      if any(fnmatch.fnmatchcase(path.name, x) for x in IGNORE_PATTERNS):
+        dir_names.remove(dir_name)
+
+    for file_name in file_names:
+      path = Path(os.path.normpath(os.path.join(dir_path, file_name)))
+      if any(fnmatch.fnmatchcase(path.name, x) for x in IGNORE_PATTERNS):
+        continue
+      if path.suffix == ".py":
+        result.append(path)
+
+  return sorted(result)
+
+
+def scan(root_dir_path: Path):
+  return list(iter_source_files_paths(
+    root_dir_path=root_dir_path,
+    ignore_patterns=IGNORE_PATTERNS,
+    extensions={".py"},
+    follow_links=False,
+    verbose=False,
+  ))
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument(
+    "-d", "--dirs",
+    type=int,
+    default=DEFAULT_DIRS_COUNT,
+    help=f"number of directories (default: {DEFAULT_DIRS_COUNT})",
+  )
+  parser.add_argument(
+    "-f", "--files",
+    type=int,
+    default=DEFAULT_FILES_PER_DIR,
+    help=f"number of files per directory (default: {DEFAULT_FILES_PER_DIR})",
+  )
+  args = parser.parse_args()
+
+  with tempfile.TemporaryDirectory() as dir_path:
+    root = Path(dir_path)
+    make_tree(root, args.dirs, args.files)
+
+    print(f"{'walker':>8} {'files':>8} {'total, s':>10}")
+
+    for name, func in [("os.walk", walk), ("scandir", scan)]:
+      started = time.perf_counter()
+      count = len(func(root))
+      total = time.perf_counter() - started
+      print(f"{name:>8} {count:>8} {total:>10.3f}")
+
+
+if __name__ == "__main__":
+  main()
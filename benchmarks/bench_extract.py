@@ -0,0 +1,106 @@
+"""
+Compare extraction of messages from Python sources via 'xgettext' and
+in-process.
+
+'xgettext' is measured only if GNU gettext tools are installed.
+
+"""
+import argparse
+import tempfile
+import time
+
+from pathlib import Path
+
+from verboselib.cli.defaults import COMMENT_TAG
+from verboselib.cli.defaults import DEFAULT_KEYWORDS
+from verboselib.cli.extractor import collect_messages
+from verboselib.cli.extractor import extract_messages_from_file
+from verboselib.cli.extractor import parse_keywords
+from verboselib.cli.gettext_tools import extract_translations
+from verboselib.cli.utils import find_executable
+
+
+DEFAULT_FILES_COUNT = 200
+DEFAULT_MESSAGES_COUNT = 50
+
+
+def make_source_files(dir_path: Path, files_count: int, messages_count: int):
+  paths = []
+
+  for i in range(files_count):
+    lines = ["from verboselib import Translations", ""]
+
+    for j in range(messages_count):
+      if j % 10 == 0:
+        lines.append(f"# Translators: comment {j}")
+        lines.append(f"x_{j} = N_('%d item {j}', '%d items {j}', n)")
+      elif j % 10 == 1:
+        lines.append(f"x_{j} = P_('context', 'message {i}.{j}')")
+      else:
+        lines.append(f"x_{j} = _('message {i}.{j}')")
+
+    path = dir_path / f"module_{i}.py"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    paths.append(path)
+
+  return paths
+
+
+def extract_natively(paths) -> None:
+  keywords = parse_keywords(DEFAULT_KEYWORDS)
+  collect_messages(
+    [
+      (x, extract_messages_from_file(x, keywords, COMMENT_TAG)[0])
+      for x in paths
+    ],
+    no_location=False,
+  )
+
+
+def extract_by_xgettext(paths) -> None:
+  extract_translations(
+    source_files_paths=paths,
+    domain="messages",
+    keywords=DEFAULT_KEYWORDS,
+    no_wrap=False,
+    no_location=False,
+    xgettext_extra_args=[],
+  )
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument(
+    "-f", "--files",
+    type=int,
+    default=DEFAULT_FILES_COUNT,
+    help=f"number of source files (default: {DEFAULT_FILES_COUNT})",
+  )
+  parser.add_argument(
+    "-m", "--messages",
+    type=int,
+    default=DEFAULT_MESSAGES_COUNT,
+    help=f"number of messages per file (default: {DEFAULT_MESSAGES_COUNT})",
+  )
+  args = parser.parse_args()
+
+  variants = [
+    ("native", extract_natively),
+  ]
+  if find_executable("xgettext"):
+    variants.insert(0, ("xgettext", extract_by_xgettext))
+
+  with tempfile.TemporaryDirectory() as dir_path:
+    paths = make_source_files(Path(dir_path), args.files, args.messages)
+
+    print(f"{'extractor':>9} {'total, s':>10} {'per file, ms':>13}")
+
+    for name, func in variants:
+      started = time.perf_counter()
+      func(paths)
+      total = time.perf_counter() - started
+      print(f"{name:>9} {total:>10.3f} {total / len(paths) * 1000:>13.2f}")
+
+
+if __name__ == "__main__":
+  main()
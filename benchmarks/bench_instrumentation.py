@@ -0,0 +1,65 @@
+"""
+Measure overhead of instrumentation on lookups of translated and untranslated
+messages.
+
+"""
+import argparse
+import timeit
+
+from verboselib import Instrumentation
+from verboselib import Translations
+from verboselib import set_language
+
+from tests.constants import LOCALE_DIR_PATH
+from tests.constants import LOCALE_DOMAIN
+
+
+DEFAULT_NUMBER = 200000
+DEFAULT_REPEAT = 5
+
+SAMPLE_RATES = [0.01, 1.0, ]
+
+
+def measure(func, number: int, repeat: int) -> float:
+  best = min(timeit.repeat(func, number=number, repeat=repeat))
+  return best / number * 1e9
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument(
+    "-n", "--number",
+    type=int,
+    default=DEFAULT_NUMBER,
+    help=f"number of lookups per measurement (default: {DEFAULT_NUMBER})",
+  )
+  parser.add_argument(
+    "-r", "--repeat",
+    type=int,
+    default=DEFAULT_REPEAT,
+    help=f"number of measurements to take the best one from (default: {DEFAULT_REPEAT})",
+  )
+  args = parser.parse_args()
+
+  variants = [("disabled", Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH)), ]
+  variants.extend(
+    (
+      f"rate={rate}",
+      Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH, instrumentation=Instrumentation(sample_rate=rate)),
+    )
+    for rate in SAMPLE_RATES
+  )
+
+  set_language("uk")
+
+  print(f"{'variant':>10} {'translated, ns':>15} {'untranslated, ns':>17}")
+
+  for name, translations in variants:
+    _ = translations.gettext
+    translated = measure(lambda: _("verboselib test string"), args.number, args.repeat)
+    untranslated = measure(lambda: _("missing"), args.number, args.repeat)
+    print(f"{name:>10} {translated:>15.1f} {untranslated:>17.1f}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,97 @@
+"""
+Compare overhead of storages of languages: thread-local and contextvars-based.
+
+"""
+import argparse
+import asyncio
+import time
+import timeit
+
+from verboselib import language
+from verboselib import ContextVarLanguageState
+from verboselib import ThreadLocalLanguageState
+from verboselib import Translations
+
+from tests.constants import LOCALE_DIR_PATH
+from tests.constants import LOCALE_DOMAIN
+
+
+DEFAULT_NUMBER = 100000
+DEFAULT_COROUTINES_COUNT = 1000
+
+
+def measure(func, number: int) -> float:
+  best = min(timeit.repeat(func, number=number, repeat=5))
+  return best / number * 1e9
+
+
+def measure_coroutines(translations: Translations, state, count: int) -> float:
+  _ = translations.gettext
+  languages = ["en", "ru", "uk", ]
+
+  async def worker(value):
+    with language(value, state):
+      for __ in range(10):
+        _("verboselib test string")
+        await asyncio.sleep(0)
+
+  async def main():
+    started = time.perf_counter()
+    await asyncio.gather(*[worker(languages[i % len(languages)]) for i in range(count)])
+    return time.perf_counter() - started
+
+  return asyncio.run(main()) / (count * 10) * 1e9
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument(
+    "-n", "--number",
+    type=int,
+    default=DEFAULT_NUMBER,
+    help=f"number of calls per measurement (default: {DEFAULT_NUMBER})",
+  )
+  parser.add_argument(
+    "-c", "--coroutines",
+    type=int,
+    default=DEFAULT_COROUTINES_COUNT,
+    help=f"number of concurrent coroutines (default: {DEFAULT_COROUTINES_COUNT})",
+  )
+  args = parser.parse_args()
+
+  print(
+    f"{'state':>12} {'get_language, ns':>17} {'with language, ns':>18} "
+    f"{'gettext, ns':>12} {'coroutines, ns/call':>20}"
+  )
+
+  for name, state_class in [
+    ("threading", ThreadLocalLanguageState),
+    ("contextvars", ContextVarLanguageState),
+  ]:
+    state = state_class()
+    state.set_language("uk")
+
+    translations = Translations(
+      domain=LOCALE_DOMAIN,
+      locale_dir_path=LOCALE_DIR_PATH,
+      language_state=state,
+    )
+    _ = translations.gettext
+
+    def switch():
+      with language("ru", state):
+        pass
+
+    get_language_ns = measure(state.get_language, args.number)
+    switch_ns = measure(switch, args.number)
+    gettext_ns = measure(lambda: _("verboselib test string"), args.number)
+    coroutines_ns = measure_coroutines(translations, state, args.coroutines)
+
+    print(
+      f"{name:>12} {get_language_ns:>17.1f} {switch_ns:>18.1f} "
+      f"{gettext_ns:>12.1f} {coroutines_ns:>20.1f}"
+    )
+
+
+if __name__ == "__main__":
+  main()
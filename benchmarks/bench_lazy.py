@@ -0,0 +1,76 @@
+"""
+Compare evaluation time and memory footprint of lazy translations.
+
+``lazy_string.LazyString`` is measured only if ``lazy-string`` is installed.
+
+"""
+import argparse
+import timeit
+import tracemalloc
+
+from verboselib import LazyTranslation
+from verboselib import Translations
+from verboselib import set_language
+
+from tests.constants import LOCALE_DIR_PATH
+from tests.constants import LOCALE_DOMAIN
+
+try:
+  from lazy_string import LazyString
+except ImportError:
+  LazyString = None
+
+
+DEFAULT_NUMBER = 100000
+INSTANCES_COUNT = 10000
+
+
+def measure_evaluation(s, number: int) -> float:
+  best = min(timeit.repeat(lambda: str(s), number=number, repeat=5))
+  return best / number * 1e9
+
+
+def measure_memory(factory) -> float:
+  tracemalloc.start()
+  try:
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory() for __ in range(INSTANCES_COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+  finally:
+    tracemalloc.stop()
+
+  del instances
+  return (after - before) / INSTANCES_COUNT
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument(
+    "-n", "--number",
+    type=int,
+    default=DEFAULT_NUMBER,
+    help=f"number of evaluations per measurement (default: {DEFAULT_NUMBER})",
+  )
+  args = parser.parse_args()
+
+  translations = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH)
+  set_language("uk")
+
+  message = "verboselib test string"
+
+  variants = [
+    ("LazyTranslation", lambda: LazyTranslation(translations.gettext, message)),
+  ]
+  if LazyString is not None:
+    variants.insert(0, ("LazyString", lambda: LazyString(translations.gettext, message)))
+
+  print(f"{'variant':>16} {'str(), ns':>10} {'bytes/instance':>15}")
+
+  for name, factory in variants:
+    evaluation_ns = measure_evaluation(factory(), args.number)
+    memory = measure_memory(factory)
+    print(f"{name:>16} {evaluation_ns:>10.1f} {memory:>15.1f}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,125 @@
+"""
+Compare merging of new messages into existing '.po' files via 'msgmerge'
+and in-process.
+
+'msgmerge' is measured only if GNU gettext tools are installed.
+
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from pathlib import Path
+
+from verboselib.cli.defaults import DEFAULT_FUZZY_THRESHOLD
+from verboselib.cli.gettext_tools import merge_new_and_existing_translations
+from verboselib.cli.merge import merge_po_file
+from verboselib.cli.po import make_po_content
+from verboselib.cli.po import Message
+from verboselib.cli.utils import find_executable
+
+
+DEFAULT_MESSAGES_COUNT = 50000
+DEFAULT_CHANGED_PERCENT = 5
+
+HEADER = Message(
+  id="",
+  strings=[
+    "Content-Type: text/plain; charset=UTF-8\n"
+    "Plural-Forms: nplurals=2; plural=(n != 1);\n"
+  ],
+)
+
+WORDS = [
+  "account", "address", "cancel", "change", "confirm", "delete", "download",
+  "email", "error", "file", "folder", "invalid", "message", "name", "new",
+  "open", "password", "profile", "remove", "save", "search", "settings",
+  "share", "upload", "user", "value", "window",
+]
+
+
+def make_text(rnd: random.Random, i: int) -> str:
+  words = rnd.sample(WORDS, rnd.randint(2, 8))
+  return f"{' '.join(words).capitalize()} #{i}"
+
+
+def make_files(dir_path: Path, messages_count: int, changed_percent: int):
+  rnd = random.Random(0)
+  ids = [make_text(rnd, i) for i in range(messages_count)]
+
+  definitions = [HEADER] + [
+    Message(id=x, strings=[x.upper()], references=[f"module.py:{i}"])
+    for i, x in enumerate(ids)
+  ]
+
+  changed_count = messages_count * changed_percent // 100
+  for i in rnd.sample(range(messages_count), changed_count):
+    ids[i] = ids[i].replace(" ", "  ", 1) if i % 2 else make_text(rnd, messages_count + i)
+
+  references = [HEADER] + [
+    Message(id=x, references=[f"module.py:{i}"])
+    for i, x in enumerate(ids)
+  ]
+
+  po_file_path = dir_path / "messages.po"
+  po_file_path.write_text(make_po_content(definitions), encoding="utf-8")
+
+  return po_file_path, make_po_content(references)
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument(
+    "-m", "--messages",
+    type=int,
+    default=DEFAULT_MESSAGES_COUNT,
+    help=f"number of messages (default: {DEFAULT_MESSAGES_COUNT})",
+  )
+  parser.add_argument(
+    "-c", "--changed",
+    type=int,
+    default=DEFAULT_CHANGED_PERCENT,
+    help=f"percent of changed messages (default: {DEFAULT_CHANGED_PERCENT})",
+  )
+  args = parser.parse_args()
+
+  variants = [
+    ("native", lambda po, pot: merge_po_file(
+      po, pot,
+      fuzzy_threshold=DEFAULT_FUZZY_THRESHOLD,
+      no_obsolete=False,
+      no_location=False,
+      no_wrap=False,
+    )),
+    ("native, no fuzzy", lambda po, pot: merge_po_file(
+      po, pot,
+      fuzzy_threshold=None,
+      no_obsolete=False,
+      no_location=False,
+      no_wrap=False,
+    )),
+  ]
+  if find_executable("msgmerge"):
+    variants.insert(0, ("msgmerge", lambda po, pot: merge_new_and_existing_translations(
+      po, pot,
+      no_fuzzy_matching=False,
+      no_wrap=False,
+      no_location=False,
+      msgmerge_extra_args=[],
+    )))
+
+  with tempfile.TemporaryDirectory() as dir_path:
+    po_file_path, pot_content = make_files(Path(dir_path), args.messages, args.changed)
+
+    print(f"{'merger':>16} {'total, s':>10}")
+
+    for name, func in variants:
+      started = time.perf_counter()
+      func(po_file_path, pot_content)
+      total = time.perf_counter() - started
+      print(f"{name:>16} {total:>10.3f}")
+
+
+if __name__ == "__main__":
+  main()
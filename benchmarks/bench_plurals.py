@@ -0,0 +1,53 @@
+"""
+Compare evaluation time of plural forms: gettext.c2py() vs precompiled tables.
+
+"""
+import argparse
+import gettext
+import timeit
+
+from verboselib import compile_plural
+
+
+DEFAULT_NUMBER = 100000
+
+RULES = [
+  ("en", "n != 1"),
+  ("ru", "n%10==1 && n%100!=11 ? 0 : n%10>=2 && n%10<=4 && (n%100<10 || n%100>=20) ? 1 : 2"),
+  ("uk", "(n%10==1 && n%100!=11 ? 0 : n%10>=2 && n%10<=4 && (n%100<10 || n%100>=20) ? 1 : 2)"),
+  ("ar", "n==0 ? 0 : n==1 ? 1 : n==2 ? 2 : n%100>=3 && n%100<=10 ? 3 : n%100>=11 ? 4 : 5"),
+  ("pl", "n==1 ? 0 : n%10>=2 && n%10<=4 && (n%100<10 || n%100>=20) ? 1 : 2"),
+]
+
+NUMBERS = [0, 1, 2, 5, 11, 21, 42, 101, 1234, 1000000, ]
+
+
+def measure(func, number: int) -> float:
+  def run():
+    for n in NUMBERS:
+      func(n)
+
+  best = min(timeit.repeat(run, number=number, repeat=5))
+  return best / number / len(NUMBERS) * 1e9
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument(
+    "-n", "--number",
+    type=int,
+    default=DEFAULT_NUMBER,
+    help=f"number of evaluations of each of {len(NUMBERS)} numbers per measurement (default: {DEFAULT_NUMBER})",
+  )
+  args = parser.parse_args()
+
+  print(f"{'rule':>6} {'c2py, ns':>10} {'table, ns':>10} {'speedup':>8}")
+
+  for name, expression in RULES:
+    generic_ns = measure(gettext.c2py(expression), args.number)
+    table_ns = measure(compile_plural(expression), args.number)
+    print(f"{name:>6} {generic_ns:>10.1f} {table_ns:>10.1f} {generic_ns / table_ns:>7.2f}x")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,318 @@
+"""
+Benchmarks of the suite run by 'python -m benchmarks'.
+
+Every benchmark returns the best time of a single operation in seconds, e.g.,
+of a lookup or of a run of a command, out of ``repeat`` measurements. Inputs
+are generated, so no network or external tools are needed.
+
+"""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+
+if sys.version_info >= (3, 9):
+  from collections.abc import Callable
+
+  List = list
+
+else:
+  from typing import Callable
+  from typing import List
+
+from pathlib import Path
+from typing import NamedTuple
+
+from verboselib import DictTranslations
+from verboselib import MmapTranslations
+from verboselib import Translations
+from verboselib import drop_language
+from verboselib import set_language
+from verboselib.cli.main import make_parser
+from verboselib.cli.mo import compile_po_file
+
+from tests.constants import LOCALE_DIR_PATH
+from tests.constants import LOCALE_DOMAIN
+
+from . import bench_compile
+from . import bench_contention
+from . import bench_extract
+
+
+class Config(NamedTuple):
+  """
+  :param repeat: Number of measurements to take the best one from.
+  :param scale:  Multiplier of numbers of iterations and of sizes of
+                 generated inputs, e.g., less than 1 for quick runs.
+
+  """
+  repeat: int
+  scale:  float
+
+
+class Benchmark(NamedTuple):
+  name:        str
+  description: str
+  func:        Callable[[Config], float]
+
+
+BENCHMARKS: List[Benchmark] = []
+
+CATALOG_CLASSES = [
+  ("dict", DictTranslations),
+  ("mmap", MmapTranslations),
+]
+
+LANGUAGE = "uk"
+
+SMALL_MO_FILE_PATH = LOCALE_DIR_PATH / LANGUAGE / "LC_MESSAGES" / f"{LOCALE_DOMAIN}.mo"
+
+
+def register(name: str, description: str, func: Callable[[Config], float]) -> None:
+  BENCHMARKS.append(Benchmark(name=name, description=description, func=func))
+
+
+def scaled(value: int, config: Config) -> int:
+  return max(1, int(value * config.scale))
+
+
+def measure_calls(func: Callable[[], object], number: int, config: Config) -> float:
+  best = min(timeit.repeat(func, number=number, repeat=config.repeat))
+  return best / number
+
+
+def measure_runs(
+  func: Callable[[], object],
+  config: Config,
+  setup: Callable[[], object]=lambda: None,
+) -> float:
+  best = None
+
+  for __ in range(config.repeat):
+    setup()
+
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+
+    best = elapsed if best is None else min(best, elapsed)
+
+  return best
+
+
+@contextlib.contextmanager
+def language(value: str):
+  set_language(value)
+  try:
+    yield
+  finally:
+    drop_language()
+
+
+@contextlib.contextmanager
+def working_dir(path: Path):
+  previous = os.getcwd()
+  os.chdir(str(path))
+  try:
+    yield
+  finally:
+    os.chdir(previous)
+
+
+def run_command(args: List[str]) -> None:
+  args = make_parser().parse_args(args)
+  executor = args.executor_factory(args)
+
+  with contextlib.redirect_stdout(io.StringIO()):
+    executor()
+
+
+# lookups of existing messages in loaded catalogs
+
+LOOKUPS = [
+  ("gettext",   lambda t: (lambda: t.gettext("verboselib test string"))),
+  ("ngettext",  lambda t: (lambda: t.ngettext("window", "windows", 5))),
+  ("pgettext",  lambda t: (lambda: t.pgettext("abbrev. month", "Jan"))),
+  ("npgettext", lambda t: (lambda: t.npgettext("noun", "lock", "locks", 5))),
+]
+
+if sys.version_info < (3, 8):
+  # contexts are not supported by 'gettext' before Python 3.8
+  LOOKUPS = LOOKUPS[:2]
+
+
+def make_lookup_benchmark(make_func, catalog_class) -> Callable[[Config], float]:
+
+  def run(config: Config) -> float:
+    translations = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH, catalog_class=catalog_class)
+    func = make_func(translations)
+
+    with language(LANGUAGE):
+      func()  # load the catalog
+      return measure_calls(func, scaled(200000, config), config)
+
+  return run
+
+
+for method_name, make_func in LOOKUPS:
+  for class_name, catalog_class in CATALOG_CLASSES:
+    register(
+      name=f"lookup.{method_name}.{class_name}",
+      description=f"'{method_name}()' of a translated message, '{catalog_class.__name__}'",
+      func=make_lookup_benchmark(make_func, catalog_class),
+    )
+
+
+# evaluation of lazy translations
+
+def bench_lazy_memoized(config: Config) -> float:
+  translations = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH)
+  value = translations.gettext_lazy("verboselib test string")
+
+  with language(LANGUAGE):
+    str(value)
+    return measure_calls(lambda: str(value), scaled(200000, config), config)
+
+
+def bench_lazy_not_memoized(config: Config) -> float:
+  translations = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH)
+  value = translations.ngettext_lazy("window", "windows", lambda: 5)
+
+  with language(LANGUAGE):
+    str(value)
+    return measure_calls(lambda: str(value), scaled(200000, config), config)
+
+
+register(
+  name="lazy.memoized",
+  description="'str()' of a lazy translation with a memoized value",
+  func=bench_lazy_memoized,
+)
+register(
+  name="lazy.not_memoized",
+  description="'str()' of a lazy translation with a lazy 'n', which is evaluated every time",
+  func=bench_lazy_not_memoized,
+)
+
+
+# loading of catalogs
+
+def make_load_benchmark(catalog_class, messages_count: int) -> Callable[[Config], float]:
+
+  def load(path: Path) -> None:
+    with path.open("rb") as f:
+      catalog_class(f)
+
+  def run(config: Config) -> float:
+    if not messages_count:
+      return measure_calls(lambda: load(SMALL_MO_FILE_PATH), scaled(2000, config), config)
+
+    with tempfile.TemporaryDirectory() as dir_path:
+      po_file_path, = bench_compile.make_po_files(Path(dir_path), 1, scaled(messages_count, config))
+      mo_file_path = po_file_path.with_suffix(".mo")
+      compile_po_file(mo_file_path=mo_file_path, po_file_path=po_file_path, fuzzy=False)
+
+      return measure_calls(lambda: load(mo_file_path), 5, config)
+
+  return run
+
+
+for size_name, messages_count in [("small", 0), ("large", 20000), ]:
+  for class_name, catalog_class in CATALOG_CLASSES:
+    register(
+      name=f"load.{size_name}.{class_name}",
+      description=(
+        f"load of a {size_name} '.mo' file "
+        + (f"with {messages_count} messages " if messages_count else "")
+        + f"by '{catalog_class.__name__}'"
+      ),
+      func=make_load_benchmark(catalog_class, messages_count),
+    )
+
+
+# lookups under contention of threads
+
+def make_contention_benchmark(threads_count: int) -> Callable[[Config], float]:
+
+  def run(config: Config) -> float:
+    translations = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH)
+    calls_per_thread = scaled(20000, config)
+
+    best = min(
+      bench_contention.measure(translations, threads_count, calls_per_thread)
+      for __ in range(config.repeat)
+    )
+    return best / (threads_count * calls_per_thread)
+
+  return run
+
+
+for threads_count in [1, 8, ]:
+  register(
+    name=f"contention.threads_{threads_count}",
+    description=f"'gettext()' called concurrently by {threads_count} thread(s) with different languages",
+    func=make_contention_benchmark(threads_count),
+  )
+
+
+# commands of CLI on generated trees
+
+def bench_cli_extract(config: Config) -> float:
+  with tempfile.TemporaryDirectory() as dir_path:
+    root = Path(dir_path)
+    sources_dir_path = root / "src"
+    sources_dir_path.mkdir()
+    bench_extract.make_source_files(sources_dir_path, scaled(200, config), 50)
+
+    locale_dir_path = root / "locale"
+
+    def setup():
+      shutil.rmtree(str(locale_dir_path), ignore_errors=True)
+
+    args = [
+      "extract",
+      "--locale", LANGUAGE,
+      "--output-dir", str(locale_dir_path),
+      "--extractor", "native",
+      "--merger", "native",
+      "--jobs", "1",
+    ]
+
+    with working_dir(sources_dir_path):
+      return measure_runs(lambda: run_command(args), config, setup=setup)
+
+
+def bench_cli_compile(config: Config) -> float:
+  with tempfile.TemporaryDirectory() as dir_path:
+    locale_dir_path = Path(dir_path) / "locale"
+
+    for i in range(scaled(10, config)):
+      messages_dir_path = locale_dir_path / f"l{i}" / "LC_MESSAGES"
+      messages_dir_path.mkdir(parents=True)
+      bench_compile.make_po_files(messages_dir_path, 1, 2000)
+
+    args = [
+      "compile",
+      "--locale-dir", str(locale_dir_path),
+      "--engine", "native",
+      "--force",
+      "--jobs", "1",
+    ]
+
+    return measure_runs(lambda: run_command(args), config)
+
+
+register(
+  name="cli.extract",
+  description="'extract' with native extractor and merger of a generated tree of sources into a new locale",
+  func=bench_cli_extract,
+)
+register(
+  name="cli.compile",
+  description="'compile' with native engine of a generated locale dir",
+  func=bench_cli_compile,
+)
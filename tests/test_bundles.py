@@ -0,0 +1,133 @@
+import sys
+import tempfile
+import unittest
+import zipfile
+
+from pathlib import Path
+
+from verboselib import drop_default_language
+from verboselib import drop_language
+from verboselib import set_language
+from verboselib import CatalogBundle
+from verboselib import DictTranslations
+from verboselib import MmapTranslations
+from verboselib import Translations
+
+from .constants import LOCALE_DOMAIN
+from .constants import LOCALE_DIR_PATH
+
+
+LOCALES = ["en_GB", "en_US", "ru", "uk", ]
+
+
+def make_bundle_content():
+  return CatalogBundle.pack({
+    LOCALE_DOMAIN: {
+      locale: (LOCALE_DIR_PATH / locale / "LC_MESSAGES" / f"{LOCALE_DOMAIN}.mo").read_bytes()
+      for locale in LOCALES
+    },
+  })
+
+
+class CatalogBundleTestCase(unittest.TestCase):
+
+  def setUp(self):
+    drop_default_language()
+    drop_language()
+
+    self.content = make_bundle_content()
+    self.bundle = CatalogBundle(self.content)
+
+  def tearDown(self):
+    drop_default_language()
+    drop_language()
+
+  def test_index(self):
+    self.assertEqual(self.bundle.domains(), [LOCALE_DOMAIN, ])
+    self.assertEqual(self.bundle.locales(LOCALE_DOMAIN), LOCALES)
+    self.assertEqual(self.bundle.locales("missing"), [])
+
+    for locale in LOCALES:
+      path = LOCALE_DIR_PATH / locale / "LC_MESSAGES" / f"{LOCALE_DOMAIN}.mo"
+      self.assertEqual(bytes(self.bundle.get(LOCALE_DOMAIN, locale)), path.read_bytes())
+
+    self.assertIsNone(self.bundle.get(LOCALE_DOMAIN, "de"))
+
+  def test_find(self):
+    self.assertEqual(self.bundle.find(LOCALE_DOMAIN, "en"), ["en_US", ])
+    self.assertEqual(self.bundle.find(LOCALE_DOMAIN, "en_GB"), ["en_GB", ])
+    self.assertEqual(self.bundle.find(LOCALE_DOMAIN, "de"), [])
+    self.assertEqual(self.bundle.find("missing", "en"), [])
+
+  def test_bad_content(self):
+    with self.assertRaises(OSError):
+      CatalogBundle(b"")
+
+    with self.assertRaises(OSError):
+      CatalogBundle(b"x" * len(self.content))
+
+    with self.assertRaises(OSError):
+      CatalogBundle(self.content[:-1])
+
+  def test_translations(self):
+    for catalog_class in [DictTranslations, MmapTranslations, ]:
+      translations = Translations(LOCALE_DOMAIN, self.bundle, catalog_class=catalog_class)
+      expected = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH, catalog_class=catalog_class)
+
+      for language in ["en", "en-gb", "ru", "uk", "de", ]:
+        set_language(language)
+        self.assertEqual(
+          translations.gettext("verboselib test string"),
+          expected.gettext("verboselib test string"),
+        )
+        self.assertEqual(
+          translations.ngettext("window", "windows", 5),
+          expected.ngettext("window", "windows", 5),
+        )
+
+  def test_preload(self):
+    translations = Translations(LOCALE_DOMAIN, self.bundle)
+
+    infos = translations.preload()
+    self.assertEqual(sorted(infos), ["en-gb", "en-us", "ru", "uk", ])
+
+    for info in infos.values():
+      self.assertEqual(info.file_paths, ())
+      self.assertEqual(info.size, len(self.bundle.get(LOCALE_DOMAIN, info.locale)))
+
+  def test_reload_is_not_supported(self):
+    with self.assertRaises(ValueError):
+      Translations(LOCALE_DOMAIN, self.bundle, reload_interval=1)
+
+  def test_open(self):
+    with tempfile.TemporaryDirectory() as dir_path:
+      path = Path(dir_path) / "locale.bundle"
+      path.write_bytes(self.content)
+
+      bundle = CatalogBundle.open(path)
+      translations = Translations(LOCALE_DOMAIN, bundle, catalog_class=MmapTranslations)
+
+      set_language("uk")
+      self.assertEqual(translations.gettext("verboselib test string"), "verboselib test string in uk")
+
+  def test_from_resource_of_zip(self):
+    with tempfile.TemporaryDirectory() as dir_path:
+      zip_path = Path(dir_path) / "package.zip"
+
+      with zipfile.ZipFile(str(zip_path), "w") as f:
+        f.writestr("verboselib_test_bundle/__init__.py", "")
+        f.writestr("verboselib_test_bundle/locale.bundle", self.content)
+
+      sys.path.insert(0, str(zip_path))
+      try:
+        bundle = CatalogBundle.from_resource("verboselib_test_bundle", "locale.bundle")
+      finally:
+        sys.path.remove(str(zip_path))
+        sys.modules.pop("verboselib_test_bundle", None)
+
+      self.assertEqual(bundle.locales(LOCALE_DOMAIN), LOCALES)
+
+      translations = Translations(LOCALE_DOMAIN, bundle, catalog_class=MmapTranslations)
+
+      set_language("ru")
+      self.assertEqual(translations.gettext("verboselib test string"), "verboselib test string in ru")
@@ -0,0 +1,174 @@
+import gc
+import gettext
+import io
+import unittest
+import weakref
+
+from verboselib import drop_default_language
+from verboselib import drop_language
+from verboselib import set_language
+from verboselib import MmapTranslations
+from verboselib import Translations
+
+from .constants import LOCALE_DOMAIN
+from .constants import LOCALE_DIR_PATH
+
+
+LOCALES = ["en_GB", "en_US", "ru", "uk", ]
+
+
+def make_mo_file_path(locale):
+  return LOCALE_DIR_PATH / locale / "LC_MESSAGES" / f"{LOCALE_DOMAIN}.mo"
+
+
+class MmapTranslationsTestCase(unittest.TestCase):
+
+  def load(self, locale):
+    path = make_mo_file_path(locale)
+
+    with path.open("rb") as f:
+      expected = gettext.GNUTranslations(f)
+
+    with path.open("rb") as f:
+      actual = MmapTranslations(f)
+
+    return expected, actual
+
+  def assert_same(self, expected, actual):
+    self.assertEqual(actual.info(), expected.info())
+    self.assertEqual(actual.charset(), expected.charset())
+
+    for message in ["verboselib test string", "Good morning, {:}!", "window", "missing", ]:
+      self.assertEqual(actual.gettext(message), expected.gettext(message))
+
+    self.assertEqual(
+      actual.pgettext("abbrev. month", "Jan"),
+      expected.pgettext("abbrev. month", "Jan"),
+    )
+    self.assertEqual(
+      actual.pgettext("missing", "Jan"),
+      expected.pgettext("missing", "Jan"),
+    )
+
+    for n in range(0, 120):
+      self.assertEqual(
+        actual.ngettext("window", "windows", n),
+        expected.ngettext("window", "windows", n),
+      )
+      self.assertEqual(
+        actual.npgettext("noun", "lock", "locks", n),
+        expected.npgettext("noun", "lock", "locks", n),
+      )
+      self.assertEqual(
+        actual.ngettext("missing", "missings", n),
+        expected.ngettext("missing", "missings", n),
+      )
+
+  def test_hash_table_lookups(self):
+    for locale in LOCALES:
+      with self.subTest(locale=locale):
+        expected, actual = self.load(locale)
+        self.assertNotEqual(actual._hash_table_size, 0)
+        self.assert_same(expected, actual)
+
+  def test_binary_search_lookups(self):
+    for locale in LOCALES:
+      with self.subTest(locale=locale):
+        expected, actual = self.load(locale)
+
+        actual._hash_table_size = 0
+        actual._cache.clear()
+
+        self.assert_same(expected, actual)
+
+  def test_in_memory_sources(self):
+    for locale in LOCALES:
+      with self.subTest(locale=locale):
+        expected, __ = self.load(locale)
+        content = make_mo_file_path(locale).read_bytes()
+
+        self.assert_same(expected, MmapTranslations(io.BytesIO(content)))
+        self.assert_same(expected, MmapTranslations.from_buffer(memoryview(content)))
+
+  def test_close(self):
+    expected, actual = self.load("uk")
+    self.assertEqual(actual.gettext("verboselib test string"), "verboselib test string in uk")
+
+    mapped = actual._mmap
+    actual.close()
+
+    self.assertTrue(mapped.closed)
+    self.assertEqual(actual.gettext("verboselib test string"), "verboselib test string")
+
+    actual.close()
+
+  def test_no_reference_cycles(self):
+    expected, actual = self.load("uk")
+    actual.gettext("verboselib test string")
+
+    ref = weakref.ref(actual)
+
+    gc.disable()
+    try:
+      del actual
+      self.assertIsNone(ref())
+    finally:
+      gc.enable()
+
+  def test_bad_magic_number(self):
+    with self.assertRaises(OSError):
+      MmapTranslations()._load(b"\x00" * 28)
+
+
+class TranslationsWithMmapTranslationsTestCase(unittest.TestCase):
+
+  def setUp(self):
+    drop_default_language()
+    drop_language()
+
+    self.translations = Translations(
+      domain=LOCALE_DOMAIN,
+      locale_dir_path=LOCALE_DIR_PATH,
+      catalog_class=MmapTranslations,
+    )
+
+  def tearDown(self):
+    drop_language()
+
+  def test_gettext(self):
+    _ = self.translations.gettext
+
+    set_language("en")
+    self.assertEqual(_("verboselib test string"), "verboselib test string in en_US")
+
+    set_language("en-gb")
+    self.assertEqual(_("verboselib test string"), "verboselib test string in en_GB")
+
+  def test_npgettext(self):
+    NP_ = self.translations.npgettext
+
+    set_language("uk")
+    self.assertEqual(NP_("noun", "lock", "locks", 1), "замок")
+    self.assertEqual(NP_("noun", "lock", "locks", 2), "замки")
+    self.assertEqual(NP_("noun", "lock", "locks", 5), "замків")
+
+  def test_evicted_catalogs_are_closed(self):
+    translations = Translations(
+      domain=LOCALE_DOMAIN,
+      locale_dir_path=LOCALE_DIR_PATH,
+      catalog_class=MmapTranslations,
+      max_catalogs=1,
+    )
+    _ = translations.gettext
+
+    set_language("uk")
+    _("verboselib test string")
+    catalog = translations._catalogs["uk"]
+
+    set_language("ru")
+    self.assertEqual(_("verboselib test string"), "verboselib test string in ru")
+    self.assertIsNone(catalog._buffer)
+
+    catalog = translations._catalogs["ru"]
+    translations.cache_clear()
+    self.assertIsNone(catalog._buffer)
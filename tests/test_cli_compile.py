@@ -0,0 +1,156 @@
+import shutil
+import tempfile
+import unittest
+
+from pathlib import Path
+from unittest import mock
+
+from verboselib.cli.main import make_parser
+
+from .constants import LOCALE_DOMAIN
+from .constants import LOCALE_DIR_PATH
+
+
+LOCALES = ["en_GB", "en_US", "ru", "uk", ]
+
+
+class CompileCommandExecutorTestCase(unittest.TestCase):
+
+  def setUp(self):
+    self._tmp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(self._tmp_dir.cleanup)
+
+    self.locales_dir_path = Path(self._tmp_dir.name) / "locale"
+
+    for locale in LOCALES:
+      messages_dir_path = self.locales_dir_path / locale / "LC_MESSAGES"
+      messages_dir_path.mkdir(parents=True)
+      shutil.copy(
+        str(LOCALE_DIR_PATH / locale / "LC_MESSAGES" / f"{LOCALE_DOMAIN}.po"),
+        str(messages_dir_path),
+      )
+
+  def get_po_file_path(self, locale):
+    return self.locales_dir_path / locale / "LC_MESSAGES" / f"{LOCALE_DOMAIN}.po"
+
+  def get_mo_file_path(self, locale):
+    return self.get_po_file_path(locale).with_suffix(".mo")
+
+  def read_mo_files(self):
+    return {
+      locale: self.get_mo_file_path(locale).read_bytes()
+      for locale in LOCALES
+    }
+
+  def compile(self, *extra_args):
+    args = make_parser().parse_args([
+      "compile",
+      "--locale-dir", str(self.locales_dir_path),
+      "--engine", "native",
+      "--verbose",
+      *extra_args,
+    ])
+    executor = args.executor_factory(args)
+
+    with mock.patch("verboselib.cli.command_base.print_out"):
+      with mock.patch("verboselib.cli.command_compile.print_out") as print_out:
+        with mock.patch("verboselib.cli.command_compile.print_err") as print_err:
+          try:
+            executor()
+          finally:
+            self.output = [x.args[0] for x in print_out.call_args_list]
+            self.errors = [x.args[0] for x in print_err.call_args_list]
+
+  def test_parallel_jobs(self):
+    self.compile("--jobs", "1")
+    expected = self.read_mo_files()
+
+    for locale in LOCALES:
+      self.get_mo_file_path(locale).unlink()
+
+    self.compile("--jobs", "4")
+    self.assertEqual(self.read_mo_files(), expected)
+
+    self.assertEqual(
+      [x for x in self.output if x.startswith("processing locale")],
+      [f"processing locale '{locale}'" for locale in LOCALES],
+    )
+
+  def test_parallel_jobs_failure(self):
+    po_file_path = self.get_po_file_path("ru")
+    content = po_file_path.read_text(encoding="utf-8")
+    po_file_path.write_text(
+      content + '\nmsgid "verboselib test string"\nmsgstr "duplicate"\n',
+      encoding="utf-8",
+    )
+
+    with self.assertRaises(SystemExit):
+      self.compile("--jobs", "4")
+
+    self.assertEqual(
+      [x for x in self.output if x.startswith("processing locale")],
+      [f"processing locale '{locale}'" for locale in LOCALES],
+    )
+    self.assertIn("compiled 3 file(s), skipped 0 up-to-date file(s)", self.output)
+
+    self.assertEqual(self.errors[0], "failed to compile 1 file(s):")
+    self.assertIn("duplicate message definition", self.errors[1])
+    self.assertIn(str(po_file_path), self.errors[1])
+
+    for locale in ["en_GB", "en_US", "uk", ]:
+      self.assertTrue(self.get_mo_file_path(locale).exists())
+    self.assertFalse(self.get_mo_file_path("ru").exists())
+
+  def test_skip_up_to_date_files(self):
+    self.compile()
+    self.assertIn("compiled 4 file(s), skipped 0 up-to-date file(s)", self.output)
+    self.assertTrue((self.locales_dir_path / ".verboselib-compile.json").exists())
+
+    self.compile()
+    self.assertIn("compiled 0 file(s), skipped 4 up-to-date file(s)", self.output)
+
+  def test_changed_po_file(self):
+    self.compile()
+    expected = self.read_mo_files()
+
+    po_file_path = self.get_po_file_path("uk")
+    content = po_file_path.read_text(encoding="utf-8")
+    po_file_path.write_text(
+      content.replace(
+        'msgstr "verboselib test string in uk"',
+        'msgstr "changed verboselib test string in uk"',
+      ),
+      encoding="utf-8",
+    )
+
+    self.compile()
+    self.assertIn("compiled 1 file(s), skipped 3 up-to-date file(s)", self.output)
+
+    actual = self.read_mo_files()
+    self.assertNotEqual(actual.pop("uk"), expected.pop("uk"))
+    self.assertEqual(actual, expected)
+
+  def test_changed_flags(self):
+    self.compile()
+
+    self.compile("--use-fuzzy")
+    self.assertIn("compiled 4 file(s), skipped 0 up-to-date file(s)", self.output)
+
+    self.compile("--use-fuzzy")
+    self.assertIn("compiled 0 file(s), skipped 4 up-to-date file(s)", self.output)
+
+  def test_removed_mo_file(self):
+    self.compile()
+    expected = self.read_mo_files()
+
+    self.get_mo_file_path("ru").unlink()
+
+    self.compile()
+    self.assertIn("compiled 1 file(s), skipped 3 up-to-date file(s)", self.output)
+    self.assertEqual(self.read_mo_files(), expected)
+
+  def test_force(self):
+    self.compile()
+
+    self.compile("--force")
+    self.assertIn("compiled 4 file(s), skipped 0 up-to-date file(s)", self.output)
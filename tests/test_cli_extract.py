@@ -0,0 +1,183 @@
+import os
+import re
+import tempfile
+import unittest
+
+from pathlib import Path
+from unittest import mock
+
+from verboselib.cli.defaults import COMMENT_TAG
+from verboselib.cli.defaults import DEFAULT_KEYWORDS
+from verboselib.cli.extractor import collect_messages
+from verboselib.cli.extractor import extract_messages_from_file
+from verboselib.cli.extractor import parse_keywords
+from verboselib.cli.main import make_parser
+from verboselib.cli.po import parse_po_lines
+from verboselib.cli.po import Catalog
+
+
+KEYWORDS = parse_keywords(DEFAULT_KEYWORDS)
+
+
+def extract_translations(
+  source_files_paths,
+  domain,
+  keywords,
+  no_wrap,
+  no_location,
+  xgettext_extra_args,
+):
+  """
+  Imitate a run of 'xgettext' by the native extractor.
+
+  """
+  occurrences = [
+    (x, extract_messages_from_file(x, KEYWORDS, COMMENT_TAG)[0])
+    for x in source_files_paths
+  ]
+  catalog = Catalog()
+  catalog.update(collect_messages(occurrences, no_location=no_location))
+  return catalog.serialize(no_wrap=no_wrap), ""
+
+
+@mock.patch("verboselib.cli.command_extract.extract_translations", extract_translations)
+class ExtractCommandExecutorTestCase(unittest.TestCase):
+
+  def setUp(self):
+    self._tmp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(self._tmp_dir.cleanup)
+
+    self.dir_path = Path(os.path.realpath(self._tmp_dir.name))
+
+    current_dir_path = os.getcwd()
+    os.chdir(self.dir_path)
+    self.addCleanup(os.chdir, current_dir_path)
+
+    for i in range(20):
+      (self.dir_path / f"m{i:02}.py").write_text(
+        f"_('shared')\n"
+        f"_('message {i}')\n"
+        f"N_('{i} file', '{i} files', n)\n"
+      )
+
+  def get_po_file_path(self, locale):
+    return self.dir_path / "locale" / locale / "LC_MESSAGES" / "messages.po"
+
+  def make_executor(self, *args):
+    args = make_parser().parse_args(["extract", *args])
+    return args.executor_factory(args)
+
+  def read_messages(self, file_path):
+    messages = parse_po_lines(file_path.read_text(encoding="utf-8").splitlines())
+    return [
+      (x.context, x.id, x.id_plural, x.flags, x.references)
+      for x in messages
+      if not x.is_header
+    ]
+
+  def extract(self, *args):
+    executor = self.make_executor(*args)
+
+    with mock.patch("verboselib.cli.command_extract.validate_gettext_tools_exist") as validate:
+      with mock.patch(
+        "verboselib.cli.command_extract.extract_unique_messages",
+        side_effect=lambda pot_content, **kwargs: pot_content,
+      ) as extract_unique_messages:
+        executor()
+
+    self.required_tools = validate.call_args.args[0]
+    self.msguniq_calls_count = extract_unique_messages.call_count
+
+  def test_msguniq(self):
+    for args, is_used in [
+      ([], True),
+      (["--no-msguniq"], False),
+      (["--extractor", "native"], False),
+      (["--extractor", "native", "--msguniq-extra-args=--sort-output"], True),
+    ]:
+      with self.subTest(args=args):
+        self.extract("-l", "uk", "-j", "1", *args)
+
+        self.assertEqual("msguniq" in self.required_tools, is_used)
+        self.assertEqual(self.msguniq_calls_count, int(is_used))
+
+        self.get_po_file_path("uk").unlink()
+
+  def test_msguniq_extra_args_without_msguniq(self):
+    with mock.patch("verboselib.cli.command_extract.print_err"):
+      with self.assertRaises(SystemExit):
+        self.make_executor("-l", "uk", "--no-msguniq", "--msguniq-extra-args=--sort-output")
+
+  def test_iter_batches(self):
+    executor = self.make_executor("-l", "uk", "-j", "2", "--batch-size", "4")
+    paths = [Path(f"m{i:02}.py") for i in range(20)]
+
+    batches = list(executor._iter_batches(iter(paths)))
+
+    self.assertEqual(list(map(len, batches)), [1, 1, 2, 2, 4, 4, 4, 2, ])
+    self.assertEqual([x for batch in batches for x in batch], paths)
+
+  def test_batches(self):
+    pot_file_path = self.dir_path / "locale" / "messages.pot"
+
+    self.extract("-l", "uk", "-j", "1", "--batch-size", "100", "--keep-pot")
+    expected = self.read_messages(pot_file_path)
+
+    self.assertEqual(
+      [x[4] for x in expected if x[1] == "shared"],
+      [[f"m{i:02}.py:1" for i in range(20)], ],
+    )
+
+    for jobs, batch_size in [(1, 1), (2, 3), (4, 100), ]:
+      with self.subTest(jobs=jobs, batch_size=batch_size):
+        self.get_po_file_path("uk").unlink()
+
+        self.extract("-l", "uk", "-j", str(jobs), "--batch-size", str(batch_size), "--keep-pot")
+        self.assertEqual(self.read_messages(pot_file_path), expected)
+
+  def test_parallel_merges(self):
+    locales = ["de", "fr", "ru", "uk", ]
+    locale_args = [x for locale in locales for x in ["-l", locale]]
+
+    self.extract(*locale_args, "-j", "1")
+
+    for locale in locales:
+      po_file_path = self.get_po_file_path(locale)
+      content = po_file_path.read_text(encoding="utf-8")
+      for i in [1, 2, ]:
+        content = content.replace(
+          f'msgid "message {i}"\nmsgstr ""',
+          f'msgid "message {i}"\nmsgstr "message {i} in {locale}"',
+        )
+
+      po_file_path.write_text(content, encoding="utf-8")
+
+    (self.dir_path / "m01.py").write_text("_('message 1!')\n")
+    (self.dir_path / "m02.py").unlink()
+
+    original = {
+      locale: self.get_po_file_path(locale).read_text(encoding="utf-8")
+      for locale in locales
+    }
+
+    def merge(jobs):
+      for locale, content in original.items():
+        self.get_po_file_path(locale).write_text(content, encoding="utf-8")
+
+      self.extract(*locale_args, "-j", str(jobs), "--merger", "native")
+
+      # creation dates of runs can differ
+      return {
+        locale: re.sub(
+          r"POT-Creation-Date: .*",
+          "",
+          self.get_po_file_path(locale).read_text(encoding="utf-8"),
+        )
+        for locale in locales
+      }
+
+    expected = merge(jobs=1)
+    self.assertIn('#| msgid "message 1"\nmsgid "message 1!"\nmsgstr "message 1 in uk"', expected["uk"])
+    self.assertIn('#~ msgid "message 2"\n#~ msgstr "message 2 in uk"', expected["uk"])
+
+    self.assertEqual(merge(jobs=4), expected)
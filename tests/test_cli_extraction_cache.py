@@ -0,0 +1,247 @@
+import os
+import tempfile
+import textwrap
+import unittest
+
+from pathlib import Path
+from unittest import mock
+
+from verboselib.cli.extraction_cache import split_fragment
+from verboselib.cli.extraction_cache import ExtractionCache
+from verboselib.cli.main import make_parser
+from verboselib.cli.po import parse_po_lines
+
+from .test_cli_extract import extract_translations
+
+
+class ExtractionCacheTestCase(unittest.TestCase):
+
+  def make_cache(self, dir_path, **kwargs):
+    options = dict(
+      dir_path=dir_path / "cache",
+      domain="messages",
+      keywords=["_"],
+      no_wrap=False,
+      no_location=False,
+      xgettext_extra_args=[],
+    )
+    options.update(kwargs)
+    return ExtractionCache(**options)
+
+  def test_get_put(self):
+    with tempfile.TemporaryDirectory() as dir_path:
+      dir_path = Path(dir_path)
+      source_file_path = dir_path / "a.py"
+      source_file_path.write_text("_('a')")
+
+      cache = self.make_cache(dir_path)
+      key = cache.make_key(source_file_path)
+
+      self.assertIsNone(cache.get(key))
+
+      cache.put(key, "msgid \"a\"\nmsgstr \"\"")
+      self.assertEqual(cache.get(key), "msgid \"a\"\nmsgstr \"\"")
+
+      source_file_path.write_text("_('b')")
+      self.assertIsNone(cache.get(cache.make_key(source_file_path)))
+
+  def test_key_depends_on_options(self):
+    with tempfile.TemporaryDirectory() as dir_path:
+      dir_path = Path(dir_path)
+      source_file_path = dir_path / "a.py"
+      source_file_path.write_text("_('a')")
+
+      key = self.make_cache(dir_path).make_key(source_file_path)
+
+      for options in [
+        dict(domain="other"),
+        dict(keywords=["_", "L_"]),
+        dict(no_wrap=True),
+        dict(no_location=True),
+        dict(xgettext_extra_args=["--sort-output"]),
+      ]:
+        with self.subTest(options=options):
+          self.assertNotEqual(
+            self.make_cache(dir_path, **options).make_key(source_file_path),
+            key,
+          )
+
+  def test_key_depends_on_path_only_with_locations(self):
+    with tempfile.TemporaryDirectory() as dir_path:
+      dir_path = Path(dir_path)
+      a_path = dir_path / "a.py"
+      b_path = dir_path / "b.py"
+      a_path.write_text("_('a')")
+      b_path.write_text("_('a')")
+
+      cache = self.make_cache(dir_path)
+      self.assertNotEqual(cache.make_key(a_path), cache.make_key(b_path))
+
+      cache = self.make_cache(dir_path, no_location=True)
+      self.assertEqual(cache.make_key(a_path), cache.make_key(b_path))
+
+  def test_prune(self):
+    with tempfile.TemporaryDirectory() as dir_path:
+      dir_path = Path(dir_path)
+      a_path = dir_path / "a.py"
+      b_path = dir_path / "b.py"
+      a_path.write_text("_('a')")
+      b_path.write_text("_('b')")
+
+      cache = self.make_cache(dir_path)
+      a_key = cache.make_key(a_path)
+      b_key = cache.make_key(b_path)
+      cache.put(a_key, "a")
+      cache.put(b_key, "b")
+
+      cache = self.make_cache(dir_path)
+      self.assertEqual(cache.get(a_key), "a")
+      self.assertEqual(cache.prune(), 1)
+
+      cache = self.make_cache(dir_path)
+      self.assertEqual(cache.get(a_key), "a")
+      self.assertIsNone(cache.get(b_key))
+      self.assertEqual(cache.prune(), 0)
+
+
+class SplitFragmentTestCase(unittest.TestCase):
+
+  CONTENT = textwrap.dedent("""\
+    msgid ""
+    msgstr ""
+    "Content-Type: text/plain; charset=CHARSET\\n"
+
+    #: a.py:1 b.py:3
+    msgid "shared"
+    msgstr ""
+
+    #: a.py:2
+    msgid "a"
+    msgstr ""
+
+    #. Translators: comment
+    #: b.py:1
+    msgid "b"
+    msgstr ""
+  """)
+
+  def test_split(self):
+    fragments = split_fragment(
+      content=self.CONTENT,
+      source_files_paths=[Path("a.py"), Path("b.py"), ],
+      no_location=False,
+      no_wrap=False,
+    )
+    self.assertEqual(fragments, {
+      Path("a.py"): '#: a.py:1\nmsgid "shared"\nmsgstr ""\n\n#: a.py:2\nmsgid "a"\nmsgstr ""',
+      Path("b.py"): (
+        '#. Translators: comment\n#: b.py:1\nmsgid "b"\nmsgstr ""\n\n'
+        '#: b.py:3\nmsgid "shared"\nmsgstr ""'
+      ),
+    })
+
+  def test_split_without_locations(self):
+    fragments = split_fragment(
+      content=self.CONTENT,
+      source_files_paths=[Path("a.py"), Path("b.py"), Path("c.py"), ],
+      no_location=True,
+      no_wrap=False,
+    )
+    self.assertEqual(fragments, {
+      Path("a.py"): 'msgid "shared"\nmsgstr ""\n\nmsgid "a"\nmsgstr ""',
+      Path("b.py"): '#. Translators: comment\nmsgid "b"\nmsgstr ""\n\nmsgid "shared"\nmsgstr ""',
+      Path("c.py"): "",
+    })
+
+  def test_unknown_files(self):
+    self.assertIsNone(split_fragment(
+      content=self.CONTENT,
+      source_files_paths=[Path("a.py"), Path("c.py"), ],
+      no_location=False,
+      no_wrap=False,
+    ))
+
+    self.assertIsNone(split_fragment(
+      content=self.CONTENT.replace("#: b.py:1\n", ""),
+      source_files_paths=[Path("a.py"), Path("b.py"), ],
+      no_location=False,
+      no_wrap=False,
+    ))
+
+
+@mock.patch("verboselib.cli.command_extract.validate_gettext_tools_exist", mock.Mock())
+class ExtractWithCacheTestCase(unittest.TestCase):
+
+  def setUp(self):
+    self._tmp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(self._tmp_dir.cleanup)
+
+    self.dir_path = Path(os.path.realpath(self._tmp_dir.name))
+
+    current_dir_path = os.getcwd()
+    os.chdir(self.dir_path)
+    self.addCleanup(os.chdir, current_dir_path)
+
+    for i in range(7):
+      (self.dir_path / f"m{i}.py").write_text(f"_('shared')\n_('message {i}')\n")
+
+    self.po_file_path = self.dir_path / "locale" / "uk" / "LC_MESSAGES" / "messages.po"
+
+  def extract(self, *extra_args):
+    args = make_parser().parse_args([
+      "extract",
+      "--locale", "uk",
+      "--jobs", "2",
+      "--batch-size", "2",
+      "--no-msguniq",
+      *extra_args,
+    ])
+    executor = args.executor_factory(args)
+
+    with mock.patch(
+      "verboselib.cli.command_extract.extract_translations",
+      wraps=extract_translations,
+    ) as extract:
+      executor()
+
+    # remove the '.po' file, so the next run does not need 'msgmerge'
+    content = self.po_file_path.read_text()
+    self.po_file_path.unlink()
+
+    messages = [
+      x
+      for x in parse_po_lines(content.splitlines())
+      if not x.is_header
+    ]
+    calls = [x.kwargs["source_files_paths"] for x in extract.call_args_list]
+    return messages, calls
+
+  def get_entries_count(self):
+    return sum(1 for __ in (self.dir_path / "cache").rglob("*.pot"))
+
+  def test_extract(self):
+    expected, __ = self.extract()
+
+    messages, calls = self.extract("--cache-dir", "cache")
+    self.assertEqual(
+      [(x.id, x.references) for x in messages],
+      [(x.id, x.references) for x in expected],
+    )
+    self.assertEqual(sum(map(len, calls)), 7)
+    self.assertLess(len(calls), 7)
+    self.assertEqual(self.get_entries_count(), 7)
+
+    messages, calls = self.extract("--cache-dir", "cache")
+    self.assertEqual(
+      [(x.id, x.references) for x in messages],
+      [(x.id, x.references) for x in expected],
+    )
+    self.assertEqual(calls, [])
+
+    (self.dir_path / "m3.py").write_text("_('changed')\n")
+    (self.dir_path / "m5.py").unlink()
+
+    messages, calls = self.extract("--cache-dir", "cache")
+    self.assertEqual(calls, [[Path("m3.py"), ], ])
+    self.assertIn("changed", [x.id for x in messages])
+    self.assertEqual(self.get_entries_count(), 6)
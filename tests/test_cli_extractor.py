@@ -0,0 +1,137 @@
+import tempfile
+import textwrap
+import unittest
+
+from pathlib import Path
+
+from verboselib.cli.defaults import COMMENT_TAG
+from verboselib.cli.defaults import DEFAULT_KEYWORDS
+from verboselib.cli.extractor import collect_messages
+from verboselib.cli.extractor import extract_messages_from_file
+from verboselib.cli.extractor import extract_messages_from_source
+from verboselib.cli.extractor import parse_keyword_spec
+from verboselib.cli.extractor import parse_keywords
+from verboselib.cli.extractor import KeywordSpec
+
+
+KEYWORDS = parse_keywords(DEFAULT_KEYWORDS)
+
+
+def extract(source):
+  source = textwrap.dedent(source).encode("utf-8")
+  return extract_messages_from_source(source, KEYWORDS, COMMENT_TAG)
+
+
+class ParseKeywordSpecTestCase(unittest.TestCase):
+
+  def test_valid(self):
+    self.assertEqual(parse_keyword_spec("_"), KeywordSpec("_", 0))
+    self.assertEqual(parse_keyword_spec("N_:1,2"), KeywordSpec("N_", 0, plural=1))
+    self.assertEqual(parse_keyword_spec("P_:1c,2"), KeywordSpec("P_", 1, context=0))
+    self.assertEqual(parse_keyword_spec("NP_:1c,2,3"), KeywordSpec("NP_", 1, plural=2, context=0))
+    self.assertEqual(parse_keyword_spec("T_:2,3t"), KeywordSpec("T_", 1, total=3))
+
+  def test_invalid(self):
+    for value in ["", "1_", "_:0", "_:x", "_:1,2,3", "_:1c"]:
+      with self.subTest(value=value):
+        with self.assertRaises(ValueError):
+          parse_keyword_spec(value)
+
+
+class ExtractMessagesTestCase(unittest.TestCase):
+
+  def test_keywords(self):
+    occurrences = extract("""
+      _("a")
+      self.gettext("b")
+      N_("%d file", "%d files", n)
+      P_("ctx", "c")
+      NP_("ctx", "%(n)d dir", "%(n)d dirs", n)
+    """)
+
+    self.assertEqual(
+      [(x.context, x.id, x.id_plural, x.line_number, x.is_python_format) for x in occurrences],
+      [
+        (None,  "a",         None,         2, False),
+        (None,  "b",         None,         3, False),
+        (None,  "%d file",   "%d files",   4, True),
+        ("ctx", "c",         None,         5, False),
+        ("ctx", "%(n)d dir", "%(n)d dirs", 6, True),
+      ],
+    )
+
+  def test_skipped_calls(self):
+    occurrences = extract("""
+      _(name)
+      _(f"{name}")
+      _("")
+      _()
+      N_("one", name, n)
+      P_(name, "a")
+      _(*args)
+      foo("b")
+    """)
+    self.assertEqual(occurrences, [])
+
+  def test_comments(self):
+    occurrences = extract("""
+      x = 1
+      # Translators: the first line
+      # the second line
+
+      a = _("a")
+      # not for translators
+      b = _("b")
+      # a comment
+      # Translators: only this
+      c = _(
+        "c"
+      )
+    """)
+
+    self.assertEqual(
+      [(x.id, x.comments) for x in occurrences],
+      [
+        ("a", ("Translators: the first line", "the second line")),
+        ("b", ()),
+        ("c", ("Translators: only this", )),
+      ],
+    )
+
+  def test_syntax_error(self):
+    with tempfile.TemporaryDirectory() as dir_path:
+      file_path = Path(dir_path) / "broken.py"
+      file_path.write_text("def f(:\n")
+
+      occurrences, warnings = extract_messages_from_file(file_path, KEYWORDS, COMMENT_TAG)
+
+      self.assertEqual(occurrences, [])
+      self.assertIn("broken.py:1", warnings)
+
+
+class CollectMessagesTestCase(unittest.TestCase):
+
+  def test_merge(self):
+    occurrences = [
+      (Path("a.py"), extract("""
+        # Translators: greeting
+        _("hello")
+        _("%d file")
+      """)),
+      (Path("b.py"), extract("""
+        _("hello")
+        N_("%d file", "%d files", n)
+      """)),
+    ]
+
+    messages = collect_messages(occurrences, no_location=False)
+
+    self.assertEqual([x.id for x in messages], ["hello", "%d file"])
+    self.assertEqual(messages[0].references, ["a.py:3", "b.py:2"])
+    self.assertEqual(messages[0].extracted_comments, ["Translators: greeting"])
+    self.assertEqual(messages[1].id_plural, "%d files")
+    self.assertEqual(messages[1].strings, ["", ""])
+    self.assertEqual(messages[1].flags, ["python-format"])
+
+    messages = collect_messages(occurrences, no_location=True)
+    self.assertEqual(messages[0].references, [])
@@ -0,0 +1,161 @@
+import unittest
+
+from verboselib.cli.merge import merge_messages
+from verboselib.cli.merge import FuzzyIndex
+from verboselib.cli.po import parse_po_lines
+from verboselib.cli.po import Message
+
+
+def parse(content):
+  return list(parse_po_lines(content.strip().splitlines()))
+
+
+DEFINITIONS = parse(r'''
+msgid ""
+msgstr ""
+"POT-Creation-Date: 2020-01-01 00:00+0000\n"
+"Content-Type: text/plain; charset=ISO-8859-1\n"
+"Plural-Forms: nplurals=3; plural=n%10==1 && n%100!=11 ? 0 : n%10>=2 && n%10<=4 && (n%100<10 || n%100>=20) ? 1 : 2;\n"
+
+# translator comment
+#: old.py:1
+msgid "Good morning, world"
+msgstr "Доброго ранку, світе"
+
+msgid "file"
+msgstr "файл"
+
+#, fuzzy
+#| msgid "old window"
+msgid "window"
+msgstr "вікно"
+
+msgid "removed"
+msgstr "видалено"
+
+msgid "removed untranslated"
+msgstr ""
+
+#~ msgid "revived"
+#~ msgstr "відновлено"
+''')
+
+REFERENCES = parse(r'''
+msgid ""
+msgstr ""
+"POT-Creation-Date: 2030-01-01 00:00+0000\n"
+"Content-Type: text/plain; charset=UTF-8\n"
+
+#: new.py:1
+#, python-format
+msgid "Good morning, world!"
+msgstr ""
+
+#: new.py:2
+msgid "file"
+msgid_plural "files"
+msgstr[0] ""
+msgstr[1] ""
+
+msgid "window"
+msgstr ""
+
+msgid "revived"
+msgstr ""
+
+msgid "completely new"
+msgstr ""
+''')
+
+
+class MergeMessagesTestCase(unittest.TestCase):
+
+  def merge(self, fuzzy_threshold=0.6):
+    messages = merge_messages(DEFINITIONS, REFERENCES, fuzzy_threshold)
+    return {x.id: x for x in messages}
+
+  def test_header(self):
+    header = self.merge()[""]
+
+    self.assertIn("POT-Creation-Date: 2030-01-01 00:00+0000\n", header.strings[0])
+    self.assertIn("charset=UTF-8", header.strings[0])
+    self.assertIn("nplurals=3", header.strings[0])
+
+  def test_fuzzy_match(self):
+    message = self.merge()["Good morning, world!"]
+
+    self.assertEqual(message.strings, ["Доброго ранку, світе"])
+    self.assertEqual(message.flags, ["fuzzy", "python-format"])
+    self.assertEqual(message.previous, ['msgid "Good morning, world"'])
+    self.assertEqual(message.translator_comments, ["translator comment"])
+    self.assertEqual(message.references, ["new.py:1"])
+
+  def test_no_fuzzy_matching(self):
+    messages = self.merge(fuzzy_threshold=None)
+
+    message = messages["Good morning, world!"]
+    self.assertEqual(message.strings, [""])
+    self.assertEqual(message.flags, ["python-format"])
+    self.assertEqual(message.previous, [])
+
+    self.assertTrue(messages["Good morning, world"].is_obsolete)
+
+  def test_exact_match(self):
+    messages = self.merge()
+
+    message = messages["window"]
+    self.assertEqual(message.strings, ["вікно"])
+    self.assertEqual(message.flags, ["fuzzy"])
+    self.assertEqual(message.previous, ['msgid "old window"'])
+
+    message = messages["revived"]
+    self.assertEqual(message.strings, ["відновлено"])
+    self.assertFalse(message.is_obsolete)
+
+  def test_plurality_change(self):
+    message = self.merge()["file"]
+
+    self.assertEqual(message.id_plural, "files")
+    self.assertEqual(message.strings, ["файл", "", ""])
+    self.assertTrue(message.is_fuzzy)
+
+  def test_new_and_obsolete(self):
+    messages = merge_messages(DEFINITIONS, REFERENCES, 0.6)
+
+    self.assertEqual(
+      [(x.id, x.is_obsolete) for x in messages],
+      [
+        ("", False),
+        ("Good morning, world!", False),
+        ("file", False),
+        ("window", False),
+        ("revived", False),
+        ("completely new", False),
+        ("removed", True),
+      ],
+    )
+    self.assertEqual(messages[5].strings, [""])
+
+
+class FuzzyIndexTestCase(unittest.TestCase):
+
+  def test_search(self):
+    index = FuzzyIndex(
+      [
+        Message(id="Open file", strings=["Відкрити файл"]),
+        Message(id="Open files", strings=["Відкрити файли"]),
+        Message(id="Close file", strings=["Закрити файл"], context="menu"),
+        Message(id="Save file", strings=[""]),
+      ],
+      threshold=0.6,
+    )
+
+    self.assertEqual(index.search(None, "Open file!").id, "Open file")
+    self.assertEqual(index.search(None, "Open fil").id, "Open file")
+    self.assertEqual(index.search("menu", "Close files").id, "Close file")
+    self.assertIsNone(index.search(None, "Close window"))
+    self.assertIsNone(index.search(None, "Something else"))
+
+  def test_untranslated_messages_are_not_candidates(self):
+    index = FuzzyIndex([Message(id="Save file", strings=[""])], threshold=0.6)
+    self.assertIsNone(index.search(None, "Save files"))
@@ -0,0 +1,172 @@
+import gettext
+import io
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from verboselib.cli.mo import check_format
+from verboselib.cli.mo import compile_po_file
+from verboselib.cli.mo import make_mo_content
+from verboselib.cli.mo import select_messages
+from verboselib.cli.mo import CompilationError
+from verboselib.cli.po import parse_po_lines
+from verboselib.cli.po import read_po_file
+from verboselib.cli.po import Message
+
+from .constants import LOCALE_DOMAIN
+from .constants import LOCALE_DIR_PATH
+
+
+LOCALES = ["en_GB", "en_US", "ru", "uk", ]
+
+
+def parse(content):
+  return list(parse_po_lines(content.strip().splitlines()))
+
+
+class ParsePoTestCase(unittest.TestCase):
+
+  def test_entries(self):
+    messages = parse(r'''
+# translator comment
+#. extracted comment
+#: a.py:1 b.py:2
+#, fuzzy, python-format
+#| msgid "old"
+msgctxt "ctx"
+msgid ""
+"multi\n"
+"line"
+msgstr "x\ty \"z\" \\ \101"
+
+#~ msgid "obsolete"
+#~ msgstr "obsolete translation"
+''')
+
+    self.assertEqual(len(messages), 2)
+
+    message = messages[0]
+    self.assertEqual(message.context, "ctx")
+    self.assertEqual(message.id, "multi\nline")
+    self.assertEqual(message.strings, ["x\ty \"z\" \\ A"])
+    self.assertEqual(message.flags, ["fuzzy", "python-format"])
+    self.assertEqual(message.translator_comments, ["translator comment"])
+    self.assertEqual(message.extracted_comments, ["extracted comment"])
+    self.assertEqual(message.references, ["a.py:1", "b.py:2"])
+    self.assertEqual(message.previous, ["msgid \"old\""])
+    self.assertTrue(message.is_fuzzy)
+    self.assertFalse(message.is_obsolete)
+
+    self.assertTrue(messages[1].is_obsolete)
+    self.assertEqual(messages[1].id, "obsolete")
+
+  def test_syntax_error(self):
+    with self.assertRaises(ValueError):
+      parse('msgid "a"\nmsgstr b')
+
+
+class MakeMoContentTestCase(unittest.TestCase):
+
+  def test_same_as_msgfmt(self):
+    for locale in LOCALES:
+      with self.subTest(locale=locale):
+        dir_path = LOCALE_DIR_PATH / locale / "LC_MESSAGES"
+        messages = select_messages(read_po_file(dir_path / f"{LOCALE_DOMAIN}.po"), use_fuzzy=False)
+
+        actual = make_mo_content(messages)
+        expected = (dir_path / f"{LOCALE_DOMAIN}.mo").read_bytes()
+
+        self.assertEqual(actual, expected)
+
+  def test_many_messages(self):
+    messages = [Message(id="", strings=["Content-Type: text/plain; charset=UTF-8\n"])]
+    messages.extend(
+      Message(id=f"message {i}", strings=[f"translation {i}"])
+      for i in range(500)
+    )
+
+    catalog = gettext.GNUTranslations(io.BytesIO(make_mo_content(messages)))
+
+    for i in range(500):
+      self.assertEqual(catalog.gettext(f"message {i}"), f"translation {i}")
+
+  def test_select_messages(self):
+    messages = parse(r'''
+#, fuzzy
+msgid ""
+msgstr "Content-Type: text/plain; charset=UTF-8\n"
+
+#, fuzzy
+msgid "fuzzy"
+msgstr "fuzzy translation"
+
+msgid "untranslated"
+msgstr ""
+
+msgid "translated"
+msgstr "translation"
+''')
+
+    selected = select_messages(messages, use_fuzzy=False)
+    self.assertEqual([x.id for x in selected], ["", "translated"])
+
+    selected = select_messages(messages, use_fuzzy=True)
+    self.assertEqual([x.id for x in selected], ["", "fuzzy", "translated"])
+
+
+class CheckFormatTestCase(unittest.TestCase):
+
+  def check(self, flag, original, translation):
+    check_format(Message(id=original, strings=[translation], flags=[flag]))
+
+  def test_python_format(self):
+    self.check("python-format", "%d apples", "%i яблук")
+    self.check("python-format", "%(a)s and %(b)d", "%(b)d і %(a)s")
+    self.check("python-format", "100%% of %s", "%s на 100%%")
+
+    for translation in ["%s яблук", "яблука", "%d %d", "%(a)d", "%"]:
+      with self.subTest(translation=translation):
+        with self.assertRaises(CompilationError):
+          self.check("python-format", "%d apples", translation)
+
+  def test_python_brace_format(self):
+    self.check("python-brace-format", "Good morning, {name}!", "Доброго ранку, {name}!")
+    self.check("python-brace-format", "{} of {}", "{} з {}")
+
+    for translation in ["Доброго ранку, {user}!", "Доброго ранку!", "{name"]:
+      with self.subTest(translation=translation):
+        with self.assertRaises(CompilationError):
+          self.check("python-brace-format", "Good morning, {name}!", translation)
+
+  def test_plural_forms_can_omit_arguments(self):
+    check_format(Message(
+      id="one file",
+      id_plural="%d files",
+      strings=["один файл", "%d файли", "%d файлів"],
+      flags=["python-format"],
+    ))
+
+
+class CompilePoFileTestCase(unittest.TestCase):
+
+  def test_compile(self):
+    with tempfile.TemporaryDirectory() as dir_path:
+      mo_file_path = Path(dir_path) / "tests.mo"
+      po_file_path = LOCALE_DIR_PATH / "uk" / "LC_MESSAGES" / f"{LOCALE_DOMAIN}.po"
+
+      warnings = compile_po_file(mo_file_path, po_file_path, fuzzy=False)
+
+      self.assertEqual(warnings, "")
+      self.assertEqual(
+        mo_file_path.read_bytes(),
+        po_file_path.with_suffix(".mo").read_bytes(),
+      )
+
+  def test_duplicates(self):
+    with tempfile.TemporaryDirectory() as dir_path:
+      po_file_path = Path(dir_path) / "tests.po"
+      po_file_path.write_text('msgid "a"\nmsgstr "b"\n\nmsgid "a"\nmsgstr "c"\n')
+
+      with self.assertRaises(RuntimeError):
+        compile_po_file(po_file_path.with_suffix(".mo"), po_file_path, fuzzy=False)
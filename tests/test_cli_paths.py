@@ -0,0 +1,173 @@
+import os
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from verboselib.cli.gitignore import GitIgnore
+from verboselib.cli.paths import is_source_file_path
+from verboselib.cli.paths import iter_source_files_paths
+
+
+class GitIgnoreTestCase(unittest.TestCase):
+
+  def test_match(self):
+    gitignore = GitIgnore.from_lines([
+      "# comment",
+      "",
+      "*.log",
+      "!keep.log",
+      "build/",
+      "/dist",
+      "docs/*.py",
+      "**/generated",
+      "data/**",
+    ])
+
+    cases = [
+      ("a.log",             False, True),
+      ("sub/a.log",         False, True),
+      ("keep.log",          False, False),
+      ("build",             True,  True),
+      ("build",             False, None),
+      ("dist",              True,  True),
+      ("sub/dist",          True,  None),
+      ("docs/conf.py",      False, True),
+      ("sub/docs/conf.py",  False, None),
+      ("generated",         True,  True),
+      ("a/b/generated",     True,  True),
+      ("data/a.py",         False, True),
+      ("module.py",         False, None),
+    ]
+
+    for path, is_dir, expected in cases:
+      with self.subTest(path=path, is_dir=is_dir):
+        self.assertEqual(gitignore.match(path, is_dir), expected)
+
+  def test_empty(self):
+    self.assertFalse(GitIgnore.from_lines(["# comment", ""]))
+
+
+class IterSourceFilesPathsTestCase(unittest.TestCase):
+
+  def make_tree(self, root, files):
+    for name in files:
+      path = root / name
+      path.parent.mkdir(parents=True, exist_ok=True)
+      path.write_text("")
+
+  def find(self, root, **kwargs):
+    options = dict(
+      ignore_patterns=[".*", "__pycache__"],
+      extensions={".py"},
+      follow_links=False,
+      verbose=False,
+    )
+    options.update(kwargs)
+
+    return [
+      x.relative_to(root).as_posix()
+      for x in iter_source_files_paths(root, **options)
+    ]
+
+  def test_sorted(self):
+    with tempfile.TemporaryDirectory() as root:
+      root = Path(root)
+      files = [
+        "b.py",
+        "a/z.py",
+        "a.py",
+        "a/b/c.py",
+        "a.b/c.py",
+        "c.txt",
+        ".hidden/a.py",
+        "__pycache__/a.py",
+      ]
+      self.make_tree(root, files)
+
+      result = self.find(root)
+
+      expected = sorted(
+        Path(x)
+        for x in files
+        if x.endswith(".py") and not x.startswith((".", "__"))
+      )
+      self.assertEqual(result, [x.as_posix() for x in expected])
+
+  def test_dir_patterns(self):
+    with tempfile.TemporaryDirectory() as root:
+      root = Path(root)
+      self.make_tree(root, ["build/a.py", "src/b.py"])
+
+      result = self.find(root, ignore_patterns=[f"build{os.sep}*"])
+
+      self.assertEqual(result, ["src/b.py"])
+
+  def test_gitignore(self):
+    with tempfile.TemporaryDirectory() as root:
+      root = Path(root)
+      self.make_tree(root, [
+        "a.py",
+        "generated.py",
+        "build/a.py",
+        "src/b.py",
+        "src/local.py",
+        "src/keep/c.py",
+      ])
+      (root / ".gitignore").write_text("generated.py\nbuild/\n")
+      (root / "src" / ".gitignore").write_text("local.py\n")
+
+      self.assertEqual(
+        self.find(root, use_gitignore=True),
+        ["a.py", "src/b.py", "src/keep/c.py"],
+      )
+      self.assertEqual(
+        self.find(root),
+        ["a.py", "build/a.py", "generated.py", "src/b.py", "src/keep/c.py", "src/local.py"],
+      )
+
+
+class IsSourceFilePathTestCase(unittest.TestCase):
+
+  def test_same_as_walk(self):
+    with tempfile.TemporaryDirectory() as root:
+      root = Path(root)
+      files = [
+        "a.py",
+        "a.txt",
+        "generated.py",
+        ".hidden.py",
+        ".hidden/a.py",
+        "__pycache__/a.py",
+        "build/a.py",
+        "src/b.py",
+        "src/local.py",
+        "src/keep/c.py",
+      ]
+      for name in files:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+
+      (root / ".gitignore").write_text("generated.py\nbuild/\n")
+      (root / "src" / ".gitignore").write_text("local.py\n")
+
+      current_dir_path = os.getcwd()
+      os.chdir(root)
+      self.addCleanup(os.chdir, current_dir_path)
+
+      for use_gitignore in [False, True]:
+        options = dict(
+          ignore_patterns=[".*", "__pycache__"],
+          extensions={".py"},
+          follow_links=False,
+          use_gitignore=use_gitignore,
+        )
+        expected = set(iter_source_files_paths(Path(os.curdir), verbose=False, **options))
+
+        for name in files + ["missing.py", "../a.py"]:
+          with self.subTest(name=name, use_gitignore=use_gitignore):
+            self.assertEqual(
+              is_source_file_path(Path(name), **options),
+              Path(name) in expected,
+            )
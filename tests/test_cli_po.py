@@ -0,0 +1,113 @@
+import unittest
+
+from verboselib.cli.po import format_message
+from verboselib.cli.po import make_po_content
+from verboselib.cli.po import read_po_file
+from verboselib.cli.po import Catalog
+from verboselib.cli.po import Message
+
+from .constants import LOCALE_DOMAIN
+from .constants import LOCALE_DIR_PATH
+
+
+LOCALES = ["en_GB", "en_US", "ru", "uk", ]
+
+
+class MakePoContentTestCase(unittest.TestCase):
+
+  def test_same_as_gettext_tools(self):
+    for locale in LOCALES:
+      with self.subTest(locale=locale):
+        file_path = LOCALE_DIR_PATH / locale / "LC_MESSAGES" / f"{LOCALE_DOMAIN}.po"
+
+        actual = make_po_content(read_po_file(file_path))
+        expected = file_path.read_text(encoding="utf-8")
+
+        self.assertEqual(actual, expected)
+
+
+class FormatMessageTestCase(unittest.TestCase):
+
+  def test_wrapping(self):
+    message = Message(id="word " * 20, strings=["a\nb"])
+
+    self.assertEqual(
+      format_message(message),
+      'msgid ""\n'
+      f'"{"word " * 15}"\n'
+      f'"{"word " * 5}"\n'
+      'msgstr ""\n'
+      '"a\\n"\n'
+      '"b"\n'
+    )
+
+    self.assertEqual(
+      format_message(message, no_wrap=True),
+      f'msgid "{"word " * 20}"\n'
+      'msgstr ""\n'
+      '"a\\n"\n'
+      '"b"\n'
+    )
+
+  def test_obsolete(self):
+    message = Message(
+      id="a",
+      strings=["b"],
+      translator_comments=["comment"],
+      previous=['msgid "c"'],
+      is_obsolete=True,
+    )
+
+    self.assertEqual(
+      format_message(message),
+      '# comment\n'
+      '#~| msgid "c"\n'
+      '#~ msgid "a"\n'
+      '#~ msgstr "b"\n'
+    )
+
+
+class CatalogTestCase(unittest.TestCase):
+
+  def test_deduplication(self):
+    catalog = Catalog()
+    catalog.update([
+      Message(id="a", references=["a.py:1"], extracted_comments=["comment"]),
+      Message(id="b", context="ctx", references=["a.py:2"]),
+      Message(id="b", references=["a.py:3"]),
+      Message(id="a", references=["b.py:1"], flags=["python-format"]),
+      Message(id="a", id_plural="as", strings=["", ""], references=["b.py:2"]),
+    ])
+
+    messages = list(catalog)
+
+    self.assertEqual(len(catalog), 3)
+    self.assertEqual([(x.context, x.id) for x in messages], [(None, "a"), ("ctx", "b"), (None, "b")])
+    self.assertEqual(messages[0].references, ["a.py:1", "b.py:1", "b.py:2"])
+    self.assertEqual(messages[0].extracted_comments, ["comment"])
+    self.assertEqual(messages[0].flags, ["python-format"])
+    self.assertEqual(messages[0].id_plural, "as")
+
+  def test_serialize(self):
+    header = Message(id="", strings=["Content-Type: text/plain; charset=UTF-8\n"])
+
+    catalog = Catalog(header)
+    catalog.add(Message(id="a"))
+    self.assertEqual(
+      catalog.serialize(),
+      'msgid ""\n'
+      'msgstr "Content-Type: text/plain; charset=UTF-8\\n"\n'
+      '\n'
+      'msgid "a"\n'
+      'msgstr ""\n'
+    )
+
+    catalog.add(Message(id="b", id_plural="bs", strings=["", ""]))
+    self.assertIn('"Plural-Forms: nplurals=INTEGER; plural=EXPRESSION;\\n"\n', catalog.serialize())
+
+  def test_default_header(self):
+    content = Catalog().serialize()
+
+    self.assertTrue(content.startswith("# SOME DESCRIPTIVE TITLE.\n"))
+    self.assertIn('"Content-Type: text/plain; charset=UTF-8\\n"\n', content)
+    self.assertNotIn("Plural-Forms", content)
@@ -0,0 +1,52 @@
+import os
+import stat
+import tempfile
+import unittest
+
+from pathlib import Path
+from unittest import mock
+
+from verboselib.cli.utils import _read_umask
+from verboselib.cli.utils import write_file_atomically
+
+
+@unittest.skipIf(os.name == "nt", "POSIX permissions are required")
+class WriteFileAtomicallyTestCase(unittest.TestCase):
+
+  def setUp(self):
+    self.tmp_dir = tempfile.TemporaryDirectory()
+    self.file_path = Path(self.tmp_dir.name) / "messages.mo"
+
+  def tearDown(self):
+    self.tmp_dir.cleanup()
+
+  def get_mode(self):
+    return stat.S_IMODE(self.file_path.stat().st_mode)
+
+  def test_new_file(self):
+    with mock.patch("verboselib.cli.utils._umask", 0o027):
+      write_file_atomically(self.file_path, b"content")
+
+    self.assertEqual(self.file_path.read_bytes(), b"content")
+    self.assertEqual(self.get_mode(), 0o640)
+
+  def test_existing_file(self):
+    self.file_path.write_bytes(b"old")
+    self.file_path.chmod(0o604)
+
+    write_file_atomically(self.file_path, b"new")
+
+    self.assertEqual(self.file_path.read_bytes(), b"new")
+    self.assertEqual(self.get_mode(), 0o604)
+
+  def test_no_temporary_files(self):
+    write_file_atomically(self.file_path, b"content")
+    self.assertEqual(os.listdir(self.tmp_dir.name), [self.file_path.name, ])
+
+  def test_read_umask(self):
+    umask = os.umask(0o027)
+    try:
+      self.assertEqual(_read_umask(), 0o027)
+      self.assertEqual(_read_umask(), 0o027)
+    finally:
+      os.umask(umask)
@@ -0,0 +1,265 @@
+import os
+import tempfile
+import time
+import unittest
+
+from pathlib import Path
+from unittest import mock
+
+from verboselib.cli.extractor import extract_messages_from_file
+from verboselib.cli.main import make_parser
+from verboselib.cli.merge import merge_po_file
+from verboselib.cli.watcher import InotifyWatcher
+from verboselib.cli.watcher import PollingWatcher
+from verboselib.cli.watcher import wait_for_changes
+
+
+NATIVE_ARGS = ["watch", "-l", "uk", "--merger", "native", "--engine", "native", ]
+
+
+class FakeWatcher:
+
+  def __init__(self, changes):
+    self._changes = list(changes)
+
+  def wait(self, timeout=None):
+    return self._changes.pop(0) if self._changes else set()
+
+
+class WaitForChangesTestCase(unittest.TestCase):
+
+  def test_debounce(self):
+    watcher = FakeWatcher([{"a.py"}, {"b.py"}, {"a.py", "c.po"}])
+    self.assertEqual(wait_for_changes(watcher, 0.1), {"a.py", "b.py", "c.po"})
+
+  def test_lost_events(self):
+    watcher = FakeWatcher([{"a.py"}, None, {"b.py"}])
+    self.assertIsNone(wait_for_changes(watcher, 0.1))
+
+
+class WatcherTestCaseMixin:
+
+  def make_watcher(self, dir_path):
+    raise NotImplementedError
+
+  def test_changes(self):
+    with tempfile.TemporaryDirectory() as dir_path:
+      dir_path = os.path.realpath(dir_path)
+      os.mkdir(os.path.join(dir_path, "ignored"))
+
+      with self.make_watcher(dir_path) as watcher:
+        self.assertEqual(watcher.wait(0.05), set())
+
+        file_path = os.path.join(dir_path, "a.py")
+        Path(file_path).write_text("_('a')")
+        Path(dir_path, "a.txt").write_text("")
+        Path(dir_path, "ignored", "b.py").write_text("")
+
+        self.assertEqual(wait_for_changes(watcher, 0.2), {file_path})
+
+        os.mkdir(os.path.join(dir_path, "sub"))
+        time.sleep(0.1)
+        sub_file_path = os.path.join(dir_path, "sub", "c.po")
+        Path(sub_file_path).write_text("")
+
+        self.assertIn(sub_file_path, wait_for_changes(watcher, 0.2))
+
+        os.unlink(file_path)
+        self.assertEqual(wait_for_changes(watcher, 0.2), {file_path})
+
+
+class PollingWatcherTestCase(WatcherTestCaseMixin, unittest.TestCase):
+
+  def make_watcher(self, dir_path):
+    return PollingWatcher(
+      dir_paths=[dir_path],
+      extensions={".py", ".po"},
+      is_dir_ignored=lambda x: x == "ignored",
+      interval=0.05,
+    )
+
+
+@unittest.skipUnless(InotifyWatcher.is_available(), "inotify is not available")
+class InotifyWatcherTestCase(WatcherTestCaseMixin, unittest.TestCase):
+
+  def make_watcher(self, dir_path):
+    return InotifyWatcher(
+      dir_paths=[dir_path],
+      extensions={".py", ".po"},
+      is_dir_ignored=lambda x: x == "ignored",
+    )
+
+
+class WatchCommandExecutorTestCase(unittest.TestCase):
+
+  def setUp(self):
+    self._tmp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(self._tmp_dir.cleanup)
+
+    self.dir_path = Path(os.path.realpath(self._tmp_dir.name))
+
+    current_dir_path = os.getcwd()
+    os.chdir(self.dir_path)
+    self.addCleanup(os.chdir, current_dir_path)
+
+    (self.dir_path / "a.py").write_text("_('Hello')\n")
+    (self.dir_path / "b.py").write_text("_('World')\n")
+
+    args = make_parser().parse_args(NATIVE_ARGS)
+    self.executor = args.executor_factory(args)
+    self.executor._manifest = mock.MagicMock(**{"is_up_to_date.return_value": False})
+
+    self.po_file_path = self.dir_path / "locale" / "uk" / "LC_MESSAGES" / "messages.po"
+    self.po_file_path.parent.mkdir(parents=True)
+
+  def test_update(self):
+    self.executor.update(changed_paths=None)
+
+    content = self.po_file_path.read_text()
+    self.assertIn('msgid "Hello"', content)
+    self.assertIn('msgid "World"', content)
+    self.assertTrue(self.po_file_path.with_suffix(".mo").exists())
+
+    self.po_file_path.write_text(content.replace(
+      'msgid "Hello"\nmsgstr ""',
+      'msgid "Hello"\nmsgstr "Привіт"',
+    ))
+    (self.dir_path / "a.py").write_text("_('Hello')\n_('New')\n")
+
+    with mock.patch(
+      "verboselib.cli.command_watch.extract_messages_from_file",
+      wraps=extract_messages_from_file,
+    ) as extract:
+      self.executor.update(changed_paths={str(self.dir_path / "a.py")})
+
+    self.assertEqual([x.args[0] for x in extract.call_args_list], [Path("a.py")])
+
+    content = self.po_file_path.read_text()
+    self.assertIn('msgid "Hello"\nmsgstr "Привіт"', content)
+    self.assertIn('msgid "New"', content)
+
+  def test_update_po_file(self):
+    self.executor.update(changed_paths=None)
+    self.po_file_path.write_text(self.po_file_path.read_text() + "\n")
+
+    with mock.patch("verboselib.cli.command_watch.merge_po_file") as merge:
+      with mock.patch("verboselib.cli.command_watch.compile_po_file") as compile:
+        self.executor.update(changed_paths={str(self.po_file_path)})
+
+    merge.assert_not_called()
+    compile.assert_called_once()
+
+  def test_update_without_walk(self):
+    self.executor.update(changed_paths=None)
+
+    (self.dir_path / "a.py").unlink()
+    (self.dir_path / "c.py").write_text("_('New')\n")
+    (self.dir_path / ".d.py").write_text("_('Ignored')\n")
+
+    with mock.patch(
+      "verboselib.cli.command_watch.iter_source_files_paths",
+    ) as iter_source_files_paths:
+      self.executor.update(changed_paths={
+        str(self.dir_path / "a.py"),
+        str(self.dir_path / "c.py"),
+        str(self.dir_path / ".d.py"),
+      })
+
+    iter_source_files_paths.assert_not_called()
+    self.assertEqual(list(self.executor._occurrences), [Path("b.py"), Path("c.py")])
+
+    content = self.po_file_path.read_text()
+    self.assertNotIn('msgid "Hello"', content)
+    self.assertIn('msgid "World"', content)
+    self.assertIn('msgid "New"', content)
+    self.assertNotIn('msgid "Ignored"', content)
+
+  def test_update_dir(self):
+    self.executor.update(changed_paths=None)
+
+    (self.dir_path / "sub").mkdir()
+    (self.dir_path / "sub" / "c.py").write_text("_('New')\n")
+
+    self.executor.update(changed_paths={str(self.dir_path / "sub")})
+
+    self.assertEqual(
+      list(self.executor._occurrences),
+      [Path("a.py"), Path("b.py"), Path("sub", "c.py")],
+    )
+    self.assertIn('msgid "New"', self.po_file_path.read_text())
+
+  def test_merge_unchanged(self):
+    self.executor.update(changed_paths=None)
+
+    # e.g., the command is started again
+    args = make_parser().parse_args(NATIVE_ARGS)
+    self.executor = args.executor_factory(args)
+    self.executor._manifest = mock.MagicMock(**{"is_up_to_date.return_value": True})
+
+    with mock.patch(
+      "verboselib.cli.command_watch.write_file_atomically",
+    ) as write_file_atomically:
+      with mock.patch(
+        "verboselib.cli.command_watch.merge_po_file",
+        wraps=merge_po_file,
+      ) as merge:
+        self.executor.update(changed_paths=None)
+
+    merge.assert_called_once()
+    write_file_atomically.assert_not_called()
+
+  def test_update_by_gettext_tools(self):
+    self.po_file_path.write_text("")
+
+    args = make_parser().parse_args(["watch", "-l", "uk", "--no-obsolete"])
+    self.executor = args.executor_factory(args)
+    self.executor._manifest = mock.MagicMock(**{"is_up_to_date.return_value": False})
+
+    self.assertEqual(
+      self.executor._get_required_gettext_tools(),
+      ["msgmerge", "msgattrib", "msgfmt"],
+    )
+
+    with mock.patch(
+      "verboselib.cli.command_watch.merge_new_and_existing_translations",
+      return_value=("merged", ""),
+    ) as merge:
+      with mock.patch(
+        "verboselib.cli.command_watch.remove_obsolete_translations",
+        return_value=("cleaned", ""),
+      ) as clean:
+        with mock.patch(
+          "verboselib.cli.command_watch.compile_translations",
+          return_value="",
+        ) as compile:
+          self.executor.update(changed_paths=None)
+
+    self.assertIn('msgid "Hello"', merge.call_args.kwargs["pot_content"])
+    self.assertEqual(clean.call_args.kwargs["po_content"], "merged")
+    compile.assert_called_once()
+    self.assertEqual(self.po_file_path.read_text(), "cleaned")
+
+  def test_skip_written_files(self):
+    self.executor.update(changed_paths=None)
+
+    with mock.patch("verboselib.cli.command_watch.compile_po_file") as compile:
+      self.executor.update(changed_paths={str(self.po_file_path)})
+      compile.assert_not_called()
+
+      # the file is changed by a user after it's written
+      self.po_file_path.write_text(self.po_file_path.read_text() + "\n")
+      self.executor.update(changed_paths={str(self.po_file_path)})
+      compile.assert_called_once()
+
+  def test_watched_dirs_paths(self):
+    self.assertEqual(self.executor._get_watched_dirs_paths(None), [os.curdir])
+    self.assertEqual(
+      self.executor._get_watched_dirs_paths(lambda x: x == "locale"),
+      [os.curdir, str(self.dir_path / "locale")],
+    )
+
+    self.executor._locales_dir_path = self.dir_path.parent
+    self.assertEqual(
+      self.executor._get_watched_dirs_paths(None),
+      [os.curdir, str(self.dir_path.parent)],
+    )
@@ -0,0 +1,220 @@
+import asyncio
+import threading
+import unittest
+
+from verboselib import drop_default_language
+from verboselib import drop_language
+from verboselib import get_language
+from verboselib import get_language_state
+from verboselib import language
+from verboselib import set_language
+from verboselib import set_language_state
+from verboselib import ContextVarLanguageState
+from verboselib import ThreadLocalLanguageState
+from verboselib import Translations
+
+from .constants import LOCALE_DOMAIN
+from .constants import LOCALE_DIR_PATH
+
+
+class LanguageStateTestCaseMixin:
+
+  def make_state(self):
+    raise NotImplementedError
+
+  def setUp(self):
+    self.state = self.make_state()
+
+  def test_language(self):
+    self.assertIsNone(self.state.get_language())
+
+    self.state.set_default_language("en")
+    self.assertEqual(self.state.get_language(), "en")
+
+    self.state.set_language("uk")
+    self.assertEqual(self.state.get_language(), "uk")
+
+    self.state.set_language_bypass()
+    self.assertIsNone(self.state.get_language())
+
+    self.state.drop_language()
+    self.assertEqual(self.state.get_language(), "en")
+
+    self.state.drop_default_language()
+    self.assertIsNone(self.state.get_language())
+    self.assertIsNone(self.state.get_default_language())
+
+  def test_push_pop_language(self):
+    self.state.set_language("ru")
+
+    token = self.state.push_language("uk")
+    self.assertEqual(self.state.get_language(), "uk")
+
+    self.state.pop_language(token)
+    self.assertEqual(self.state.get_language(), "ru")
+
+  def test_context_manager(self):
+    self.state.set_language("ru")
+
+    with language("uk", self.state):
+      self.assertEqual(self.state.get_language(), "uk")
+
+      with language(None, self.state):
+        self.assertIsNone(self.state.get_language())
+
+      self.assertEqual(self.state.get_language(), "uk")
+
+    self.assertEqual(self.state.get_language(), "ru")
+
+  def test_context_manager_restores_on_error(self):
+    self.state.set_language("ru")
+
+    with self.assertRaises(ValueError):
+      with language("uk", self.state):
+        raise ValueError
+
+    self.assertEqual(self.state.get_language(), "ru")
+
+  def test_decorator(self):
+
+    @language("uk", self.state)
+    def func(depth):
+      result = [self.state.get_language(), ]
+      if depth:
+        result.extend(func(depth - 1))
+      return result
+
+    self.state.set_language("ru")
+
+    self.assertEqual(func(2), ["uk", "uk", "uk", ])
+    self.assertEqual(self.state.get_language(), "ru")
+
+  def test_coroutine_decorator(self):
+
+    @language("uk", self.state)
+    async def func():
+      await asyncio.sleep(0)
+      return self.state.get_language()
+
+    async def main():
+      self.state.set_language("ru")
+      value = await func()
+      return value, self.state.get_language()
+
+    self.assertEqual(asyncio.run(main()), ("uk", "ru"))
+
+
+class ThreadLocalLanguageStateTestCase(LanguageStateTestCaseMixin, unittest.TestCase):
+
+  def make_state(self):
+    return ThreadLocalLanguageState()
+
+  def test_threads_isolation(self):
+    self.state.set_language("ru")
+    results = []
+
+    def target():
+      results.append(self.state.get_language())
+      self.state.set_language("uk")
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+
+    self.assertEqual(results, [None, ])
+    self.assertEqual(self.state.get_language(), "ru")
+
+
+class ContextVarLanguageStateTestCase(LanguageStateTestCaseMixin, unittest.TestCase):
+
+  def make_state(self):
+    return ContextVarLanguageState()
+
+  def test_coroutines_isolation(self):
+    translations = Translations(
+      domain=LOCALE_DOMAIN,
+      locale_dir_path=LOCALE_DIR_PATH,
+      language_state=self.state,
+    )
+    _ = translations.gettext
+    languages = ["en", "en-gb", "ru", "uk", None, ] * 20
+
+    async def worker(value):
+      results = []
+
+      with language(value, self.state):
+        for __ in range(3):
+          results.append((translations.get_language(), _("verboselib test string")))
+          await asyncio.sleep(0)
+
+      return results
+
+    async def main():
+      self.state.set_language("ru")
+      results = await asyncio.gather(*[worker(x) for x in languages])
+      return results, self.state.get_language()
+
+    results, final = asyncio.run(main())
+
+    for value, worker_results in zip(languages, results):
+      with language(value, self.state):
+        expected = (value, _("verboselib test string"))
+
+      self.assertEqual(worker_results, [expected, ] * 3)
+
+    self.assertEqual(final, "ru")
+
+
+class GlobalLanguageStateTestCase(unittest.TestCase):
+
+  def setUp(self):
+    drop_default_language()
+    drop_language()
+
+    self.original_state = get_language_state()
+
+  def tearDown(self):
+    set_language_state(self.original_state)
+
+    drop_default_language()
+    drop_language()
+
+  def test_set_language_state(self):
+    translations = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH)
+    _ = translations.gettext
+
+    state = ContextVarLanguageState()
+    set_language_state(state)
+    self.assertIs(get_language_state(), state)
+
+    set_language("uk")
+    self.assertEqual(state.get_language(), "uk")
+    self.assertEqual(_("verboselib test string"), "verboselib test string in uk")
+
+    with language("ru"):
+      self.assertEqual(get_language(), "ru")
+      self.assertEqual(_("verboselib test string"), "verboselib test string in ru")
+
+    self.assertEqual(get_language(), "uk")
+
+    set_language_state(self.original_state)
+    self.assertIsNone(get_language())
+
+  def test_per_instance_language_state(self):
+    state = ContextVarLanguageState()
+    translations = Translations(
+      domain=LOCALE_DOMAIN,
+      locale_dir_path=LOCALE_DIR_PATH,
+      language_state=state,
+    )
+    _ = translations.gettext
+    lazy = translations.gettext_lazy("verboselib test string")
+
+    set_language("ru")
+    self.assertEqual(_("verboselib test string"), "verboselib test string")
+    self.assertEqual(lazy, "verboselib test string")
+
+    state.set_language("uk")
+    self.assertEqual(translations.get_language(), "uk")
+    self.assertEqual(_("verboselib test string"), "verboselib test string in uk")
+    self.assertEqual(lazy, "verboselib test string in uk")
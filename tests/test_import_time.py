@@ -0,0 +1,141 @@
+import importlib
+import os
+import subprocess
+import sys
+import unittest
+
+from .constants import __here__
+
+
+# max cumulative time of 'import verboselib' in microseconds; it's checked only
+# if it's given explicitly, e.g., 'VERBOSELIB_IMPORT_TIME_BUDGET=15000', as
+# wall-clock time depends on the machine tests run on
+IMPORT_TIME_BUDGET = os.environ.get("VERBOSELIB_IMPORT_TIME_BUDGET")
+
+ROUNDS = 3
+
+MARKER = "verboselib-import-time-test"
+
+COMMAND_MODULES = [
+  "verboselib.cli.command_compile",
+  "verboselib.cli.command_extract",
+  "verboselib.cli.command_watch",
+]
+
+
+def measure_imports(code):
+  """
+  Run code in a new interpreter with '-X importtime' and return modules
+  imported by it mapped to their cumulative import times in microseconds.
+
+  Modules imported via 'importlib.import_module()' are not reported by
+  '-X importtime', so they are taken from 'sys.modules' and have no times.
+
+  """
+  # modules imported by the interpreter during startup, e.g., by 'site', go
+  # before the marker
+  code = (
+    f"import sys; sys.stderr.write('{MARKER}\\n'); __modules = set(sys.modules); "
+    f"{code}; "
+    f"sys.stdout.write('\\n'.join(set(sys.modules) - __modules))"
+  )
+
+  result = subprocess.run(
+    [sys.executable, "-X", "importtime", "-c", code, ],
+    cwd=str(__here__.parent),
+    stdout=subprocess.PIPE,
+    stderr=subprocess.PIPE,
+    universal_newlines=True,
+    check=True,
+  )
+
+  lines = result.stderr.splitlines()
+  lines = lines[lines.index(MARKER) + 1:]
+
+  times = dict.fromkeys(result.stdout.split())
+
+  for line in lines:
+    if not line.startswith("import time:"):
+      continue
+
+    __, cumulative, name = line.split("|")
+    if cumulative.strip().isdigit():
+      times[name.strip()] = int(cumulative)
+
+  return times
+
+
+class ImportTimeTestCase(unittest.TestCase):
+
+  def test_exports(self):
+    import verboselib
+
+    expected = {}
+
+    for module_name in set(verboselib._EXPORTS.values()):
+      module = importlib.import_module(f"verboselib.{module_name}")
+      expected.update((name, module_name) for name in module.__all__)
+
+    self.assertEqual(verboselib._EXPORTS, expected)
+
+    for name in verboselib.__all__:
+      self.assertIsNotNone(getattr(verboselib, name))
+
+    with self.assertRaises(AttributeError):
+      verboselib.missing
+
+  def test_import_package(self):
+    times = measure_imports("import verboselib")
+
+    self.assertIn("verboselib", times)
+
+    for name in [
+      "gettext",
+      "subprocess",
+      "threading",
+      "pathlib",
+      "verboselib.core",
+      "verboselib.translations",
+    ]:
+      self.assertNotIn(name, times)
+
+  @unittest.skipUnless(IMPORT_TIME_BUDGET, "import time budget is not given")
+  def test_import_time_budget(self):
+    best = min(
+      measure_imports("import verboselib")["verboselib"]
+      for __ in range(ROUNDS)
+    )
+    self.assertLess(best, int(IMPORT_TIME_BUDGET))
+
+  def test_import_translations(self):
+    times = measure_imports("from verboselib import Translations")
+
+    self.assertIn("verboselib.translations", times)
+
+    # needed only if bundles or decorators are used
+    for name in ["inspect", "json", "pathlib", ]:
+      self.assertNotIn(name, times)
+
+  def test_import_cli(self):
+    times = measure_imports("import verboselib.cli.main")
+
+    for name in ["subprocess", "threading", "concurrent.futures", *COMMAND_MODULES]:
+      self.assertNotIn(name, times)
+
+  def test_parse_cli_args(self):
+    for command_name, module_name in [
+      ("compile", "verboselib.cli.command_compile"),
+      ("extract", "verboselib.cli.command_extract"),
+      ("watch",   "verboselib.cli.command_watch"),
+    ]:
+      with self.subTest(command_name=command_name):
+        times = measure_imports(
+          "from verboselib.cli.main import find_command, make_parser; "
+          f"make_parser([find_command(['{command_name}'])]).parse_args(['{command_name}'])"
+        )
+
+        # only the command which is run is imported
+        self.assertEqual(
+          [x for x in COMMAND_MODULES if x in times],
+          [module_name, ],
+        )
@@ -0,0 +1,189 @@
+import gc
+import sys
+import unittest
+import weakref
+
+from verboselib import drop_default_language
+from verboselib import drop_language
+from verboselib import set_language
+from verboselib import Histogram
+from verboselib import Instrumentation
+from verboselib import Translations
+from verboselib import UntranslatedMessage
+
+from .constants import LOCALE_DOMAIN
+from .constants import LOCALE_DIR_PATH
+
+
+class HistogramTestCase(unittest.TestCase):
+
+  def test_observe(self):
+    histogram = Histogram([0.1, 1.0, ])
+
+    for value in [0.05, 0.1, 0.5, 2.0, ]:
+      histogram.observe(value)
+
+    self.assertEqual(histogram.count, 4)
+    self.assertAlmostEqual(histogram.sum, 2.65)
+    self.assertEqual(
+      histogram.get_cumulative_counts(),
+      [(0.1, 2), (1.0, 3), (float("inf"), 4), ],
+    )
+
+
+class InstrumentationTestCase(unittest.TestCase):
+
+  def setUp(self):
+    drop_default_language()
+    drop_language()
+
+    self.instrumentation = Instrumentation(sample_rate=1.0)
+    self.translations = Translations(
+      LOCALE_DOMAIN,
+      LOCALE_DIR_PATH,
+      instrumentation=self.instrumentation,
+    )
+
+  def tearDown(self):
+    drop_default_language()
+    drop_language()
+
+  def get_values(self):
+    return {
+      x.name: x.value
+      for x in self.instrumentation.get_metrics()
+      if "le" not in x.labels
+    }
+
+  def test_disabled(self):
+    translations = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH)
+    self.assertNotIn("gettext", vars(translations))
+    self.assertNotIn("gettext_many", vars(translations))
+    self.assertIs(type(translations), Translations)
+
+  def test_no_reference_cycles(self):
+    translations = Translations(
+      LOCALE_DOMAIN,
+      LOCALE_DIR_PATH,
+      reload_interval=10,
+      instrumentation=self.instrumentation,
+    )
+    self.assertIs(type(translations), Translations)
+
+    ref = weakref.ref(translations)
+
+    gc.disable()
+    try:
+      del translations
+      self.assertIsNone(ref())
+    finally:
+      gc.enable()
+
+  def test_subclass(self):
+
+    class CustomTranslations(Translations):
+
+      def gettext(self, message):
+        return super().gettext(message).upper()
+
+    translations = CustomTranslations(
+      LOCALE_DOMAIN,
+      LOCALE_DIR_PATH,
+      instrumentation=self.instrumentation,
+    )
+    self.assertIs(type(translations), CustomTranslations)
+
+    set_language("uk")
+    self.assertEqual(translations.gettext("verboselib test string"), "VERBOSELIB TEST STRING IN UK")
+    self.assertEqual(self.get_values()["verboselib_lookups_total"], 1)
+
+  def test_lookups(self):
+    _ = self.translations.gettext
+    N_ = self.translations.ngettext
+
+    # nothing is expected to be translated without a language
+    self.assertEqual(_("missing"), "missing")
+
+    set_language("uk")
+    self.assertEqual(_("verboselib test string"), "verboselib test string in uk")
+    self.assertEqual(_("missing"), "missing")
+    self.assertEqual(N_("window", "windows", 5), "вікон")
+    self.assertEqual(N_("missing window", "missing windows", lambda: 5), "missing windows")
+
+    translated = self.translations.gettext_many(["verboselib test string", "missing", ])
+    self.assertEqual(translated, ["verboselib test string in uk", "missing", ])
+
+    values = self.get_values()
+    self.assertEqual(values["verboselib_lookups_total"], 7)
+    self.assertEqual(values["verboselib_untranslated_total"], 3)
+    self.assertEqual(values["verboselib_catalog_load_seconds_count"], 1)
+    self.assertEqual(values["verboselib_catalog_cache_misses_total"], 1)
+    self.assertEqual(values["verboselib_catalogs"], 1)
+
+    self.assertEqual(self.instrumentation.get_samples(), {
+      UntranslatedMessage(domain=LOCALE_DOMAIN, language="uk", context=None, msgid="missing"):        2,
+      UntranslatedMessage(domain=LOCALE_DOMAIN, language="uk", context=None, msgid="missing window"): 1,
+    })
+
+    self.instrumentation.clear_samples()
+    self.assertEqual(self.instrumentation.get_samples(), {})
+
+  @unittest.skipIf(
+    (sys.version_info.major == 3 and sys.version_info.minor < 8),
+    "available since Python 3.8",
+  )
+  def test_lookups_with_contexts(self):
+    set_language("uk")
+
+    self.assertEqual(self.translations.pgettext("abbrev. month", "Jan"), "Січ")
+    self.assertEqual(self.translations.pgettext("missing", "Jan"), "Jan")
+    self.assertEqual(self.translations.npgettext("noun", "lock", "locks", 5), "замків")
+
+    self.assertEqual(self.instrumentation.get_samples(), {
+      UntranslatedMessage(domain=LOCALE_DOMAIN, language="uk", context="missing", msgid="Jan"): 1,
+    })
+
+  def test_lazy_lookups(self):
+    translated = self.translations.gettext_lazy("verboselib test string")
+
+    set_language("ru")
+    self.assertEqual(translated, "verboselib test string in ru")
+    self.assertEqual(self.get_values()["verboselib_lookups_total"], 1)
+
+  def test_max_samples(self):
+    instrumentation = Instrumentation(sample_rate=1.0, max_samples=2)
+    translations = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH, instrumentation=instrumentation)
+
+    set_language("uk")
+    translations.gettext_many(["a", "b", "c", "a", ])
+
+    self.assertEqual(instrumentation.get_samples(), {
+      UntranslatedMessage(domain=LOCALE_DOMAIN, language="uk", context=None, msgid="a"): 2,
+      UntranslatedMessage(domain=LOCALE_DOMAIN, language="uk", context=None, msgid="b"): 1,
+    })
+
+  def test_no_sampling(self):
+    instrumentation = Instrumentation(sample_rate=0.0)
+    translations = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH, instrumentation=instrumentation)
+
+    set_language("uk")
+    translations.gettext("missing")
+
+    self.assertEqual(instrumentation.get_samples(), {})
+
+  def test_export(self):
+    exported = []
+    instrumentation = Instrumentation(sinks=[exported.append, ])
+    translations = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH, instrumentation=instrumentation)
+    translations.preload(["ru", "uk", ])
+
+    metrics = instrumentation.export()
+    self.assertEqual(exported, [metrics, ])
+
+    buckets = [x for x in metrics if x.name == "verboselib_catalog_load_seconds_bucket"]
+    self.assertEqual(buckets[-1].labels, {"domain": LOCALE_DOMAIN, "le": "+Inf"})
+    self.assertEqual(buckets[-1].value, 2)
+    self.assertEqual(
+      {x.kind for x in metrics if x.name == "verboselib_catalogs_size_bytes"},
+      {"gauge", },
+    )
@@ -0,0 +1,117 @@
+import copy
+import pickle
+import unittest
+
+from collections import UserString
+
+from verboselib import drop_default_language
+from verboselib import drop_language
+from verboselib import set_language
+from verboselib import LazyTranslation
+from verboselib import Translations
+
+from .constants import LOCALE_DOMAIN
+from .constants import LOCALE_DIR_PATH
+
+
+translations = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH)
+
+
+class LazyTranslationTestCase(unittest.TestCase):
+
+  def setUp(self):
+    drop_default_language()
+    drop_language()
+
+    translations.cache_clear()
+
+  def tearDown(self):
+    drop_language()
+
+  def test_user_string(self):
+    s = translations.gettext_lazy("verboselib test string")
+
+    self.assertIsInstance(s, LazyTranslation)
+    self.assertIsInstance(s, UserString)
+
+    # attributes are stored in slots
+    self.assertEqual(vars(s), {})
+
+    set_language("uk")
+    self.assertEqual(type(s.upper()), str)
+    self.assertEqual(type(s.replace("uk", "ru")), str)
+    self.assertEqual(s.replace("uk", "ru"), "verboselib test string in ru")
+
+  def test_str_behavior(self):
+    s = translations.gettext_lazy("verboselib test string")
+    set_language("uk")
+
+    self.assertEqual(str(s), "verboselib test string in uk")
+    self.assertEqual(s, "verboselib test string in uk")
+    self.assertEqual(len(s), len("verboselib test string in uk"))
+    self.assertEqual(s[-2:], "uk")
+    self.assertEqual(s.upper(), "VERBOSELIB TEST STRING IN UK")
+    self.assertEqual(s + "!", "verboselib test string in uk!")
+    self.assertEqual("> " + s, "> verboselib test string in uk")
+    self.assertEqual(f"{s:>30}", "  verboselib test string in uk")
+    self.assertIn("test", s)
+    self.assertEqual(hash(s), hash("verboselib test string in uk"))
+    self.assertEqual(repr(s), "LazyTranslation('verboselib test string in uk')")
+
+    fmt = translations.gettext_lazy("Good morning, {:}!")
+    self.assertEqual(fmt.format("Іване"), "Доброго ранку, Іване!")
+
+  def test_memoization(self):
+    calls = []
+
+    def func(message):
+      calls.append(message)
+      return translations.gettext(message)
+
+    func.__self__ = translations
+    s = LazyTranslation(func, "verboselib test string")
+
+    set_language("uk")
+    self.assertEqual(s, "verboselib test string in uk")
+    self.assertEqual(s, "verboselib test string in uk")
+    self.assertEqual(len(calls), 1)
+
+    set_language("ru")
+    self.assertEqual(s, "verboselib test string in ru")
+    self.assertEqual(len(calls), 2)
+
+    translations.cache_clear()
+    self.assertEqual(s, "verboselib test string in ru")
+    self.assertEqual(len(calls), 3)
+
+  def test_callable_args_are_not_memoized(self):
+    n = [1, ]
+    s = translations.ngettext_lazy("window", "windows", lambda: n[0])
+
+    set_language("uk")
+    self.assertEqual(s, "вікно")
+
+    n[0] = 5
+    self.assertEqual(s, "вікон")
+
+  def test_other_callables_are_not_memoized(self):
+    values = ["a", "b", ]
+    s = LazyTranslation(lambda sep: sep.join(values), sep="-")
+
+    self.assertEqual(s, "a-b")
+
+    values.append("c")
+    self.assertEqual(s, "a-b-c")
+
+  def test_copy_and_pickle(self):
+    s = LazyTranslation(str.upper, "verboselib")
+
+    self.assertIs(copy.copy(s), s)
+    self.assertEqual(copy.deepcopy(s), "VERBOSELIB")
+    self.assertEqual(pickle.loads(pickle.dumps(s)), "VERBOSELIB")
+
+    s = LazyTranslation("-".join, ["a", "b", ])
+    self.assertEqual(pickle.loads(pickle.dumps(s)), "a-b")
+
+    s = LazyTranslation("Hello, {name}!".format, name="World")
+    self.assertEqual(pickle.loads(pickle.dumps(s)), "Hello, World!")
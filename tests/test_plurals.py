@@ -0,0 +1,85 @@
+import gettext
+import unittest
+import warnings
+
+from verboselib import compile_plural
+from verboselib import DictTranslations
+from verboselib.plurals import _normalize_expression
+from verboselib.plurals import _PERIODIC_EXPRESSIONS
+
+from .constants import LOCALE_DOMAIN
+from .constants import LOCALE_DIR_PATH
+
+
+NUMBERS = list(range(0, 2000)) + [10 ** 6, 10 ** 6 + 1, 10 ** 9 + 22, 2 ** 64 + 3, ]
+
+
+class CompilePluralTestCase(unittest.TestCase):
+
+  def test_known_expressions(self):
+    for expression in _PERIODIC_EXPRESSIONS:
+      with self.subTest(expression=expression):
+        expected = gettext.c2py(expression)
+        actual = compile_plural(expression)
+
+        self.assertIsNot(actual, expected)
+
+        for n in NUMBERS:
+          self.assertEqual(actual(n), expected(n), n)
+
+  def test_spelling_variants(self):
+    for expression in [
+      "n != 1",
+      "(n != 1)",
+      "((n != 1))",
+      "n%10==1 && n%100!=11 ? 0 : n%10>=2 && n%10<=4 && (n%100<10 || n%100>=20) ? 1 : 2",
+      "(n%10==1 && n%100!=11 ? 0 : n%10>=2 && n%10<=4 && (n%100<10 || n%100>=20) ? 1 : 2)",
+    ]:
+      with self.subTest(expression=expression):
+        self.assertNotEqual(compile_plural(expression).__name__, "func")
+
+  def test_unknown_expression(self):
+    expression = "n%1000==1 ? 0 : 1"
+    actual = compile_plural(expression)
+    expected = gettext.c2py(expression)
+
+    self.assertEqual(actual.__name__, "func")
+    self.assertEqual(actual(1001), expected(1001))
+    self.assertEqual(actual(1101), expected(1101))
+
+  def test_non_integers(self):
+    evaluate = compile_plural("n != 1")
+
+    with warnings.catch_warnings():
+      warnings.simplefilter("ignore", DeprecationWarning)
+      self.assertEqual(evaluate(1.0), 0)
+
+    self.assertEqual(evaluate(True), 0)
+    self.assertEqual(evaluate(-1), 1)
+
+    with self.assertRaises(TypeError):
+      evaluate("1")
+
+  def test_normalize_expression(self):
+    self.assertEqual(_normalize_expression(" ( n != 1 ) "), "n!=1")
+    self.assertEqual(_normalize_expression("(n==1)?0:(n>=2)?1:2"), "(n==1)?0:(n>=2)?1:2")
+
+
+class DictTranslationsTestCase(unittest.TestCase):
+
+  def test_same_as_gnu_translations(self):
+    for locale in ["en_US", "ru", "uk", ]:
+      path = LOCALE_DIR_PATH / locale / "LC_MESSAGES" / f"{LOCALE_DOMAIN}.mo"
+
+      with path.open("rb") as f:
+        expected = gettext.GNUTranslations(f)
+
+      with path.open("rb") as f:
+        actual = DictTranslations(f)
+
+      with self.subTest(locale=locale):
+        for n in range(0, 300):
+          self.assertEqual(
+            actual.ngettext("window", "windows", n),
+            expected.ngettext("window", "windows", n),
+          )
@@ -1,10 +1,18 @@
+import shutil
 import sys
+import tempfile
+import threading
 import unittest
 
+from pathlib import Path
+from unittest import mock
+
 from verboselib import drop_default_language
 from verboselib import drop_language
+from verboselib import preload_translations
 from verboselib import set_language
 from verboselib import Translations
+from verboselib.translations import _MAX_LANGUAGES
 
 from .constants import LOCALE_DOMAIN
 from .constants import LOCALE_DIR_PATH
@@ -29,6 +37,50 @@ class TranslationsTestCase(unittest.TestCase):
     set_language("en-gb")
     self.assertEqual(translated, "verboselib test string in en_US")
 
+  def test_gettext_concurrent(self):
+    _ = self.translations.gettext
+
+    languages = ["en", "en-gb", "ru", "uk", ] * 4
+    expected = {
+      "en":    "verboselib test string in en_US",
+      "en-gb": "verboselib test string in en_GB",
+      "ru":    "verboselib test string in ru",
+      "uk":    "verboselib test string in uk",
+    }
+    barrier = threading.Barrier(len(languages))
+    results = {}
+
+    def target(i, language):
+      set_language(language)
+      barrier.wait()
+      results[i] = [_("verboselib test string") for __ in range(100)]
+
+    threads = [
+      threading.Thread(target=target, args=(i, language))
+      for i, language in enumerate(languages)
+    ]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+
+    for i, language in enumerate(languages):
+      self.assertEqual(set(results[i]), {expected[language], })
+
+  def test_gettext_many(self):
+    set_language("uk")
+
+    translated = self.translations.gettext_many([
+      "verboselib test string",
+      "Good morning, {:}!",
+      "missing",
+    ])
+    self.assertEqual(translated, [
+      "verboselib test string in uk",
+      "Доброго ранку, {:}!",
+      "missing",
+    ])
+
   def test_gettext_lazy(self):
     L_ = self.translations.gettext_lazy
 
@@ -54,6 +106,16 @@ class TranslationsTestCase(unittest.TestCase):
     translated = N_("window", "windows", 5)
     self.assertEqual(translated, "вікон")
 
+  def test_ngettext_many(self):
+    set_language("uk")
+
+    translated = self.translations.ngettext_many([
+      ("window", "windows", 1),
+      ("window", "windows", 2),
+      ("window", "windows", lambda: 5),
+    ])
+    self.assertEqual(translated, ["вікно", "вікна", "вікон", ])
+
   def test_ngettext_lazy_n(self):
     N_ = self.translations.ngettext
 
@@ -94,6 +156,19 @@ class TranslationsTestCase(unittest.TestCase):
     translated = P_("abbrev. month", "Jan")
     self.assertEqual(translated, "Січ")
 
+  @unittest.skipIf(
+    (sys.version_info.major == 3 and sys.version_info.minor < 8),
+    "available since Python 3.8",
+  )
+  def test_pgettext_many(self):
+    set_language("uk")
+
+    translated = self.translations.pgettext_many([
+      ("abbrev. month", "Jan"),
+      ("missing", "Jan"),
+    ])
+    self.assertEqual(translated, ["Січ", "Jan", ])
+
   @unittest.skipIf(
     (sys.version_info.major == 3 and sys.version_info.minor < 8),
     "available since Python 3.8",
@@ -126,6 +201,20 @@ class TranslationsTestCase(unittest.TestCase):
     translated = NP_("noun", "lock", "locks", 5)
     self.assertEqual(translated, "замків")
 
+  @unittest.skipIf(
+    (sys.version_info.major == 3 and sys.version_info.minor < 8),
+    "available since Python 3.8",
+  )
+  def test_npgettext_many(self):
+    set_language("uk")
+
+    translated = self.translations.npgettext_many([
+      ("noun", "lock", "locks", 1),
+      ("noun", "lock", "locks", lambda: 2),
+      ("noun", "lock", "locks", 5),
+    ])
+    self.assertEqual(translated, ["замок", "замки", "замків", ])
+
   @unittest.skipIf(
     (sys.version_info.major == 3 and sys.version_info.minor < 8),
     "available since Python 3.8",
@@ -157,3 +246,189 @@ class TranslationsTestCase(unittest.TestCase):
 
     set_language("uk")
     self.assertEqual(translated, "замок")
+
+  def test_preload(self):
+    infos = self.translations.preload()
+    self.assertEqual(list(infos), ["en-gb", "en-us", "ru", "uk", ])
+
+    self.assertEqual(
+      [info.locale for info in infos.values()],
+      ["en_GB", "en_US", "ru", "uk", ],
+    )
+
+    for info in infos.values():
+      self.assertEqual(len(info.file_paths), 1)
+      self.assertGreater(info.size, 0)
+      self.assertGreaterEqual(info.load_duration, 0)
+
+    set_language("ru")
+    self.assertEqual(
+      self.translations.gettext("verboselib test string"),
+      "verboselib test string in ru",
+    )
+
+  def test_preload_languages(self):
+    infos = self.translations.preload(["uk", "xx", ])
+
+    self.assertEqual(list(infos), ["uk", "xx", ])
+    self.assertEqual(infos["xx"].file_paths, ())
+    self.assertEqual(infos["xx"].size, 0)
+
+    # catalogs loaded before are reported as they are
+    self.assertIs(self.translations.preload(["uk", ])["uk"], infos["uk"])
+
+  def test_preload_translations(self):
+    result = preload_translations(["uk", ])
+
+    self.assertIn(self.translations, result)
+    self.assertEqual(list(result[self.translations]), ["uk", ])
+
+  def test_language_normalization(self):
+    _ = self.translations.gettext
+
+    translations = set()
+
+    for language in ["en-GB", "en-gb", "en_GB", "EN_gb", ]:
+      set_language(language)
+      self.assertEqual(_("verboselib test string"), "verboselib test string in en_GB")
+      translations.add(self.translations._get_translation())
+
+    self.assertEqual(len(translations), 1)
+    self.assertEqual(list(self.translations._catalogs), ["en_GB", ])
+
+  def test_missing_locales(self):
+    translations = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH, max_missing_locales=2)
+    _ = translations.gettext
+
+    for language in ["xx-yy", "XX_yy", "zz", "qq", ]:
+      set_language(language)
+      self.assertEqual(_("verboselib test string"), "verboselib test string")
+      self.assertIs(translations._get_translation(), translations._null_translation)
+
+    self.assertEqual(list(translations._missing_locales), ["zz", "qq", ])
+    self.assertEqual(list(translations._translations), [None, ])
+    self.assertEqual(translations._catalogs, {})
+
+  def test_region_variants(self):
+    _ = self.translations.gettext
+
+    regions = [f"{a}{b}{c}" for a in "ab" for b in "xyz" for c in range(200)]
+    self.assertGreater(len(regions), _MAX_LANGUAGES)
+
+    for region in regions:
+      set_language(f"uk-{region}")
+      self.assertEqual(_("verboselib test string"), "verboselib test string in uk")
+
+    self.assertEqual(list(self.translations._catalogs), ["uk", ])
+    self.assertLessEqual(len(self.translations._translations), _MAX_LANGUAGES + 1)
+
+    info = self.translations.cache_info()
+    self.assertEqual(info.catalogs, 1)
+    self.assertEqual(info.misses, 1)
+
+    self.assertEqual(self.translations.preload(["uk-ua"])["uk-ua"].locale, "uk")
+
+  def test_cache_info(self):
+    _ = self.translations.gettext
+
+    set_language("uk")
+    _("verboselib test string")
+    _("verboselib test string")
+
+    set_language("xx")
+    _("verboselib test string")
+    _("verboselib test string")
+
+    info = self.translations.cache_info()
+    self.assertEqual(info.hits, 2)
+    self.assertEqual(info.misses, 2)
+    self.assertEqual(info.evictions, 0)
+    self.assertEqual(info.max_catalogs, None)
+    self.assertEqual(info.max_size, None)
+    self.assertEqual(info.catalogs, 1)
+    self.assertEqual(info.size, 790)
+
+  def test_cache_eviction_by_count(self):
+    translations = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH, max_catalogs=2)
+    _ = translations.gettext
+
+    for language in ["ru", "uk", "ru", "en-gb", ]:
+      set_language(language)
+      _("verboselib test string")
+
+    self.assertEqual(sorted(translations._catalogs), ["en_GB", "ru", ])
+    self.assertEqual(sorted(translations._translations, key=str), [None, "en-gb", "ru", ])
+
+    info = translations.cache_info()
+    self.assertEqual(info.evictions, 1)
+    self.assertEqual(info.catalogs, 2)
+
+    set_language("uk")
+    self.assertEqual(_("verboselib test string"), "verboselib test string in uk")
+    self.assertEqual(sorted(translations._catalogs), ["en_GB", "uk", ])
+
+  def test_cache_eviction_by_size(self):
+    translations = Translations(LOCALE_DOMAIN, LOCALE_DIR_PATH, max_catalogs_size=1000)
+    _ = translations.gettext
+
+    for language in ["ru", "uk", ]:
+      set_language(language)
+      _("verboselib test string")
+
+    self.assertEqual(list(translations._catalogs), ["uk", ])
+    self.assertEqual(translations.cache_info().size, 790)
+
+  def test_cache_clear(self):
+    _ = self.translations.gettext
+
+    set_language("uk")
+    _("verboselib test string")
+
+    self.translations.cache_clear()
+
+    info = self.translations.cache_info()
+    self.assertEqual(info.hits, 0)
+    self.assertEqual(info.misses, 0)
+    self.assertEqual(info.catalogs, 0)
+
+    self.assertEqual(_("verboselib test string"), "verboselib test string in uk")
+
+  def test_reload_catalogs(self):
+    with tempfile.TemporaryDirectory() as dir_path:
+      locale_dir_path = Path(dir_path) / "locale"
+      shutil.copytree(str(LOCALE_DIR_PATH), str(locale_dir_path))
+
+      translations = Translations(LOCALE_DOMAIN, locale_dir_path, reload_interval=10)
+      _ = translations.gettext
+      lazy = translations.gettext_lazy("verboselib test string")
+
+      set_language("uk")
+      self.assertEqual(lazy, "verboselib test string in uk")
+
+      generation = translations.generation
+      messages_dir_path = locale_dir_path / "uk" / "LC_MESSAGES"
+      shutil.copy(
+        str(locale_dir_path / "ru" / "LC_MESSAGES" / f"{LOCALE_DOMAIN}.mo"),
+        str(messages_dir_path / f"{LOCALE_DOMAIN}.mo.tmp"),
+      )
+      (messages_dir_path / f"{LOCALE_DOMAIN}.mo.tmp").replace(messages_dir_path / f"{LOCALE_DOMAIN}.mo")
+
+      # files are not checked until the interval passes
+      self.assertEqual(_("verboselib test string"), "verboselib test string in uk")
+
+      with mock.patch("time.monotonic", return_value=translations._next_reload_check_at):
+        self.assertEqual(lazy, "verboselib test string in ru")
+        self.assertEqual(_("verboselib test string"), "verboselib test string in ru")
+
+      self.assertEqual(translations.generation, generation + 1)
+      self.assertEqual(translations.reload_catalogs(), [])
+
+      shutil.rmtree(str(locale_dir_path / "uk"))
+      self.assertEqual(translations.reload_catalogs(), ["uk", ])
+      self.assertEqual(_("verboselib test string"), "verboselib test string")
+
+  def test_reload_catalogs_disabled(self):
+    self.assertNotIn("_get_translation", vars(self.translations))
+    self.assertNotIn("get_language", vars(self.translations))
+    self.assertIs(type(self.translations), Translations)
+
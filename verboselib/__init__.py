@@ -1,3 +1,92 @@
-from .core import *
-from .helpers import *
-from .translations import *
+"""
+Public objects of submodules are available as attributes of the package.
+
+Submodules are imported on the first access to their objects (PEP 562), so
+'import verboselib' does not pay for modules which are not used, e.g., for
+'gettext' and 'threading'.
+
+"""
+
+
+# names of public objects mapped to names of submodules which export them;
+# must be kept in sync with '__all__' of submodules
+_EXPORTS = {
+  "CatalogBundle":             "bundles",
+
+  "DictTranslations":          "catalogs",
+  "MmapTranslations":          "catalogs",
+
+  "LanguageState":             "core",
+  "ThreadLocalLanguageState":  "core",
+  "ContextVarLanguageState":   "core",
+  "get_language_state":        "core",
+  "set_language_state":        "core",
+  "get_default_language":      "core",
+  "set_default_language":      "core",
+  "drop_default_language":     "core",
+  "set_language":              "core",
+  "set_language_bypass":       "core",
+  "drop_language":             "core",
+  "get_language":              "core",
+  "language":                  "core",
+
+  "to_locale":                 "helpers",
+  "to_language":               "helpers",
+
+  "Histogram":                 "instrumentation",
+  "Instrumentation":           "instrumentation",
+  "Metric":                    "instrumentation",
+  "UntranslatedMessage":       "instrumentation",
+
+  "LazyTranslation":           "lazy",
+
+  "compile_plural":            "plurals",
+
+  "CatalogInfo":               "translations",
+  "CatalogsCacheInfo":         "translations",
+  "NotThreadSafeTranslations": "translations",
+  "Translations":              "translations",
+  "preload_translations":      "translations",
+}
+
+_SUBMODULES = {
+  "bundles",
+  "catalogs",
+  "cli",
+  "core",
+  "helpers",
+  "instrumentation",
+  "lazy",
+  "plurals",
+  "translations",
+  "version",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def _import_submodule(name: str):
+  # unlike 'importlib.import_module()', '__import__()' does not need an extra
+  # module and is reported by '-X importtime'
+  return getattr(__import__(f"{__name__}.{name}"), name)
+
+
+def __getattr__(name: str):
+  module_name = _EXPORTS.get(name)
+
+  if module_name is not None:
+    module = _import_submodule(module_name)
+    value = getattr(module, name)
+
+    # next accesses do not go through this function
+    globals()[name] = value
+    return value
+
+  if name in _SUBMODULES:
+    return _import_submodule(name)
+
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+  return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
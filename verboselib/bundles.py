@@ -0,0 +1,262 @@
+"""
+Bundles of compiled translations catalogs packed into a single file.
+
+A bundle starts with a header, which is followed by contents of '.mo' files,
+each aligned to 8 bytes, and by an index:
+
+* header: magic number (8 bytes), version, offset and size of the index
+  (unsigned 32-bit little-endian integers), padded to 24 bytes;
+* index: UTF-8 encoded JSON which maps domains to locales and locales to
+  pairs of offsets of '.mo' files from the start of the bundle and their
+  sizes.
+
+"""
+import gettext as _gettext
+import io
+import mmap
+import struct
+import sys
+
+if sys.version_info >= (3, 9):
+  from collections.abc import Mapping
+
+  List = list
+  Type = type
+
+else:
+  from typing import List
+  from typing import Mapping
+  from typing import Type
+
+from typing import Optional
+from typing import TYPE_CHECKING
+from typing import Union
+
+from .catalogs import Buffer
+
+from ._utils import export
+
+
+if TYPE_CHECKING:
+  from pathlib import Path
+
+
+StringOrPath = Union[str, "Path"]
+
+
+_MAGIC = b"VBLBUNDL"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIII4x")
+_ALIGNMENT = 8
+
+
+def _expand_locale(locale: str) -> List[str]:
+  """
+  Get variants of a locale in the same order as ``gettext.find()`` probes
+  them, e.g., 'en' expands into 'en_US' and 'en'. Probing stops at the 'C'
+  locale.
+
+  """
+  result = []
+
+  # the same function is used by 'gettext.find()'
+  for variant in _gettext._expand_lang(locale):
+    if variant == "C":
+      break
+    if variant not in result:
+      result.append(variant)
+
+  return result
+
+
+@export
+class CatalogBundle:
+  """
+  A read-only bundle of compiled translations catalogs of one or more
+  domains, which can be used as a source of catalogs by
+  ``verboselib.Translations`` instead of a locale dir.
+
+  Bundles are produced by ``compile`` command of ``verboselib`` CLI with
+  ``--bundle`` option or by ``CatalogBundle.pack()``.
+
+  A catalog is found via the index of the bundle instead of probing the file
+  system, and is loaded from a slice of the bundle's buffer. If a bundle is
+  opened from a file, the file is memory-mapped, so
+  ``verboselib.MmapTranslations`` reads messages right from mapped pages.
+
+  :param buffer: Contents of a bundle.
+  :param name:   Name of the bundle used in error messages, e.g., a path.
+
+  """
+
+  def __init__(self, buffer: Buffer, name: str="") -> None:
+    self._buffer = buffer = memoryview(buffer)
+    self._name = name
+
+    if len(buffer) < _HEADER.size:
+      raise OSError(0, "File is corrupt", name)
+
+    magic, version, index_offset, index_size = _HEADER.unpack_from(buffer, 0)
+    if magic != _MAGIC:
+      raise OSError(0, "Bad magic number", name)
+
+    if version != _VERSION:
+      raise OSError(0, "Bad version number " + str(version), name)
+
+    # imported here rather than at the top, so that importing of
+    # 'verboselib.translations' does not pay for it if bundles are not used
+    import json
+
+    index_end = index_offset + index_size
+    if index_offset < _HEADER.size or index_end > len(buffer):
+      raise OSError(0, "File is corrupt", name)
+
+    try:
+      self._index = json.loads(bytes(buffer[index_offset:index_end]).decode("utf-8"))
+    except ValueError:
+      raise OSError(0, "File is corrupt", name)
+
+    for locales in self._index.values():
+      for offset, size in locales.values():
+        if offset < _HEADER.size or offset + size > index_offset:
+          raise OSError(0, "File is corrupt", name)
+
+  @classmethod
+  def open(cls, path: StringOrPath) -> "CatalogBundle":
+    """
+    Open a bundle file by memory-mapping it.
+
+    """
+    path = str(path)
+
+    with open(path, "rb") as f:
+      buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return cls(buffer, name=path)
+
+  @classmethod
+  def from_resource(cls, package: str, resource: str) -> "CatalogBundle":
+    """
+    Open a bundle which is shipped as a resource of a package, including
+    packages imported from zip files.
+
+    A resource which is a regular file is memory-mapped, other ones are read
+    into memory.
+
+    """
+    import importlib.resources
+    from pathlib import Path
+
+    if sys.version_info >= (3, 9):
+      traversable = importlib.resources.files(package).joinpath(resource)
+      if isinstance(traversable, Path):
+        return cls.open(traversable)
+
+      return cls(traversable.read_bytes(), name=f"{package}:{resource}")
+
+    return cls(importlib.resources.read_binary(package, resource), name=f"{package}:{resource}")
+
+  @staticmethod
+  def pack(catalogs: Mapping[str, Mapping[str, bytes]]) -> bytes:
+    """
+    Make contents of a bundle.
+
+    :param catalogs: Contents of '.mo' files by locales by domains.
+
+    """
+    import json
+
+    domains = sorted(catalogs)
+    entries = [
+      (domain, locale, catalogs[domain][locale])
+      for domain in domains
+      for locale in sorted(catalogs[domain])
+    ]
+
+    index = {domain: {} for domain in domains}
+
+    result = io.BytesIO()
+    result.write(b"\x00" * _HEADER.size)
+
+    for domain, locale, content in entries:
+      index[domain][locale] = [result.tell(), len(content)]
+      result.write(content)
+      result.write(b"\x00" * (-len(content) % _ALIGNMENT))
+
+    index_offset = result.tell()
+    index_content = json.dumps(index, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    result.write(index_content)
+
+    result.seek(0)
+    result.write(_HEADER.pack(_MAGIC, _VERSION, index_offset, len(index_content)))
+
+    return result.getvalue()
+
+  @property
+  def name(self) -> str:
+    return self._name
+
+  def domains(self) -> List[str]:
+    return sorted(self._index)
+
+  def locales(self, domain: str) -> List[str]:
+    return sorted(self._index.get(domain, ()))
+
+  def get(self, domain: str, locale: str) -> Optional[memoryview]:
+    """
+    Get contents of a '.mo' file of a domain for a locale as is, without
+    expanding the locale into variants.
+
+    """
+    entry = self._index.get(domain, {}).get(locale)
+    if entry is None:
+      return None
+
+    offset, size = entry
+    return self._buffer[offset:offset + size]
+
+  def find(self, domain: str, locale: str) -> List[str]:
+    """
+    Find locales of catalogs of a domain which ``gettext.find()`` would find
+    for a locale in a locale dir, i.e., the catalog of the locale followed by
+    catalogs of its fallbacks.
+
+    """
+    locales = self._index.get(domain)
+    if not locales:
+      return []
+
+    return [
+      variant
+      for variant in _expand_locale(locale)
+      if variant in locales
+    ]
+
+  def load(
+    self,
+    domain: str,
+    locale: str,
+    catalog_class: Type[_gettext.NullTranslations],
+  ) -> Optional[_gettext.NullTranslations]:
+    """
+    Load a catalog of a domain for a locale as is, without expanding the
+    locale into variants.
+
+    Classes with ``from_buffer()`` constructor, e.g.,
+    ``verboselib.MmapTranslations``, get a slice of the bundle without
+    copying it, others read a file-like copy.
+
+    """
+    content = self.get(domain, locale)
+    if content is None:
+      return None
+
+    name = f"{self._name}:{domain}/{locale}"
+
+    from_buffer = getattr(catalog_class, "from_buffer", None)
+    if from_buffer is not None:
+      return from_buffer(content, name)
+
+    fp = io.BytesIO(content)
+    fp.name = name
+    return catalog_class(fp)
@@ -0,0 +1,403 @@
+import gettext as _gettext
+import io
+import mmap
+import struct
+import sys
+
+if sys.version_info >= (3, 9):
+  Tuple = tuple
+else:
+  from typing import Tuple
+
+from typing import BinaryIO
+from typing import Optional
+from typing import Union
+
+from .plurals import compile_plural
+
+from ._utils import export
+
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+Entry  = Tuple[bool, Tuple[str, ...]]
+
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+def hash_string(key: bytes) -> int:
+  """
+  Calculate hash of a key the same way GNU gettext does for '.mo' hash tables.
+
+  This is the ``hashpjw`` function from "Compilers: Principles, Techniques,
+  and Tools" by Aho, Sethi and Ullman.
+
+  """
+  value = 0
+
+  for c in key:
+    value = (value << 4) + c
+    g = value & 0xf0000000
+    if g:
+      value ^= g >> 24
+      value ^= g
+
+  return value
+
+
+@export
+class DictTranslations(_gettext.GNUTranslations):
+  """
+  A ``gettext.GNUTranslations`` which evaluates plural forms of common rules
+  via precomputed tables instead of functions compiled from 'Plural-Forms'
+  header by ``gettext.c2py()``.
+
+  """
+
+  def _parse(self, fp: BinaryIO) -> None:
+    super()._parse(fp)
+
+    plural_forms = self._info.get("plural-forms")
+    if plural_forms:
+      plural = plural_forms.split(";")[1].split("plural=")[1]
+      self.plural = compile_plural(plural)
+
+
+@export
+class MmapTranslations(_gettext.NullTranslations):
+  """
+  A drop-in replacement for ``gettext.GNUTranslations`` which memory-maps
+  '.mo' files instead of loading them into dicts.
+
+  Messages are looked up directly in the mapped file via its hash table (or
+  via binary search through its sorted table of original strings if the file
+  has no hash table) and are decoded only on demand. Recently decoded
+  messages are kept in a small LRU cache.
+
+  As mapped pages belong to the OS page cache, they are shared by all
+  processes reading the same file, e.g., by pre-forked workers.
+
+  The file is unmapped once the instance is dropped, or right away via
+  ``close()``.
+
+  :param fp:         An open binary '.mo' file. It can be closed after
+                     the instance is created.
+  :param cache_size: Max number of decoded messages to keep.
+
+  """
+
+  LE_MAGIC = _gettext.GNUTranslations.LE_MAGIC
+  BE_MAGIC = _gettext.GNUTranslations.BE_MAGIC
+  CONTEXT  = _gettext.GNUTranslations.CONTEXT
+  VERSIONS = _gettext.GNUTranslations.VERSIONS
+
+  def __init__(self, fp: Optional[BinaryIO]=None, cache_size: int=DEFAULT_CACHE_SIZE):
+    # decoded entries by messages (least recently used first); a plain dict
+    # is used rather than 'functools.lru_cache()' around a bound method, as
+    # the latter would make a reference cycle holding the mapped file
+    self._cache = {}
+    self._cache_size = cache_size
+
+    self._mmap = None
+    self._buffer = None
+
+    super().__init__(fp)
+
+  @classmethod
+  def from_buffer(
+    cls,
+    buffer: Buffer,
+    filename: str="",
+    cache_size: int=DEFAULT_CACHE_SIZE,
+  ) -> "MmapTranslations":
+    """
+    Make an instance which looks up messages directly in contents of a '.mo'
+    file, e.g., in a slice of ``verboselib.CatalogBundle``. The buffer is
+    used as is, without copying.
+
+    """
+    result = cls(cache_size=cache_size)
+    result._load(buffer, filename)
+    return result
+
+  def _parse(self, fp: BinaryIO) -> None:
+    filename = getattr(fp, "name", "")
+
+    try:
+      fileno = fp.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+      # in-memory files, e.g., ones read from zip archives, have nothing
+      # to map
+      buffer = fp.read()
+    else:
+      buffer = self._mmap = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+
+    self._load(buffer, filename)
+
+  def close(self) -> None:
+    """
+    Unmap the file right away rather than when the instance is dropped.
+    Buffers given to ``from_buffer()`` are left to their owners. Lookups made
+    after closing return untranslated messages.
+
+    """
+    self._cache = {}
+
+    buffer, self._buffer = self._buffer, None
+    mapped, self._mmap = self._mmap, None
+
+    try:
+      if buffer is not None:
+        buffer.release()
+      if mapped is not None:
+        mapped.close()
+    except BufferError:
+      # slices of the buffer are still used by concurrent lookups, so it's
+      # released once they are done
+      pass
+
+  def _load(self, buffer: Buffer, filename: str="") -> None:
+    self.plural = lambda n: int(n != 1)  # germanic plural by default
+
+    self._buffer = buffer = memoryview(buffer)
+    self._filename = filename
+
+    if len(buffer) < 28:
+      raise OSError(0, "File is corrupt", filename)
+
+    magic = struct.unpack_from("<I", buffer, 0)[0]
+    if magic == self.LE_MAGIC:
+      self._int_format = "<I"
+      self._pair_format = "<II"
+    elif magic == self.BE_MAGIC:
+      self._int_format = ">I"
+      self._pair_format = ">II"
+    else:
+      raise OSError(0, "Bad magic number", filename)
+
+    (
+      version,
+      self._count,
+      self._originals_offset,
+      self._translations_offset,
+      self._hash_table_size,
+      self._hash_table_offset,
+    ) = struct.unpack_from(self._int_format[0] + "6I", buffer, 4)
+
+    major_version = version >> 16
+    if major_version not in self.VERSIONS:
+      raise OSError(0, "Bad version number " + str(major_version), filename)
+
+    if self._hash_table_size <= 2:
+      # a hash table is useless for probing if it is so small
+      self._hash_table_size = 0
+
+    index = self._find_index(b"")
+    if index is not None:
+      self._parse_header(self._get_translation_bytes(index))
+
+  def _parse_header(self, header: bytes) -> None:
+    lastk = None
+
+    for b_item in header.split(b"\n"):
+      item = b_item.decode().strip()
+      if not item:
+        continue
+
+      # skip over comment lines
+      if item.startswith("#-#-#-#-#") and item.endswith("#-#-#-#-#"):
+        continue
+
+      k = v = None
+      if ":" in item:
+        k, v = item.split(":", 1)
+        k = k.strip().lower()
+        v = v.strip()
+        self._info[k] = v
+        lastk = k
+      elif lastk:
+        self._info[lastk] += "\n" + item
+
+      if k == "content-type":
+        self._charset = v.split("charset=")[1]
+      elif k == "plural-forms":
+        v = v.split(";")
+        plural = v[1].split("plural=")[1]
+        self.plural = compile_plural(plural)
+
+  def _get_string_location(self, table_offset: int, index: int) -> Tuple[int, int]:
+    length, offset = struct.unpack_from(self._pair_format, self._buffer, table_offset + index * 8)
+
+    if offset + length >= len(self._buffer):
+      raise OSError(0, "File is corrupt", self._filename)
+
+    return length, offset
+
+  def _get_original_bytes(self, index: int) -> bytes:
+    length, offset = self._get_string_location(self._originals_offset, index)
+    return bytes(self._buffer[offset:offset + length])
+
+  def _get_translation_bytes(self, index: int) -> bytes:
+    length, offset = self._get_string_location(self._translations_offset, index)
+    return bytes(self._buffer[offset:offset + length])
+
+  def _compare_original(self, index: int, key: bytes) -> int:
+    """
+    Compare an original string with a key like ``strcmp()`` does, i.e., taking
+    into account only the singular form of plural original strings.
+
+    """
+    original = self._get_original_bytes(index).partition(b"\x00")[0]
+    return (original > key) - (original < key)
+
+  def _find_index(self, key: bytes) -> Optional[int]:
+    if self._hash_table_size:
+      return self._find_index_via_hash_table(key)
+    else:
+      return self._find_index_via_binary_search(key)
+
+  def _find_index_via_hash_table(self, key: bytes) -> Optional[int]:
+    size = self._hash_table_size
+    value = hash_string(key)
+    idx = value % size
+    incr = 1 + (value % (size - 2))
+
+    while True:
+      position = struct.unpack_from(self._int_format, self._buffer, self._hash_table_offset + idx * 4)[0]
+      if position == 0:
+        return None
+
+      index = position - 1
+      if index < self._count and self._compare_original(index, key) == 0:
+        return index
+
+      if idx >= size - incr:
+        idx -= size - incr
+      else:
+        idx += incr
+
+  def _find_index_via_binary_search(self, key: bytes) -> Optional[int]:
+    lo, hi = 0, self._count
+
+    while lo < hi:
+      mid = (lo + hi) // 2
+      result = self._compare_original(mid, key)
+      if result == 0:
+        return mid
+      elif result < 0:
+        lo = mid + 1
+      else:
+        hi = mid
+
+    return None
+
+  def _find_entry(self, message: str) -> Optional[Entry]:
+    charset = self._charset or "ascii"
+
+    try:
+      key = message.encode(charset)
+    except UnicodeEncodeError:
+      return None
+
+    index = self._find_index(key)
+    if index is None:
+      return None
+
+    is_plural = (b"\x00" in self._get_original_bytes(index))
+
+    translation = self._get_translation_bytes(index)
+    forms = tuple(
+      str(x, charset)
+      for x in translation.split(b"\x00")
+    )
+    return (is_plural, forms)
+
+  def _lookup(self, message: str) -> Optional[Entry]:
+    cache = self._cache
+
+    try:
+      # moves the entry to the end as the most recently used one
+      entry = cache.pop(message)
+    except KeyError:
+      if self._buffer is None:
+        return None
+
+      try:
+        entry = self._find_entry(message)
+      except (TypeError, ValueError):
+        if self._buffer is not None:
+          raise
+        # the instance was closed by a concurrent eviction
+        return None
+
+      if len(cache) >= self._cache_size:
+        try:
+          del cache[next(iter(cache))]
+        except (KeyError, RuntimeError, StopIteration):
+          # the cache was changed by a concurrent lookup
+          pass
+
+    if self._cache_size > 0:
+      cache[message] = entry
+
+    return entry
+
+  def _get_singular(self, key: str) -> Optional[str]:
+    entry = self._lookup(key)
+    if entry is None:
+      return None
+
+    is_plural, forms = entry
+    if not is_plural:
+      return forms[0]
+
+    try:
+      return forms[self.plural(1)]
+    except IndexError:
+      return None
+
+  def _get_plural(self, key: str, n: int) -> Optional[str]:
+    entry = self._lookup(key)
+    if entry is None:
+      return None
+
+    is_plural, forms = entry
+    if not is_plural:
+      return None
+
+    try:
+      return forms[self.plural(n)]
+    except IndexError:
+      return None
+
+  def gettext(self, message: str) -> str:
+    tmsg = self._get_singular(message)
+    if tmsg is not None:
+      return tmsg
+    if self._fallback:
+      return self._fallback.gettext(message)
+    return message
+
+  def ngettext(self, msgid1: str, msgid2: str, n: int) -> str:
+    tmsg = self._get_plural(msgid1, n)
+    if tmsg is not None:
+      return tmsg
+    if self._fallback:
+      return self._fallback.ngettext(msgid1, msgid2, n)
+    return msgid1 if n == 1 else msgid2
+
+  def pgettext(self, context: str, message: str) -> str:
+    tmsg = self._get_singular(self.CONTEXT % (context, message))
+    if tmsg is not None:
+      return tmsg
+    if self._fallback:
+      return self._fallback.pgettext(context, message)
+    return message
+
+  def npgettext(self, context: str, msgid1: str, msgid2: str, n: int) -> str:
+    tmsg = self._get_plural(self.CONTEXT % (context, msgid1), n)
+    if tmsg is not None:
+      return tmsg
+    if self._fallback:
+      return self._fallback.npgettext(context, msgid1, msgid2, n)
+    return msgid1 if n == 1 else msgid2
@@ -1,22 +1,41 @@
 import argparse
+import concurrent.futures
 import sys
 
 if sys.version_info >= (3, 9):
-  List = list
+  Dict  = dict
+  List  = list
+  Tuple = tuple
 else:
+  from typing import Dict
   from typing import List
+  from typing import Tuple
 
 from pathlib import Path
+from typing import NamedTuple
 from typing import Optional
 
+from verboselib.bundles import CatalogBundle
+
 from .command_base import BaseCommand
 from .command_base import BaseCommandExecutor
 
 from .encoding import has_bom
 
+from .engines import ENGINE_MSGFMT
+from .engines import ENGINE_NATIVE
+from .engines import ENGINES
+
 from .gettext_tools import compile_translations
 from .gettext_tools import validate_gettext_tools_exist
 
+from .manifest import make_compilation_key
+from .manifest import make_manifest_file_path
+from .manifest import MANIFEST_FILE_NAME
+from .manifest import CompileManifest
+
+from .mo import compile_po_file
+
 from .paths import get_names_of_immediate_subdirectories
 from .paths import make_messages_dir_path
 from .paths import make_mo_file_path
@@ -28,10 +47,20 @@ from .utils import halt
 from .utils import print_err
 from .utils import print_out
 from .utils import show_usage_error_and_halt
+from .utils import write_file_atomically
 
 from . import defaults
 
 
+BUNDLE_DOMAIN_PLACEHOLDER = "{domain}"
+
+
+class CompilationResult(NamedTuple):
+  key:        str
+  warnings:   str
+  is_skipped: bool
+
+
 class CompileCommandExecutor(BaseCommandExecutor):
 
   def __init__(self, args=argparse.Namespace) -> None:
@@ -52,6 +81,19 @@ class CompileCommandExecutor(BaseCommandExecutor):
     self._fuzzy = args.fuzzy
 
     self._msgfmt_extra_args = flatten_comma_separated_values(args.msgfmt_extra_args)
+
+    self._engine = args.engine
+    self._validate_engine(self._engine, self._msgfmt_extra_args)
+
+    self._jobs = args.jobs
+    self._validate_jobs(self._jobs)
+
+    self._force = args.force
+    self._manifest = None
+
+    self._bundle_path = args.bundle
+    self._validate_bundle_path(self._bundle_path)
+
     self._verbose = args.verbose
 
   @staticmethod
@@ -99,8 +141,31 @@ class CompileCommandExecutor(BaseCommandExecutor):
         )
         show_usage_error_and_halt()
 
+  @staticmethod
+  def _validate_engine(engine: str, msgfmt_extra_args: List[str]) -> None:
+    if engine == ENGINE_NATIVE and msgfmt_extra_args:
+      print_err(f"extra args for 'msgfmt' cannot be used with '{ENGINE_NATIVE}' engine")
+      show_usage_error_and_halt()
+
+  @staticmethod
+  def _validate_jobs(jobs: int) -> None:
+    if jobs < 1:
+      print_err(f"number of jobs must be positive (jobs={jobs})")
+      show_usage_error_and_halt()
+
+  @staticmethod
+  def _validate_bundle_path(path: Optional[str]) -> None:
+    if path is None:
+      return
+
+    dir_path = Path(path).absolute().parent
+    if not dir_path.is_dir():
+      print_err(f"dir of bundle does not exist (path={stringify_path(dir_path)})")
+      show_usage_error_and_halt()
+
   def __call__(self) -> None:
-    validate_gettext_tools_exist()
+    if self._engine == ENGINE_MSGFMT:
+      validate_gettext_tools_exist()
 
     if self._verbose:
       self._print_input_args(
@@ -108,44 +173,197 @@ class CompileCommandExecutor(BaseCommandExecutor):
         locales=self._locales,
         fuzzy=self._fuzzy,
         msgfmt_extra_args=self._msgfmt_extra_args,
+        engine=self._engine,
+        jobs=self._jobs,
+        force=self._force,
+        bundle=self._bundle_path,
         verbose=self._verbose,
       )
 
+    self._manifest = CompileManifest.load(make_manifest_file_path(self._locales_dir_path))
+
     final_locales = sorted(set(self._locales) - self._exclude)
 
-    for locale in final_locales:
-      self._process_locale(locale=locale)
+    tasks = [
+      (locale, file_path)
+      for locale in final_locales
+      for file_path in self._find_translations_files(locale)
+    ]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=self._jobs) as executor:
+      futures = [
+        executor.submit(self._process_translations_file, file_path)
+        for locale, file_path in tasks
+      ]
+
+      # stop scheduling files after the first failure, but let running
+      # ones finish to report their results as well
+      __, not_done = concurrent.futures.wait(
+        futures,
+        return_when=concurrent.futures.FIRST_EXCEPTION,
+      )
+      for future in not_done:
+        future.cancel()
+
+    self._report_results(tasks, futures)
 
-  def _process_locale(self, locale: str) -> None:
-    if self._verbose:
-      print_out(f"processing locale '{locale}'")
+    if self._bundle_path:
+      self._write_bundles(final_locales)
 
+  def _find_translations_files(self, locale: str) -> List[Path]:
     messages_dir_path = make_messages_dir_path(self._locales_dir_path, locale)
 
-    for path in messages_dir_path.iterdir():
-      if path.is_file() and path.suffix == ".po":
-        self._process_translations_file(file_path=path)
+    return sorted(
+      path
+      for path in messages_dir_path.iterdir()
+      if path.is_file() and path.suffix == ".po"
+    )
 
-  def _process_translations_file(self, file_path: Path) -> None:
-    if self._verbose:
-      print_out(f"processing file '{stringify_path(file_path)}'")
+  def _process_translations_file(self, file_path: Path) -> CompilationResult:
+    """
+    Compile a single '.po' file unless its '.mo' file is up to date.
+
+    Runs in worker threads, so must not print anything.
 
+    """
     if has_bom(file_path):
-      print_err(
+      raise RuntimeError(
         f"the file '{stringify_path(file_path)}' file has a BOM (Byte Order Mark). "
         f"Verboselib supports only '.po' files encoded in UTF-8 and without any BOM."
       )
-      halt()
 
     mo_file_path = make_mo_file_path(file_path)
 
-    compile_translations(
-      mo_file_path=mo_file_path,
-      po_file_path=file_path,
+    key = make_compilation_key(
+      po_file_content=file_path.read_bytes(),
       fuzzy=self._fuzzy,
       msgfmt_extra_args=self._msgfmt_extra_args,
+      engine=self._engine,
     )
 
+    if not self._force and self._manifest.is_up_to_date(file_path, mo_file_path, key):
+      return CompilationResult(key=key, warnings="", is_skipped=True)
+
+    if self._engine == ENGINE_NATIVE:
+      warnings = compile_po_file(
+        mo_file_path=mo_file_path,
+        po_file_path=file_path,
+        fuzzy=self._fuzzy,
+      )
+    else:
+      warnings = compile_translations(
+        mo_file_path=mo_file_path,
+        po_file_path=file_path,
+        fuzzy=self._fuzzy,
+        msgfmt_extra_args=self._msgfmt_extra_args,
+      )
+
+    return CompilationResult(key=key, warnings=warnings, is_skipped=False)
+
+  def _report_results(
+    self,
+    tasks: List[Tuple[str, Path]],
+    futures: List[concurrent.futures.Future],
+  ) -> None:
+    """
+    Print output of processed files in the order of locales and files,
+    regardless of the order of their completion.
+
+    """
+    failures = []
+    compiled_count = 0
+    skipped_count = 0
+    last_locale = None
+
+    for (locale, file_path), future in zip(tasks, futures):
+      if future.cancelled():
+        continue
+
+      if self._verbose:
+        if locale != last_locale:
+          print_out(f"processing locale '{locale}'")
+          last_locale = locale
+
+        print_out(f"processing file '{stringify_path(file_path)}'")
+
+      error = future.exception()
+      if error is not None:
+        failures.append((file_path, error))
+        continue
+
+      result = future.result()
+
+      if result.is_skipped:
+        skipped_count += 1
+        if self._verbose:
+          print_out("file is up to date, skipping")
+        continue
+
+      if result.warnings:
+        print_err(result.warnings)
+
+      self._manifest.update(file_path, make_mo_file_path(file_path), result.key)
+      compiled_count += 1
+
+    # keep results of successfully compiled files even if others have failed
+    self._manifest.save()
+
+    if self._verbose:
+      print_out(
+        f"compiled {compiled_count} file(s), "
+        f"skipped {skipped_count} up-to-date file(s)"
+      )
+
+    if failures:
+      cancelled_count = sum(1 for x in futures if x.cancelled())
+
+      print_err(f"failed to compile {len(failures)} file(s):")
+      for file_path, error in failures:
+        print_err(f"  {stringify_path(file_path)}: {error}")
+
+      if cancelled_count:
+        print_err(f"skipped {cancelled_count} file(s) after the failure")
+
+      halt()
+
+  def _write_bundles(self, locales: List[str]) -> None:
+    """
+    Pack compiled '.mo' files of given locales into a single bundle, or into
+    a bundle per domain if the path of the bundle has a placeholder for the
+    domain.
+
+    Bundles are written only if their contents have changed.
+
+    """
+    catalogs: Dict[str, Dict[str, bytes]] = {}
+
+    for locale in locales:
+      for file_path in self._find_translations_files(locale):
+        mo_file_path = make_mo_file_path(file_path)
+        catalogs.setdefault(file_path.stem, {})[locale] = mo_file_path.read_bytes()
+
+    if BUNDLE_DOMAIN_PLACEHOLDER in self._bundle_path:
+      bundles = [
+        (self._bundle_path.replace(BUNDLE_DOMAIN_PLACEHOLDER, domain), {domain: content})
+        for domain, content in sorted(catalogs.items())
+      ]
+    else:
+      bundles = [(self._bundle_path, catalogs), ]
+
+    for path, content in bundles:
+      bundle_path = Path(path).absolute()
+      bundle_content = CatalogBundle.pack(content)
+
+      if bundle_path.is_file() and bundle_path.read_bytes() == bundle_content:
+        if self._verbose:
+          print_out(f"bundle '{stringify_path(bundle_path)}' is up to date")
+        continue
+
+      write_file_atomically(bundle_path, bundle_content)
+
+      if self._verbose:
+        print_out(f"written bundle '{stringify_path(bundle_path)}'")
+
 
 class CompileCommand(BaseCommand):
   name = "compile"
@@ -191,6 +409,33 @@ class CompileCommand(BaseCommand):
       default=False,
       help="use fuzzy translations",
     )
+    parser.add_argument(
+      "--force",
+      action="store_true",
+      dest="force",
+      default=False,
+      help=(
+        "compile all files, including ones which are recorded as up to date "
+        f"in '{MANIFEST_FILE_NAME}' file in the locales dir"
+      ),
+    )
+    parser.add_argument(
+      "-j", "--jobs",
+      type=int,
+      dest="jobs",
+      default=defaults.DEFAULT_JOBS,
+      help="number of files to compile in parallel",
+    )
+    parser.add_argument(
+      "--engine",
+      dest="engine",
+      choices=ENGINES,
+      default=ENGINE_MSGFMT,
+      help=(
+        f"compiler to use: '{ENGINE_MSGFMT}' runs GNU 'msgfmt' utility, "
+        f"'{ENGINE_NATIVE}' compiles files in-process without external tools"
+      ),
+    )
     parser.add_argument(
       "--msgfmt-extra-args",
       action="append",
@@ -200,6 +445,18 @@ class CompileCommand(BaseCommand):
         "can be comma-separated or specified multiple times"
       ),
     )
+    parser.add_argument(
+      "--bundle",
+      dest="bundle",
+      default=None,
+      metavar="PATH",
+      help=(
+        "also pack compiled files of processed locales into a single bundle "
+        "file, which can be used by 'verboselib.CatalogBundle'; "
+        f"a bundle per domain is written if the path has '{BUNDLE_DOMAIN_PLACEHOLDER}' "
+        "placeholder, ex: 'locale/{domain}.bundle'"
+      ),
+    )
     parser.add_argument(
       "-v", "--verbose",
       action="store_true",
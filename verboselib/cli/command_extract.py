@@ -1,204 +1,289 @@
 import argparse
+import concurrent.futures
 import sys
 
 if sys.version_info >= (3, 9):
   from collections.abc import Iterable
+  from collections.abc import Iterator
 
-  List = list
-  Set  = set
+  Dict  = dict
+  List  = list
+  Set   = set
+  Tuple = tuple
 
 else:
+  from typing import Dict
   from typing import Iterable
+  from typing import Iterator
   from typing import List
   from typing import Set
-
-if sys.version_info >= (3, 8):
-  from typing import Literal
-  MODE = Literal["w", "a"]
-else:
-  MODE = str
+  from typing import Tuple
 
 from pathlib import Path
+from typing import NamedTuple
 from typing import Optional
 
 from .command_base import BaseCommand
 from .command_base import BaseCommandExecutor
 
+from .engines import EXTRACTOR_NATIVE
+from .engines import EXTRACTOR_XGETTEXT
+from .engines import EXTRACTORS
+from .engines import MERGER_MSGMERGE
+from .engines import MERGER_NATIVE
+
+from .extraction_args import add_keywords_arguments
+from .extraction_args import add_locales_arguments
+from .extraction_args import add_merger_arguments
+from .extraction_args import add_output_arguments
+from .extraction_args import add_sources_arguments
+from .extraction_args import handle_extensions
+from .extraction_args import handle_ignore_patterns
+from .extraction_args import handle_keywords
+from .extraction_args import handle_locales
+from .extraction_args import handle_locales_dir_path
+from .extraction_args import validate_domain
+from .extraction_args import validate_keywords
+from .extraction_args import validate_locales
+from .extraction_args import validate_locales_dir_path
+from .extraction_args import validate_merger
+
+from .extraction_cache import split_fragment
+from .extraction_cache import ExtractionCache
+
+from .extractor import collect_messages
+from .extractor import extract_messages_from_file
+from .extractor import extract_messages_from_files
+from .extractor import parse_keywords
+from .extractor import Occurrence
+
+from .merge import merge_po_file
+
 from .gettext_tools import extract_translations
 from .gettext_tools import extract_unique_messages
 from .gettext_tools import merge_new_and_existing_translations
 from .gettext_tools import remove_obsolete_translations
-from .gettext_tools import strip_translations_header
 from .gettext_tools import validate_gettext_tools_exist
 
 from .paths import ensure_dir_exists
-from .paths import find_source_files_paths
-from .paths import get_names_of_immediate_subdirectories
+from .paths import iter_source_files_paths
 from .paths import make_po_file_path
 from .paths import make_pot_file_path
 
+from .po import parse_po_lines
+from .po import Catalog
+
 from .text import flatten_comma_separated_values
 from .text import stringify_path
 
 from .utils import print_err
 from .utils import print_out
 from .utils import show_usage_error_and_halt
+from .utils import write_file_atomically
 
 from . import defaults
 
 
+
+class LocaleResult(NamedTuple):
+  po_file_path: Path
+  is_merged:    bool
+  is_cleaned:   bool
+  warnings:     str
+
+
 class ExtractCommandExecutor(BaseCommandExecutor):
 
   def __init__(self, args=argparse.Namespace) -> None:
     self._domain = args.domain
-    self._validate_domain(self._domain)
+    validate_domain(self._domain)
 
     self._process_all_locales = args.all
 
-    self._locales_dir_path = self._handle_locales_dir_path(args.output_dir)
-    self._validate_locales_dir_path(self._locales_dir_path)
+    self._locales_dir_path = handle_locales_dir_path(args.output_dir)
+    validate_locales_dir_path(self._locales_dir_path)
 
     self._pot_file_path = make_pot_file_path(self._locales_dir_path, self._domain)
 
-    self._locales = self._handle_locales(
+    self._locales = handle_locales(
       locales=args.locale,
       process_all=self._process_all_locales,
       locales_dir_path=self._locales_dir_path,
     )
-    self._validate_locales(self._locales)
+    validate_locales(self._locales)
 
-    self._keywords = self._handle_keywords(
+    self._keywords = handle_keywords(
       keywords=args.keyword,
       no_defaults=args.no_default_keywords,
     )
-    self._extensions = self._handle_extensions(args.extensions)
+    self._extensions = handle_extensions(args.extensions)
     self._follow_links = args.follow_links
-    self._ignore_patterns = self._handle_ignore_patterns(
+    self._ignore_patterns = handle_ignore_patterns(
       ignore_patterns=args.ignore_patterns,
       no_defaults=args.no_default_ignore_patterns,
     )
+    self._use_gitignore = args.use_gitignore
     self._no_wrap = args.no_wrap
     self._no_location = args.no_location
     self._no_obsolete = args.no_obsolete
     self._keep_pot = args.keep_pot
     self._xgettext_extra_args = flatten_comma_separated_values(args.xgettext_extra_args)
     self._msguniq_extra_args = flatten_comma_separated_values(args.msguniq_extra_args)
+    self._no_msguniq = args.no_msguniq
     self._msgmerge_extra_args = flatten_comma_separated_values(args.msgmerge_extra_args)
     self._msgattrib_extra_args = flatten_comma_separated_values(args.msgattrib_extra_args)
-    self._verbose = args.verbose
 
-  @staticmethod
-  def _handle_keywords(
-    keywords: Optional[Iterable[str]]=None,
-    no_defaults: bool=False,
-  ) -> List[str]:
-
-    keywords = (
-      list(keywords)
-      if keywords is not None
-      else []
-    )
+    self._jobs = args.jobs
+    self._validate_positive_number("number of jobs", self._jobs)
 
-    if not no_defaults:
-      keywords.extend(defaults.DEFAULT_KEYWORDS)
+    self._batch_size = args.batch_size
+    self._validate_positive_number("batch size", self._batch_size)
 
-    return list(sorted(set(keywords)))
+    self._cache_dir_path = self._handle_cache_dir_path(args.cache_dir)
+    self._validate_cache_dir_path(self._cache_dir_path)
 
-  @staticmethod
-  def _handle_extensions(
-    extensions: Optional[Iterable[str]]=None,
-    ignored: Optional[Iterable[str]]=None,
-  ) -> Set[str]:
-
-    extensions = (
-      list(extensions)
-      if extensions is not None
-      else []
+    self._extractor = args.extractor
+    self._validate_extractor(
+      extractor=self._extractor,
+      keywords=self._keywords,
+      extensions=self._extensions,
+      cache_dir_path=self._cache_dir_path,
+      xgettext_extra_args=self._xgettext_extra_args,
     )
 
-    ignored = (
-      set(ignored)
-      if ignored is not None
-      else set()
+    self._validate_msguniq(self._no_msguniq, self._msguniq_extra_args)
+    self._use_msguniq = self._should_use_msguniq(
+      extractor=self._extractor,
+      no_msguniq=self._no_msguniq,
+      msguniq_extra_args=self._msguniq_extra_args,
     )
 
-    ext_list = []
+    self._merger = args.merger
+    self._no_fuzzy_matching = args.no_fuzzy_matching
+    self._fuzzy_threshold = args.fuzzy_threshold
+    self._validate_merger(
+      merger=self._merger,
+      fuzzy_threshold=self._fuzzy_threshold,
+      msgmerge_extra_args=self._msgmerge_extra_args,
+      msgattrib_extra_args=self._msgattrib_extra_args,
+    )
 
-    for ext in extensions:
-      ext_list.extend(ext.replace(" ", "").split(","))
+    self._verbose = args.verbose
 
-    for i, ext in enumerate(ext_list):
-      if not ext.startswith("."):
-        ext_list[i] = ".%s" % ext_list[i]
+  @staticmethod
+  def _validate_positive_number(name: str, value: int) -> None:
+    if value < 1:
+      print_err(f"{name} must be positive (value={value})")
+      show_usage_error_and_halt()
 
-    ext_list.append(".py")
+  @staticmethod
+  def _handle_cache_dir_path(path: Optional[str]) -> Optional[Path]:
+    return Path(path).absolute() if path else None
 
-    return {
-      x
-      for x in ext_list
-      if x.strip(".") not in ignored
-    }
+  @staticmethod
+  def _validate_cache_dir_path(path: Optional[Path]) -> None:
+    if path is not None and path.exists() and not path.is_dir():
+      print_err(
+        f"cache dir already exists but it is not a directory "
+        f"(path={stringify_path(path)})"
+      )
+      show_usage_error_and_halt()
 
   @staticmethod
-  def _handle_ignore_patterns(
-    ignore_patterns: Optional[Iterable[str]]=None,
-    no_defaults: bool=False,
-  ) -> List[str]:
-
-    ignore_patterns = (
-      list(ignore_patterns)
-      if ignore_patterns is not None
-      else []
-    )
+  def _validate_extractor(
+    extractor: str,
+    keywords: List[str],
+    extensions: Set[str],
+    cache_dir_path: Optional[Path],
+    xgettext_extra_args: List[str],
+  ) -> None:
 
-    if not no_defaults:
-      ignore_patterns.extend(defaults.DEFAULT_IGNORE_PATTERNS)
+    if extractor != EXTRACTOR_NATIVE:
+      return
 
-    return list(sorted(set(ignore_patterns)))
+    if extensions != {".py"}:
+      print_err(f"'{EXTRACTOR_NATIVE}' extractor supports only '.py' files")
+      show_usage_error_and_halt()
 
-  @staticmethod
-  def _validate_domain(domain: Optional[str]) -> None:
-    if not domain:
-      print_err(f"invalid domain value: '{domain}'")
+    if cache_dir_path:
+      print_err(f"cache dir cannot be used with '{EXTRACTOR_NATIVE}' extractor")
       show_usage_error_and_halt()
 
-  @staticmethod
-  def _handle_locales_dir_path(path: str) -> Path:
-    return Path(path).absolute()
+    if xgettext_extra_args:
+      print_err(f"extra args for 'xgettext' cannot be used with '{EXTRACTOR_NATIVE}' extractor")
+      show_usage_error_and_halt()
+
+    validate_keywords(keywords)
 
   @staticmethod
-  def _validate_locales_dir_path(path: Path) -> None:
-    if path.exists() and not path.is_dir():
-      print_err(
-        f"locales dir already exists but it is not a directory "
-        f"(path={stringify_path(path)})"
-      )
+  def _validate_msguniq(no_msguniq: bool, msguniq_extra_args: List[str]) -> None:
+    if no_msguniq and msguniq_extra_args:
+      print_err("extra args for 'msguniq' cannot be used if it's disabled")
       show_usage_error_and_halt()
 
   @staticmethod
-  def _handle_locales(
-    locales: Optional[List[str]],
-    process_all: bool,
-    locales_dir_path: Path,
-  ) -> List[str]:
-
-    if locales:
-      return flatten_comma_separated_values(locales)
-    elif process_all:
-      return get_names_of_immediate_subdirectories(locales_dir_path)
-    else:
-      return []
+  def _should_use_msguniq(
+    extractor: str,
+    no_msguniq: bool,
+    msguniq_extra_args: List[str],
+  ) -> bool:
+    """
+    Messages extracted by ``xgettext`` are passed through ``msguniq``, so
+    that they are formatted by GNU gettext tools, like existing '.po' files
+    are. Messages of the native extractor are formatted in-process unless
+    there are extra args for ``msguniq``.
+
+    """
+    if no_msguniq:
+      return False
+
+    return extractor == EXTRACTOR_XGETTEXT or bool(msguniq_extra_args)
 
   @staticmethod
-  def _validate_locales(locales: List[str]) -> None:
-    if not locales:
-      print_err(
-        "specify at least 1 locale or specify processing of all existing locales"
-      )
+  def _validate_merger(
+    merger: str,
+    fuzzy_threshold: float,
+    msgmerge_extra_args: List[str],
+    msgattrib_extra_args: List[str],
+  ) -> None:
+
+    validate_merger(merger, fuzzy_threshold)
+
+    if merger == MERGER_MSGMERGE:
+      return
+
+    if msgmerge_extra_args:
+      print_err(f"extra args for 'msgmerge' cannot be used with '{MERGER_NATIVE}' merger")
+      show_usage_error_and_halt()
+
+    if msgattrib_extra_args:
+      print_err(f"extra args for 'msgattrib' cannot be used with '{MERGER_NATIVE}' merger")
       show_usage_error_and_halt()
 
+  def _get_required_gettext_tools(self) -> List[str]:
+    result = []
+
+    if self._extractor == EXTRACTOR_XGETTEXT:
+      result.append("xgettext")
+
+    if self._use_msguniq:
+      result.append("msguniq")
+
+    if self._merger == MERGER_MSGMERGE:
+      has_po_files = any(
+        make_po_file_path(self._locales_dir_path, locale, self._domain).exists()
+        for locale in self._locales
+      )
+      if has_po_files:
+        result.append("msgmerge")
+
+      if self._no_obsolete:
+        result.append("msgattrib")
+
+    return result
+
   def __call__(self) -> None:
-    validate_gettext_tools_exist()
+    validate_gettext_tools_exist(self._get_required_gettext_tools())
 
     if self._verbose:
       self._print_input_args(
@@ -210,50 +295,147 @@ class ExtractCommandExecutor(BaseCommandExecutor):
         extensions=self._extensions,
         follow_links=self._follow_links,
         ignore_patterns=self._ignore_patterns,
+        use_gitignore=self._use_gitignore,
         no_wrap=self._no_wrap,
         no_location=self._no_location,
         no_obsolete=self._no_obsolete,
         keep_pot=self._keep_pot,
         xgettext_extra_args=self._xgettext_extra_args,
         msguniq_extra_args=self._msguniq_extra_args,
+        no_msguniq=self._no_msguniq,
         msgmerge_extra_args=self._msgmerge_extra_args,
         msgattrib_extra_args=self._msgattrib_extra_args,
+        jobs=self._jobs,
+        batch_size=self._batch_size,
+        extractor=self._extractor,
+        merger=self._merger,
+        fuzzy_threshold=self._fuzzy_threshold,
+        no_fuzzy_matching=self._no_fuzzy_matching,
+        cache_dir_path=(
+          stringify_path(self._cache_dir_path)
+          if self._cache_dir_path
+          else None
+        ),
         verbose=self._verbose,
       )
 
     ensure_dir_exists(self._locales_dir_path)
 
-    try:
-      self._make_pot_file()
-      self._ensure_no_duplicates_in_pot_file()
-      self._make_all_po_files()
-    finally:
-      if not self._keep_pot:
-        self._maybe_remove_pot_file()
+    pot_content = self._make_pot_content()
 
-  def _make_pot_file(self) -> None:
+    if self._keep_pot:
+      self._write_translations_file(
+        file_path=self._pot_file_path,
+        content=pot_content,
+      )
+    else:
+      self._maybe_remove_pot_file()
+
+    self._make_all_po_files(pot_content)
+
+  def _make_pot_content(self) -> str:
+    """
+    Extract messages into a catalog in memory, which is serialized once and
+    is not written to disk unless it has to be kept.
+
+    """
     if self._verbose:
       print_out("making '.pot' file")
 
-    self._maybe_remove_pot_file()
-
     sources_root_dir_path = Path(".")  # explicitly use relative path
 
-    for file_path in find_source_files_paths(
+    # paths are found lazily, so extraction starts before the whole tree
+    # is scanned
+    source_files_paths = iter_source_files_paths(
       root_dir_path=sources_root_dir_path,
       ignore_patterns=self._ignore_patterns,
       extensions=self._extensions,
       follow_links=self._follow_links,
       verbose=self._verbose,
-    ):
-      self._process_source_file(file_path)
+      use_gitignore=self._use_gitignore,
+    )
 
-  def _process_source_file(self, source_file_path: Path) -> None:
-    if self._verbose:
-      print_out(f"processing source '{stringify_path(source_file_path.absolute())}'")
+    catalog = Catalog()
+
+    if self._extractor == EXTRACTOR_NATIVE:
+      self._extract_translations_natively(source_files_paths, catalog)
+    elif self._cache_dir_path:
+      self._extract_translations_with_cache(source_files_paths, catalog)
+    else:
+      self._extract_translations_by_batches(source_files_paths, catalog)
+
+    content = catalog.serialize(no_wrap=self._no_wrap)
+
+    if self._use_msguniq:
+      content = self._extract_unique_messages(content)
+
+    return content
+
+  def _extract_translations_by_batches(
+    self,
+    source_files_paths: Iterable[Path],
+    catalog: Catalog,
+  ) -> None:
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=self._jobs) as executor:
+      batches = []
+      futures = []
+
+      try:
+        for batch in self._iter_batches(source_files_paths):
+          batches.append(batch)
+          futures.append(executor.submit(self._extract_translations, batch))
+
+        # results are consumed in the order of batches, so the content of
+        # the catalog does not depend on the order of their completion
+        for batch, future in zip(batches, futures):
+          content, warnings = future.result()
+
+          if self._verbose:
+            for file_path in batch:
+              print_out(f"processing source '{stringify_path(file_path.absolute())}'")
+
+          if warnings:
+            print_err(warnings)
+
+          self._add_translations_to_catalog(catalog, content)
+
+      except BaseException:
+        for future in futures:
+          future.cancel()
+        raise
+
+  def _iter_batches(self, source_files_paths: Iterable[Path]) -> Iterator[List[Path]]:
+    """
+    Group sorted paths into contiguous batches as soon as they are found.
+
+    As the number of files is not known in advance, batches start small to
+    keep all workers busy on small trees, and their size is doubled after
+    each round of batches up to the max batch size to reduce overhead on
+    large trees.
+
+    """
+    size = 1
+    batches_count = 0
+    batch = []
+
+    for file_path in source_files_paths:
+      batch.append(file_path)
+
+      if len(batch) >= size:
+        yield batch
+        batch = []
+
+        batches_count += 1
+        if batches_count % self._jobs == 0:
+          size = min(size * 2, self._batch_size)
+
+    if batch:
+      yield batch
 
-    content = extract_translations(
-      source_file_path=source_file_path,
+  def _extract_translations(self, source_files_paths: List[Path]) -> Tuple[str, str]:
+    return extract_translations(
+      source_files_paths=source_files_paths,
       domain=self._domain,
       keywords=self._keywords,
       no_wrap=self._no_wrap,
@@ -261,49 +443,285 @@ class ExtractCommandExecutor(BaseCommandExecutor):
       xgettext_extra_args=self._xgettext_extra_args,
     )
 
-    if content:
-      if self._pot_file_path.exists():
-        content = strip_translations_header(content)
-      else:
-        content = content.replace("charset=CHARSET", "charset=UTF-8")
+  def _extract_translations_with_cache(
+    self,
+    source_files_paths: Iterable[Path],
+    catalog: Catalog,
+  ) -> None:
+    """
+    Extract messages reusing messages cached for unchanged source files.
+
+    Files missing in the cache are extracted by batches, like without the
+    cache, and messages of each batch are split by files to be cached. As
+    cached messages lack a header, the header of the catalog is made instead
+    of taking it from ``xgettext``. Entries of files which were not processed
+    are evicted from the cache after extraction.
+
+    """
+    cache = ExtractionCache(
+      dir_path=self._cache_dir_path,
+      domain=self._domain,
+      keywords=self._keywords,
+      no_wrap=self._no_wrap,
+      no_location=self._no_location,
+      xgettext_extra_args=self._xgettext_extra_args,
+    )
+    cached_fragments: List[Tuple[Path, Optional[str]]] = []
+    keys: Dict[Path, str] = {}
 
-      self._write_translations_file(
-        file_path=self._pot_file_path,
-        content=content,
-        mode="a",
-      )
+    def iter_misses() -> Iterator[Path]:
+      for file_path in source_files_paths:
+        key = cache.make_key(file_path)
+        fragment = cache.get(key)
+        cached_fragments.append((file_path, fragment))
+
+        if fragment is None:
+          keys[file_path] = key
+          yield file_path
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=self._jobs) as executor:
+      futures = []
+
+      try:
+        for batch in self._iter_batches(iter_misses()):
+          futures.append(executor.submit(
+            self._extract_translations_of_batch,
+            cache,
+            batch,
+            [keys[x] for x in batch],
+          ))
 
-  def _ensure_no_duplicates_in_pot_file(self) -> None:
-    unique_messages = self._extract_unique_messages()
+        extracted_fragments = {}
+        for future in futures:
+          fragments, warnings = future.result()
 
-    self._write_translations_file(
-      file_path=self._pot_file_path,
-      content=unique_messages,
-      mode="w",
+          if warnings:
+            print_err(warnings)
+
+          extracted_fragments.update(fragments)
+
+      except BaseException:
+        for future in futures:
+          future.cancel()
+        raise
+
+    for file_path, fragment in cached_fragments:
+      is_hit = fragment is not None
+      if not is_hit:
+        fragment = extracted_fragments[file_path]
+
+      if self._verbose:
+        status = "cached" if is_hit else "processing"
+        print_out(f"{status} source '{stringify_path(file_path.absolute())}'")
+
+      if fragment:
+        self._add_translations_to_catalog(catalog, fragment)
+
+    evicted_count = cache.prune()
+
+    if self._verbose:
+      misses_count = len(keys)
+      hits_count = len(cached_fragments) - misses_count
+      print_out(
+        f"extraction cache: {hits_count} hit(s), {misses_count} miss(es), "
+        f"{evicted_count} evicted"
+      )
+
+  def _extract_translations_of_batch(
+    self,
+    cache: ExtractionCache,
+    source_files_paths: List[Path],
+    keys: List[str],
+  ) -> Tuple[Dict[Path, str], str]:
+    """
+    Extract messages of a batch of source files by a single run of
+    ``xgettext`` and put messages of each file into the cache. Returns
+    messages of each file without a header, along with warnings.
+
+    Locations of messages are always extracted, as they tell which files
+    messages belong to. If messages cannot be split by files anyway, e.g.,
+    due to extra args of ``xgettext``, files of the batch are extracted one by
+    one.
+
+    """
+    content, warnings = extract_translations(
+      source_files_paths=source_files_paths,
+      domain=self._domain,
+      keywords=self._keywords,
+      no_wrap=self._no_wrap,
+      no_location=False,
+      xgettext_extra_args=self._xgettext_extra_args,
     )
+    fragments = split_fragment(
+      content=content,
+      source_files_paths=source_files_paths,
+      no_location=self._no_location,
+      no_wrap=self._no_wrap,
+    )
+
+    if fragments is None:
+      fragments = {}
+      warnings = []
+
+      for file_path, key in zip(source_files_paths, keys):
+        file_fragments, file_warnings = self._extract_translations_of_batch(cache, [file_path], [key])
+        fragments.update(file_fragments)
+        warnings.append(file_warnings)
+
+      return fragments, "".join(warnings)
+
+    for file_path, key in zip(source_files_paths, keys):
+      cache.put(key, fragments[file_path])
+
+    return fragments, warnings
+
+  @staticmethod
+  def _add_translations_to_catalog(catalog: Catalog, content: str) -> None:
+    for message in parse_po_lines(content.splitlines()):
+      if message.is_header:
+        message.strings = [
+          message.strings[0].replace("charset=CHARSET", "charset=UTF-8")
+        ]
+
+      catalog.add(message)
+
+  def _extract_translations_natively(
+    self,
+    source_files_paths: Iterable[Path],
+    catalog: Catalog,
+  ) -> None:
+    """
+    Extract messages from Python sources in-process, using a pool of worker
+    processes for batches of files.
+
+    """
+    keywords = parse_keywords(self._keywords)
+    occurrences = []
+
+    if self._jobs > 1:
+      with concurrent.futures.ProcessPoolExecutor(max_workers=self._jobs) as executor:
+        batches = []
+        futures = []
+
+        try:
+          for batch in self._iter_batches(source_files_paths):
+            batches.append(batch)
+            futures.append(executor.submit(
+              extract_messages_from_files,
+              batch,
+              keywords,
+              defaults.COMMENT_TAG,
+            ))
+
+          results = (
+            (file_path, result)
+            for batch, future in zip(batches, futures)
+            for file_path, result in zip(batch, future.result())
+          )
+          self._collect_occurrences(results, occurrences)
+
+        except BaseException:
+          for future in futures:
+            future.cancel()
+          raise
+
+    else:
+      results = (
+        (file_path, extract_messages_from_file(file_path, keywords, defaults.COMMENT_TAG))
+        for file_path in source_files_paths
+      )
+      self._collect_occurrences(results, occurrences)
+
+    catalog.update(collect_messages(occurrences, no_location=self._no_location))
+
+  def _collect_occurrences(
+    self,
+    results: Iterable[Tuple[Path, Tuple[List[Occurrence], str]]],
+    occurrences: List[Tuple[Path, List[Occurrence]]],
+  ) -> None:
+
+    for file_path, (file_occurrences, warnings) in results:
+      if self._verbose:
+        print_out(f"processing source '{stringify_path(file_path.absolute())}'")
+
+      if warnings:
+        print_err(warnings)
+
+      occurrences.append((file_path, file_occurrences))
 
-  def _extract_unique_messages(self) -> str:
+  def _extract_unique_messages(self, pot_content: str) -> str:
     if self._verbose:
       print_out("extracting unique messages from '.pot' file")
 
     return extract_unique_messages(
-      pot_file_path=self._pot_file_path,
+      pot_content=pot_content,
       no_wrap=self._no_wrap,
       no_location=self._no_location,
       msguniq_extra_args=self._msguniq_extra_args,
     )
 
-  def _make_all_po_files(self) -> None:
+  def _make_all_po_files(self, pot_content: str) -> None:
+    """
+    Make '.po' files of locales in parallel. Reports of locales are printed
+    in the order of locales, so the output does not depend on the order of
+    their completion.
+
+    """
     if self._verbose:
       print_out("making '.po' files")
 
-    for locale in self._locales:
-      self._make_po_file_for_locale(locale=locale)
+    # native merging is CPU-bound, so it's done by a pool of processes,
+    # while threads run pipelines of locales
+    merge_executor = (
+      concurrent.futures.ProcessPoolExecutor(max_workers=self._jobs)
+      if self._merger == MERGER_NATIVE and self._jobs > 1 and len(self._locales) > 1
+      else None
+    )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=self._jobs) as executor:
+      futures = [
+        executor.submit(self._make_po_file_for_locale, locale, pot_content, merge_executor)
+        for locale in self._locales
+      ]
 
-  def _make_po_file_for_locale(self, locale: str) -> None:
-    if self._verbose:
-      print_out(f"processing locale '{locale}'")
+      try:
+        for locale, future in zip(self._locales, futures):
+          result = future.result()
+
+          if self._verbose:
+            print_out(f"processing locale '{locale}'")
+
+            if result.is_merged:
+              print_out("merging existing and new messages")
+
+            if result.is_cleaned:
+              print_out("removing obsolete translations")
 
+            print_out(f"writing to '{stringify_path(result.po_file_path)}' file")
+
+          if result.warnings:
+            print_err(result.warnings)
+
+      except BaseException:
+        for future in futures:
+          future.cancel()
+        raise
+
+      finally:
+        if merge_executor is not None:
+          merge_executor.shutdown(wait=True)
+
+  def _make_po_file_for_locale(
+    self,
+    locale: str,
+    pot_content: str,
+    merge_executor: Optional[concurrent.futures.Executor]=None,
+  ) -> LocaleResult:
+    """
+    Run the pipeline of a single locale. Does not print anything, so it's
+    safe to call from multiple threads.
+
+    """
     po_file_path = make_po_file_path(
       locales_dir_path=self._locales_dir_path,
       locale=locale,
@@ -312,57 +730,80 @@ class ExtractCommandExecutor(BaseCommandExecutor):
 
     ensure_dir_exists(po_file_path.parent)
 
-    if po_file_path.exists():
-      content = self._merge_new_and_existing_translations(po_file_path)
+    is_merged = po_file_path.exists()
+    is_cleaned = is_merged and self._no_obsolete
+    warnings = []
+
+    if is_merged and self._merger == MERGER_NATIVE:
+      content = self._merge_translations_natively(po_file_path, pot_content, merge_executor)
+
+    elif is_merged:
+      content, merge_warnings = self._merge_new_and_existing_translations(po_file_path, pot_content)
+      warnings.append(merge_warnings)
+
+      if is_cleaned:
+        content, clean_warnings = self._remove_obsolete_translations(content)
+        warnings.append(clean_warnings)
+
     else:
-      content = self._pot_file_path.read_text(encoding="utf-8")
+      # new files have no obsolete translations
+      content = pot_content
 
-    self._write_translations_file(
-      file_path=po_file_path,
-      content=content,
-      mode="w",
+    write_file_atomically(po_file_path, content.encode("utf-8"))
+
+    return LocaleResult(
+      po_file_path=po_file_path,
+      is_merged=is_merged,
+      is_cleaned=is_cleaned,
+      warnings="".join(warnings),
     )
 
-    if self._no_obsolete:
-      self._remove_obsolete_translations(po_file_path)
+  def _merge_translations_natively(
+    self,
+    po_file_path: Path,
+    pot_content: str,
+    merge_executor: Optional[concurrent.futures.Executor],
+  ) -> str:
 
-  def _merge_new_and_existing_translations(self, po_file_path: Path) -> str:
-    if self._verbose:
-      print_out("merging existing and new messages")
+    args = (
+      po_file_path,
+      pot_content,
+      None if self._no_fuzzy_matching else self._fuzzy_threshold,
+      self._no_obsolete,
+      self._no_location,
+      self._no_wrap,
+    )
+
+    if merge_executor is None:
+      return merge_po_file(*args)
 
+    return merge_executor.submit(merge_po_file, *args).result()
+
+  def _merge_new_and_existing_translations(self, po_file_path: Path, pot_content: str) -> Tuple[str, str]:
     return merge_new_and_existing_translations(
       po_file_path=po_file_path,
-      pot_file_path=self._pot_file_path,
+      pot_content=pot_content,
+      no_fuzzy_matching=self._no_fuzzy_matching,
       no_wrap=self._no_wrap,
       no_location=self._no_location,
       msgmerge_extra_args=self._msgmerge_extra_args,
     )
 
-  def _remove_obsolete_translations(self, file_path: Path) -> None:
-    if self._verbose:
-      print_out("removing obsolete translations")
-
-    remove_obsolete_translations(
-      po_file_path=file_path,
+  def _remove_obsolete_translations(self, po_content: str) -> Tuple[str, str]:
+    return remove_obsolete_translations(
+      po_content=po_content,
       no_wrap=self._no_wrap,
       no_location=self._no_location,
       msgattrib_extra_args=self._msgattrib_extra_args,
     )
 
-  def _write_translations_file(
-    self,
-    file_path: Path,
-    content=str,
-    mode=MODE,
-  ) -> None:
-
+  def _write_translations_file(self, file_path: Path, content: str) -> None:
     if self._verbose:
       print_out(f"writing to '{stringify_path(file_path)}' file")
 
-    # Force newlines to '\n' to work around
-    # https://savannah.gnu.org/bugs/index.php?52395
-    with file_path.open(mode, encoding="utf-8", newline="\n") as f:
-      f.write(content)
+    # content always has '\n' newlines, which are kept on all platforms to
+    # work around https://savannah.gnu.org/bugs/index.php?52395
+    write_file_atomically(file_path, content.encode("utf-8"))
 
   def _maybe_remove_pot_file(self) -> None:
     if self._pot_file_path.exists():
@@ -387,51 +828,8 @@ class ExtractCommand(BaseCommand):
       help=description,
       formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
-    parser.add_argument(
-      "-d", "--domain",
-      dest="domain",
-      default=defaults.DEFAULT_DOMAIN,
-      help="domain of message files",
-    )
-    parser.add_argument(
-      "-l", "--locale",
-      dest="locale",
-      action="append",
-      help=(
-        "create or update '.po' message files for the given locale(s), "
-        "ex: 'en_US'; can be specified multiple times"
-      ),
-    )
-    parser.add_argument(
-      "-a", "--all",
-      dest="all",
-      action="store_true",
-      default=False,
-      help="update all '.po' message files for all existing locales",
-    )
-    parser.add_argument(
-      "-o", "--output-dir",
-      dest="output_dir",
-      default=defaults.DEFAULT_LOCALE_DIR_NAME,
-      help="path to the directory where locales will be stored, a.k.a. 'locale dir'",
-    )
-    parser.add_argument(
-      "-k", "--keyword",
-      action="append",
-      dest="keyword",
-      help="extra keyword to look for, ex: 'L_'; can be specified multiple times",
-    )
-    parser.add_argument(
-      "--no-default-keywords",
-      action="store_true",
-      dest="no_default_keywords",
-      default=False,
-      help=(
-        "do not use default keywords as {{{:}}}".format(
-          ", ".join(map(repr, defaults.DEFAULT_KEYWORDS))
-        )
-      ),
-    )
+    add_locales_arguments(parser)
+    add_keywords_arguments(parser)
     parser.add_argument(
       "-e", "--extension",
       dest="extensions",
@@ -441,64 +839,49 @@ class ExtractCommand(BaseCommand):
         "values with commas or specify the parameter multiple times"
       ),
     )
+    add_sources_arguments(parser)
+    add_output_arguments(parser)
     parser.add_argument(
-      "-s", "--links",
+      "--keep-pot",
       action="store_true",
-      dest="follow_links",
+      dest="keep_pot",
       default=False,
-      help=(
-        "follow links to files and directories when scanning sources for "
-        "translation strings"
-      ),
-    )
-    parser.add_argument(
-      "-i", "--ignore",
-      action="append",
-      dest="ignore_patterns",
-      metavar="PATTERN",
-      help=(
-        "extra glob-style patterns for ignoring files or directories; "
-        "can be specified multiple times"
-      ),
+      help="keep '.pot' file after creating '.po' files (useful for debugging)",
     )
     parser.add_argument(
-      "--no-default-ignore",
-      action="store_true",
-      dest="no_default_ignore_patterns",
-      default=False,
+      "--extractor",
+      dest="extractor",
+      choices=EXTRACTORS,
+      default=EXTRACTOR_XGETTEXT,
       help=(
-        "do not ignore the common glob-style patterns as {{{:}}}".format(
-          ", ".join(map(repr, defaults.DEFAULT_IGNORE_PATTERNS))
-        )
+        f"extractor to use: '{EXTRACTOR_XGETTEXT}' runs GNU 'xgettext' utility, "
+        f"'{EXTRACTOR_NATIVE}' parses Python sources in-process"
       ),
     )
+    add_merger_arguments(parser)
     parser.add_argument(
-      "--no-wrap",
-      action="store_true",
-      dest="no_wrap",
-      default=False,
-      help="do not break long message lines into several lines",
+      "-j", "--jobs",
+      type=int,
+      dest="jobs",
+      default=defaults.DEFAULT_JOBS,
+      help="number of batches of source files or of locales to process in parallel",
     )
     parser.add_argument(
-      "--no-location",
-      action="store_true",
-      dest="no_location",
-      default=False,
-      help="do not write location lines, ex: '#: filename:lineno'",
-    )
-    parser.add_argument(
-      "--no-obsolete",
-      action="store_true",
-      dest="no_obsolete",
-      default=False,
-      help="remove obsolete message strings",
+      "--batch-size",
+      type=int,
+      dest="batch_size",
+      default=defaults.DEFAULT_EXTRACT_BATCH_SIZE,
+      help="max number of source files passed to a single run of 'xgettext'",
     )
     parser.add_argument(
-      "--keep-pot",
-      action="store_true",
-      dest="keep_pot",
-      default=False,
-      help="keep '.pot' file after creating '.po' files (useful for debugging)",
+      "--cache-dir",
+      dest="cache_dir",
+      metavar="PATH",
+      help=(
+        "path to the directory for caching messages extracted from source "
+        "files, which makes extraction skip unchanged files; "
+        "caching is disabled if not specified"
+      ),
     )
     parser.add_argument(
       "--xgettext-extra-args",
@@ -514,10 +897,22 @@ class ExtractCommand(BaseCommand):
       action="append",
       dest="msguniq_extra_args",
       help=(
-        "extra arguments for 'msguniq' utility; "
+        "extra arguments for 'msguniq' utility, which is also run for the "
+        f"'{EXTRACTOR_NATIVE}' extractor if they are given; "
         "can be comma-separated or specified multiple times"
       ),
     )
+    parser.add_argument(
+      "--no-msguniq",
+      action="store_true",
+      dest="no_msguniq",
+      default=False,
+      help=(
+        f"do not run 'msguniq' utility for messages extracted by '{EXTRACTOR_XGETTEXT}' "
+        "and format them in-process instead; wrapping of long lines can differ "
+        "from the one of GNU gettext tools"
+      ),
+    )
     parser.add_argument(
       "--msgmerge-extra-args",
       action="append",
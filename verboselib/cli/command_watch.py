@@ -0,0 +1,642 @@
+import argparse
+import os
+import sys
+
+if sys.version_info >= (3, 9):
+  Dict  = dict
+  List  = list
+  Set   = set
+  Tuple = tuple
+else:
+  from typing import Dict
+  from typing import List
+  from typing import Set
+  from typing import Tuple
+
+from pathlib import Path
+from typing import Optional
+
+from .command_base import BaseCommand
+from .command_base import BaseCommandExecutor
+
+from .engines import ENGINE_MSGFMT
+from .engines import ENGINE_NATIVE
+from .engines import ENGINES
+from .engines import MERGER_MSGMERGE
+from .engines import MERGER_NATIVE
+
+from .extraction_args import add_keywords_arguments
+from .extraction_args import add_locales_arguments
+from .extraction_args import add_merger_arguments
+from .extraction_args import add_output_arguments
+from .extraction_args import add_sources_arguments
+from .extraction_args import handle_ignore_patterns
+from .extraction_args import handle_keywords
+from .extraction_args import handle_locales
+from .extraction_args import handle_locales_dir_path
+from .extraction_args import validate_domain
+from .extraction_args import validate_keywords
+from .extraction_args import validate_locales
+from .extraction_args import validate_locales_dir_path
+from .extraction_args import validate_merger
+
+from .extractor import collect_messages
+from .extractor import extract_messages_from_file
+from .extractor import parse_keywords
+from .extractor import Occurrence
+
+from .gettext_tools import compile_translations
+from .gettext_tools import merge_new_and_existing_translations
+from .gettext_tools import remove_obsolete_translations
+from .gettext_tools import validate_gettext_tools_exist
+
+from .manifest import make_compilation_key
+from .manifest import make_manifest_file_path
+from .manifest import CompileManifest
+
+from .merge import merge_po_file
+
+from .mo import compile_po_file
+
+from .paths import compile_ignore_patterns
+from .paths import ensure_dir_exists
+from .paths import is_source_file_path
+from .paths import iter_source_files_paths
+from .paths import make_mo_file_path
+from .paths import make_po_file_path
+from .paths import normalize_dir_patterns
+
+from .po import make_po_content
+from .po import Catalog
+from .po import Message
+
+from .text import stringify_path
+
+from .utils import print_err
+from .utils import print_out
+from .utils import show_usage_error_and_halt
+from .utils import write_file_atomically
+
+from .watcher import make_watcher
+from .watcher import wait_for_changes
+
+from . import defaults
+
+
+SOURCE_EXTENSIONS = {".py", }
+
+
+class WatchCommandExecutor(BaseCommandExecutor):
+  """
+  Keeps '.po' and '.mo' files up to date with sources while they are being
+  edited.
+
+  Messages of each source file are kept in memory, so only changed files
+  are parsed again. Locales are merged again only if messages have changed,
+  and only changed '.po' files are compiled again. As the state is kept
+  in-process, messages are extracted natively, while they are merged and
+  compiled by GNU gettext tools unless native engines are chosen.
+
+  """
+
+  def __init__(self, args=argparse.Namespace) -> None:
+    self._domain = args.domain
+    validate_domain(self._domain)
+
+    self._locales_dir_path = handle_locales_dir_path(args.output_dir)
+    validate_locales_dir_path(self._locales_dir_path)
+
+    self._locales = handle_locales(
+      locales=args.locale,
+      process_all=args.all,
+      locales_dir_path=self._locales_dir_path,
+    )
+    validate_locales(self._locales)
+
+    self._keywords = handle_keywords(
+      keywords=args.keyword,
+      no_defaults=args.no_default_keywords,
+    )
+    validate_keywords(self._keywords)
+    self._parsed_keywords = parse_keywords(self._keywords)
+
+    self._follow_links = args.follow_links
+    self._ignore_patterns = handle_ignore_patterns(
+      ignore_patterns=args.ignore_patterns,
+      no_defaults=args.no_default_ignore_patterns,
+    )
+    self._use_gitignore = args.use_gitignore
+    self._no_wrap = args.no_wrap
+    self._no_location = args.no_location
+    self._no_obsolete = args.no_obsolete
+
+    self._merger = args.merger
+    self._fuzzy_threshold = args.fuzzy_threshold
+    self._no_fuzzy_matching = args.no_fuzzy_matching
+    validate_merger(self._merger, self._fuzzy_threshold)
+
+    self._engine = args.engine
+    self._fuzzy = args.fuzzy
+
+    self._debounce = args.debounce
+    self._validate_positive_seconds("debounce delay", self._debounce)
+
+    self._use_polling = args.use_polling
+    self._poll_interval = args.poll_interval
+    self._validate_positive_seconds("poll interval", self._poll_interval)
+
+    self._verbose = args.verbose
+
+    self._occurrences: Dict[Path, List[Occurrence]] = {}
+    self._messages: List[Message] = []
+    self._messages_content: Optional[str] = None
+    self._manifest = None
+
+    # stats of '.po' files written by the command itself, so the watcher's
+    # reports of these writes are not processed again
+    self._written_files_stats: Dict[str, Tuple[int, int, int]] = {}
+
+  @staticmethod
+  def _validate_positive_seconds(name: str, value: float) -> None:
+    if value <= 0:
+      print_err(f"{name} must be positive (value={value})")
+      show_usage_error_and_halt()
+
+  def _get_required_gettext_tools(self) -> List[str]:
+    result = []
+
+    if self._merger == MERGER_MSGMERGE:
+      result.append("msgmerge")
+
+      if self._no_obsolete:
+        result.append("msgattrib")
+
+    if self._engine == ENGINE_MSGFMT:
+      result.append("msgfmt")
+
+    return result
+
+  def __call__(self) -> None:
+    validate_gettext_tools_exist(self._get_required_gettext_tools())
+
+    if self._verbose:
+      self._print_input_args(
+        domain=self._domain,
+        locales_dir_path=stringify_path(self._locales_dir_path),
+        locales=self._locales,
+        keywords=self._keywords,
+        follow_links=self._follow_links,
+        ignore_patterns=self._ignore_patterns,
+        use_gitignore=self._use_gitignore,
+        no_wrap=self._no_wrap,
+        no_location=self._no_location,
+        no_obsolete=self._no_obsolete,
+        merger=self._merger,
+        fuzzy_threshold=self._fuzzy_threshold,
+        no_fuzzy_matching=self._no_fuzzy_matching,
+        engine=self._engine,
+        fuzzy=self._fuzzy,
+        debounce=self._debounce,
+        use_polling=self._use_polling,
+        poll_interval=self._poll_interval,
+        verbose=self._verbose,
+      )
+
+    ensure_dir_exists(self._locales_dir_path)
+
+    self._manifest = CompileManifest.load(make_manifest_file_path(self._locales_dir_path))
+
+    match_ignored_dir = compile_ignore_patterns(normalize_dir_patterns(self._ignore_patterns))
+
+    # the watcher is started before the first update, so changes made
+    # during it are not missed
+    watcher = make_watcher(
+      dir_paths=self._get_watched_dirs_paths(match_ignored_dir),
+      extensions=SOURCE_EXTENSIONS | {".po", },
+      is_dir_ignored=lambda x: bool(match_ignored_dir and match_ignored_dir(x)),
+      use_polling=self._use_polling,
+      poll_interval=self._poll_interval,
+    )
+
+    with watcher:
+      self.update(changed_paths=None)
+
+      print_out("watching for changes, press Ctrl+C to stop")
+
+      try:
+        while True:
+          self.update(wait_for_changes(watcher, self._debounce))
+      except KeyboardInterrupt:
+        pass
+
+  def _get_watched_dirs_paths(self, match_ignored_dir) -> List[str]:
+    """
+    The dir of locales is watched on its own only if it's not a part of the
+    watched tree of sources, otherwise its files would be reported twice.
+
+    """
+    current_dir_path = os.path.abspath(os.curdir)
+    locales_dir_path = os.path.abspath(self._locales_dir_path)
+
+    try:
+      is_nested = os.path.commonpath([current_dir_path, locales_dir_path]) == current_dir_path
+    except ValueError:
+      # paths are on different drives
+      is_nested = False
+
+    if is_nested:
+      parts = Path(os.path.relpath(locales_dir_path, current_dir_path)).parts
+      is_nested = not (match_ignored_dir and any(match_ignored_dir(x) for x in parts))
+
+    if is_nested:
+      return [os.curdir, ]
+
+    return [os.curdir, stringify_path(self._locales_dir_path)]
+
+  def _is_written_file(self, file_path: str) -> bool:
+    stats = self._written_files_stats.pop(file_path, None)
+    if stats is None:
+      return False
+
+    try:
+      stat = os.stat(file_path)
+    except OSError:
+      return False
+
+    return stats == (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+  def update(self, changed_paths: Optional[Set[str]]) -> None:
+    """
+    Bring files up to date with changed files given by their absolute paths,
+    or with all files if ``changed_paths`` is ``None``. Files written by the
+    command itself are skipped unless they were changed again.
+
+    """
+    if changed_paths is not None:
+      changed_paths = {x for x in changed_paths if not self._is_written_file(x)}
+      if not changed_paths:
+        return
+
+    po_files_paths = set()
+
+    if self._update_messages(changed_paths):
+      po_files_paths.update(self._merge_locales())
+
+    for locale in self._locales:
+      po_file_path = self._make_po_file_path(locale)
+      if changed_paths is None or stringify_path(po_file_path) in changed_paths:
+        if po_file_path.exists():
+          po_files_paths.add(po_file_path)
+
+    self._compile(sorted(po_files_paths))
+
+  def _make_po_file_path(self, locale: str) -> Path:
+    return make_po_file_path(
+      locales_dir_path=self._locales_dir_path,
+      locale=locale,
+      domain=self._domain,
+    )
+
+  def _update_messages(self, changed_paths: Optional[Set[str]]) -> bool:
+    """
+    Extract messages from new and changed source files, reusing messages of
+    other files. Returns whether the set of messages has changed.
+
+    """
+    if changed_paths is not None and all(x.endswith(".po") for x in changed_paths):
+      return False
+
+    if changed_paths is None or any(
+      os.path.splitext(x)[1] not in SOURCE_EXTENSIONS | {".po", }
+      for x in changed_paths
+    ):
+      # directories were changed, so the tree is walked again to honor
+      # ignore rules for new and moved files
+      occurrences, is_changed = self._walk_sources(changed_paths)
+    else:
+      occurrences, is_changed = self._update_sources(changed_paths)
+
+    self._occurrences = occurrences
+
+    if not is_changed:
+      return False
+
+    messages = collect_messages(occurrences.items(), no_location=self._no_location)
+
+    # messages have no identity, so they are compared by their content
+    content = make_po_content(messages, no_wrap=self._no_wrap)
+    if content == self._messages_content:
+      return False
+
+    self._messages_content = content
+    self._messages = messages
+    return True
+
+  def _walk_sources(
+    self,
+    changed_paths: Optional[Set[str]],
+  ) -> Tuple[Dict[Path, List[Occurrence]], bool]:
+    """
+    Find source files by walking the tree and extract messages from new and
+    changed ones. Returns occurrences of messages by paths of files and
+    whether they have changed.
+
+    """
+    current_dir_path = os.getcwd()
+    occurrences = {}
+    extracted_count = 0
+
+    for file_path in iter_source_files_paths(
+      root_dir_path=Path(os.curdir),
+      ignore_patterns=self._ignore_patterns,
+      extensions=SOURCE_EXTENSIONS,
+      follow_links=self._follow_links,
+      verbose=False,
+      use_gitignore=self._use_gitignore,
+    ):
+      file_occurrences = self._occurrences.get(file_path)
+
+      if (
+           file_occurrences is None
+        or changed_paths is None
+        or os.path.join(current_dir_path, file_path) in changed_paths
+      ):
+        file_occurrences = self._extract_messages(file_path)
+        extracted_count += 1
+
+      occurrences[file_path] = file_occurrences
+
+    is_removed = any(x not in occurrences for x in self._occurrences)
+    return occurrences, bool(extracted_count or is_removed)
+
+  def _update_sources(
+    self,
+    changed_paths: Set[str],
+  ) -> Tuple[Dict[Path, List[Occurrence]], bool]:
+    """
+    Extract messages from changed source files only, dropping files which
+    were removed or are ignored. Returns occurrences of messages by paths of
+    files and whether they have changed.
+
+    """
+    current_dir_path = os.getcwd()
+    occurrences = dict(self._occurrences)
+    is_changed = False
+
+    for changed_path in changed_paths:
+      if not changed_path.endswith(tuple(SOURCE_EXTENSIONS)):
+        continue
+
+      file_path = Path(os.path.relpath(changed_path, current_dir_path))
+
+      if is_source_file_path(
+        file_path,
+        ignore_patterns=self._ignore_patterns,
+        extensions=SOURCE_EXTENSIONS,
+        follow_links=self._follow_links,
+        use_gitignore=self._use_gitignore,
+      ):
+        occurrences[file_path] = self._extract_messages(file_path)
+        is_changed = True
+
+      elif occurrences.pop(file_path, None) is not None:
+        is_changed = True
+
+    # keep the order of files found by walking the tree
+    occurrences = dict(sorted(occurrences.items(), key=lambda x: x[0].parts))
+    return occurrences, is_changed
+
+  def _extract_messages(self, file_path: Path) -> List[Occurrence]:
+    if self._verbose:
+      print_out(f"processing source '{os.path.join(os.getcwd(), file_path)}'")
+
+    occurrences, warnings = extract_messages_from_file(
+      file_path,
+      self._parsed_keywords,
+      defaults.COMMENT_TAG,
+    )
+    if warnings:
+      print_err(warnings)
+
+    return occurrences
+
+  def _merge_locales(self) -> List[Path]:
+    """
+    Merge new messages into '.po' files of all locales. Files whose content
+    stays the same are not written. Returns paths of written files.
+
+    A new '.pot' header is made each time, so the 'POT-Creation-Date' of
+    files is changed only when messages change.
+
+    """
+    catalog = Catalog()
+    catalog.update(self._messages)
+    pot_content = catalog.serialize(no_wrap=self._no_wrap)
+
+    result = []
+
+    for locale in self._locales:
+      po_file_path = self._make_po_file_path(locale)
+      ensure_dir_exists(po_file_path.parent)
+
+      if self._verbose:
+        print_out(f"processing locale '{locale}'")
+
+      if po_file_path.exists():
+        try:
+          content = self._merge_po_file(po_file_path, pot_content)
+        except (OSError, RuntimeError, ValueError) as e:
+          # a file being edited can be invalid for a while
+          print_err(f"failed to merge '{stringify_path(po_file_path)}': {e}")
+          continue
+      else:
+        content = pot_content
+
+      try:
+        is_unchanged = po_file_path.read_text(encoding="utf-8") == content
+      except (OSError, ValueError):
+        is_unchanged = False
+
+      if is_unchanged:
+        continue
+
+      if self._verbose:
+        print_out(f"writing to '{stringify_path(po_file_path)}' file")
+
+      write_file_atomically(po_file_path, content.encode("utf-8"))
+      result.append(po_file_path)
+
+      try:
+        stat = po_file_path.stat()
+      except OSError:
+        continue
+
+      self._written_files_stats[stringify_path(po_file_path.absolute())] = (
+        stat.st_ino, stat.st_size, stat.st_mtime_ns,
+      )
+
+    return result
+
+  def _merge_po_file(self, po_file_path: Path, pot_content: str) -> str:
+    if self._merger == MERGER_NATIVE:
+      return merge_po_file(
+        po_file_path=po_file_path,
+        pot_content=pot_content,
+        fuzzy_threshold=None if self._no_fuzzy_matching else self._fuzzy_threshold,
+        no_obsolete=self._no_obsolete,
+        no_location=self._no_location,
+        no_wrap=self._no_wrap,
+      )
+
+    content, warnings = merge_new_and_existing_translations(
+      po_file_path=po_file_path,
+      pot_content=pot_content,
+      no_fuzzy_matching=self._no_fuzzy_matching,
+      no_wrap=self._no_wrap,
+      no_location=self._no_location,
+      msgmerge_extra_args=[],
+    )
+    if warnings:
+      print_err(warnings)
+
+    if self._no_obsolete:
+      content, warnings = remove_obsolete_translations(
+        po_content=content,
+        no_wrap=self._no_wrap,
+        no_location=self._no_location,
+        msgattrib_extra_args=[],
+      )
+      if warnings:
+        print_err(warnings)
+
+    return content
+
+  def _compile(self, po_files_paths: List[Path]) -> None:
+    """
+    Compile '.po' files whose '.mo' files are not up to date. Files written
+    by merging are reported by the watcher afterwards, but are skipped then
+    as up to date.
+
+    """
+    is_changed = False
+
+    for po_file_path in po_files_paths:
+      mo_file_path = make_mo_file_path(po_file_path)
+
+      try:
+        key = make_compilation_key(
+          po_file_content=po_file_path.read_bytes(),
+          fuzzy=self._fuzzy,
+          msgfmt_extra_args=[],
+          engine=self._engine,
+        )
+      except OSError:
+        continue
+
+      if self._manifest.is_up_to_date(po_file_path, mo_file_path, key):
+        continue
+
+      if self._verbose:
+        print_out(f"compiling file '{stringify_path(po_file_path)}'")
+
+      try:
+        warnings = self._compile_po_file(mo_file_path, po_file_path)
+      except RuntimeError as e:
+        print_err(str(e))
+        continue
+
+      if warnings:
+        print_err(warnings)
+
+      self._manifest.update(po_file_path, mo_file_path, key)
+      is_changed = True
+
+    if is_changed:
+      self._manifest.save()
+
+  def _compile_po_file(self, mo_file_path: Path, po_file_path: Path) -> str:
+    if self._engine == ENGINE_NATIVE:
+      return compile_po_file(
+        mo_file_path=mo_file_path,
+        po_file_path=po_file_path,
+        fuzzy=self._fuzzy,
+      )
+
+    return compile_translations(
+      mo_file_path=mo_file_path,
+      po_file_path=po_file_path,
+      fuzzy=self._fuzzy,
+      msgfmt_extra_args=[],
+    )
+
+
+class WatchCommand(BaseCommand):
+  name = "watch"
+  aliases = ["w", ]
+  executor_class = WatchCommandExecutor
+
+  @classmethod
+  def make_parser(cls, factory=argparse.ArgumentParser) -> argparse.ArgumentParser:
+    description = (
+      "watch sources and '.po' files and keep '.po' and '.mo' files up to date"
+    )
+    parser = factory(
+      prog=cls.name,
+      description=description,
+      add_help=True,
+      help=description,
+      formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    add_locales_arguments(parser)
+    add_keywords_arguments(parser)
+    add_sources_arguments(parser)
+    add_output_arguments(parser)
+    add_merger_arguments(parser)
+    parser.add_argument(
+      "--engine",
+      dest="engine",
+      choices=ENGINES,
+      default=ENGINE_MSGFMT,
+      help=(
+        f"compiler of '.mo' files to use: '{ENGINE_MSGFMT}' runs GNU 'msgfmt' utility, "
+        f"'{ENGINE_NATIVE}' compiles files in-process"
+      ),
+    )
+    parser.add_argument(
+      "-f", "--use-fuzzy",
+      action="store_true",
+      dest="fuzzy",
+      default=False,
+      help="use fuzzy translations when compiling '.mo' files",
+    )
+    parser.add_argument(
+      "--debounce",
+      type=float,
+      dest="debounce",
+      metavar="SECONDS",
+      default=defaults.DEFAULT_WATCH_DEBOUNCE,
+      help="process changes after files stop changing for this number of seconds",
+    )
+    parser.add_argument(
+      "--polling",
+      action="store_true",
+      dest="use_polling",
+      default=False,
+      help="poll files for changes even if inotify is available",
+    )
+    parser.add_argument(
+      "--poll-interval",
+      type=float,
+      dest="poll_interval",
+      metavar="SECONDS",
+      default=defaults.DEFAULT_WATCH_POLL_INTERVAL,
+      help="number of seconds between checks of files when polling",
+    )
+    parser.add_argument(
+      "-v", "--verbose",
+      action="store_true",
+      dest="verbose",
+      default=False,
+      help="use verbose output",
+    )
+    return parser
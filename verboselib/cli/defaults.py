@@ -1,3 +1,6 @@
+import os
+
+
 DEFAULT_DOMAIN = "messages"
 
 DEFAULT_LOCALE_DIR_NAME = "locale"
@@ -20,3 +23,19 @@ DEFAULT_KEYWORDS = [
   "NP_:1c,2,3",  "npgettext:1c,2,3",
   "LNP_:1c,2,3", "npgettext_lazy:1c,2,3",
 ]
+
+# tag of comments for translators which are copied into '.po' files
+COMMENT_TAG = "Translators"
+
+DEFAULT_JOBS = os.cpu_count() or 1
+
+DEFAULT_EXTRACT_BATCH_SIZE = 500
+
+# min similarity of strings for using a translation of one for another
+DEFAULT_FUZZY_THRESHOLD = 0.6
+
+# seconds without changes after which changed files are processed at once
+DEFAULT_WATCH_DEBOUNCE = 0.3
+
+# seconds between walks over files when inotify is not available
+DEFAULT_WATCH_POLL_INTERVAL = 1.0
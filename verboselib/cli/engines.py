@@ -0,0 +1,21 @@
+"""
+Names of engines which commands can run: GNU gettext tools or native
+in-process implementations. They are kept apart from command modules, so
+commands can refer to engines of each other without importing them.
+
+"""
+
+ENGINE_MSGFMT = "msgfmt"
+ENGINE_NATIVE = "native"
+
+ENGINES = [ENGINE_MSGFMT, ENGINE_NATIVE, ]
+
+EXTRACTOR_XGETTEXT = "xgettext"
+EXTRACTOR_NATIVE = "native"
+
+EXTRACTORS = [EXTRACTOR_XGETTEXT, EXTRACTOR_NATIVE, ]
+
+MERGER_MSGMERGE = "msgmerge"
+MERGER_NATIVE = "native"
+
+MERGERS = [MERGER_MSGMERGE, MERGER_NATIVE, ]
@@ -0,0 +1,335 @@
+"""
+Arguments shared by commands which extract messages from sources into '.po'
+files: 'extract' and 'watch'.
+
+"""
+import argparse
+import sys
+
+if sys.version_info >= (3, 9):
+  from collections.abc import Iterable
+
+  List = list
+  Set  = set
+
+else:
+  from typing import Iterable
+  from typing import List
+  from typing import Set
+
+from pathlib import Path
+from typing import Optional
+
+from .engines import MERGER_MSGMERGE
+from .engines import MERGER_NATIVE
+from .engines import MERGERS
+
+from .extractor import parse_keywords
+
+from .paths import get_names_of_immediate_subdirectories
+
+from .text import flatten_comma_separated_values
+from .text import stringify_path
+
+from .utils import print_err
+from .utils import show_usage_error_and_halt
+
+from . import defaults
+
+
+def handle_keywords(
+  keywords: Optional[Iterable[str]]=None,
+  no_defaults: bool=False,
+) -> List[str]:
+
+  keywords = (
+    list(keywords)
+    if keywords is not None
+    else []
+  )
+
+  if not no_defaults:
+    keywords.extend(defaults.DEFAULT_KEYWORDS)
+
+  return list(sorted(set(keywords)))
+
+
+def validate_keywords(keywords: List[str]) -> None:
+  """
+  Check that keywords can be understood by the native extractor.
+
+  """
+  try:
+    parse_keywords(keywords)
+  except ValueError as e:
+    print_err(f"invalid keyword: {e}")
+    show_usage_error_and_halt()
+
+
+def handle_extensions(
+  extensions: Optional[Iterable[str]]=None,
+  ignored: Optional[Iterable[str]]=None,
+) -> Set[str]:
+
+  extensions = (
+    list(extensions)
+    if extensions is not None
+    else []
+  )
+
+  ignored = (
+    set(ignored)
+    if ignored is not None
+    else set()
+  )
+
+  ext_list = []
+
+  for ext in extensions:
+    ext_list.extend(ext.replace(" ", "").split(","))
+
+  for i, ext in enumerate(ext_list):
+    if not ext.startswith("."):
+      ext_list[i] = ".%s" % ext_list[i]
+
+  ext_list.append(".py")
+
+  return {
+    x
+    for x in ext_list
+    if x.strip(".") not in ignored
+  }
+
+
+def handle_ignore_patterns(
+  ignore_patterns: Optional[Iterable[str]]=None,
+  no_defaults: bool=False,
+) -> List[str]:
+
+  ignore_patterns = (
+    list(ignore_patterns)
+    if ignore_patterns is not None
+    else []
+  )
+
+  if not no_defaults:
+    ignore_patterns.extend(defaults.DEFAULT_IGNORE_PATTERNS)
+
+  return list(sorted(set(ignore_patterns)))
+
+
+def validate_domain(domain: Optional[str]) -> None:
+  if not domain:
+    print_err(f"invalid domain value: '{domain}'")
+    show_usage_error_and_halt()
+
+
+def handle_locales_dir_path(path: str) -> Path:
+  return Path(path).absolute()
+
+
+def validate_locales_dir_path(path: Path) -> None:
+  if path.exists() and not path.is_dir():
+    print_err(
+      f"locales dir already exists but it is not a directory "
+      f"(path={stringify_path(path)})"
+    )
+    show_usage_error_and_halt()
+
+
+def handle_locales(
+  locales: Optional[List[str]],
+  process_all: bool,
+  locales_dir_path: Path,
+) -> List[str]:
+
+  if locales:
+    return flatten_comma_separated_values(locales)
+  elif process_all:
+    return get_names_of_immediate_subdirectories(locales_dir_path)
+  else:
+    return []
+
+
+def validate_locales(locales: List[str]) -> None:
+  if not locales:
+    print_err(
+      "specify at least 1 locale or specify processing of all existing locales"
+    )
+    show_usage_error_and_halt()
+
+
+def validate_fuzzy_threshold(fuzzy_threshold: float) -> None:
+  if not (0 < fuzzy_threshold <= 1):
+    print_err(f"fuzzy threshold must be in range (0, 1] (value={fuzzy_threshold})")
+    show_usage_error_and_halt()
+
+
+def validate_merger(merger: str, fuzzy_threshold: float) -> None:
+  validate_fuzzy_threshold(fuzzy_threshold)
+
+  # 'msgmerge' has the same built-in threshold
+  if merger == MERGER_MSGMERGE and fuzzy_threshold != defaults.DEFAULT_FUZZY_THRESHOLD:
+    print_err(f"fuzzy threshold cannot be used with '{MERGER_MSGMERGE}' merger")
+    show_usage_error_and_halt()
+
+
+def add_locales_arguments(parser: argparse.ArgumentParser) -> None:
+  parser.add_argument(
+    "-d", "--domain",
+    dest="domain",
+    default=defaults.DEFAULT_DOMAIN,
+    help="domain of message files",
+  )
+  parser.add_argument(
+    "-l", "--locale",
+    dest="locale",
+    action="append",
+    help=(
+      "create or update '.po' message files for the given locale(s), "
+      "ex: 'en_US'; can be specified multiple times"
+    ),
+  )
+  parser.add_argument(
+    "-a", "--all",
+    dest="all",
+    action="store_true",
+    default=False,
+    help="update all '.po' message files for all existing locales",
+  )
+  parser.add_argument(
+    "-o", "--output-dir",
+    dest="output_dir",
+    default=defaults.DEFAULT_LOCALE_DIR_NAME,
+    help="path to the directory where locales will be stored, a.k.a. 'locale dir'",
+  )
+
+
+def add_keywords_arguments(parser: argparse.ArgumentParser) -> None:
+  parser.add_argument(
+    "-k", "--keyword",
+    action="append",
+    dest="keyword",
+    help="extra keyword to look for, ex: 'L_'; can be specified multiple times",
+  )
+  parser.add_argument(
+    "--no-default-keywords",
+    action="store_true",
+    dest="no_default_keywords",
+    default=False,
+    help=(
+      "do not use default keywords as {{{:}}}".format(
+        ", ".join(map(repr, defaults.DEFAULT_KEYWORDS))
+      )
+    ),
+  )
+
+
+def add_sources_arguments(parser: argparse.ArgumentParser) -> None:
+  parser.add_argument(
+    "-s", "--links",
+    action="store_true",
+    dest="follow_links",
+    default=False,
+    help=(
+      "follow links to files and directories when scanning sources for "
+      "translation strings"
+    ),
+  )
+  parser.add_argument(
+    "-i", "--ignore",
+    action="append",
+    dest="ignore_patterns",
+    metavar="PATTERN",
+    help=(
+      "extra glob-style patterns for ignoring files or directories; "
+      "can be specified multiple times"
+    ),
+  )
+  parser.add_argument(
+    "--no-default-ignore",
+    action="store_true",
+    dest="no_default_ignore_patterns",
+    default=False,
+    help=(
+      "do not ignore the common glob-style patterns as {{{:}}}".format(
+        ", ".join(map(repr, defaults.DEFAULT_IGNORE_PATTERNS))
+      )
+    ),
+  )
+  parser.add_argument(
+    "--gitignore",
+    action="store_true",
+    dest="use_gitignore",
+    default=False,
+    help=(
+      "also ignore files and directories matched by rules of '.gitignore' "
+      "files found in sources"
+    ),
+  )
+
+
+def add_output_arguments(parser: argparse.ArgumentParser) -> None:
+  parser.add_argument(
+    "--no-wrap",
+    action="store_true",
+    dest="no_wrap",
+    default=False,
+    help="do not break long message lines into several lines",
+  )
+  parser.add_argument(
+    "--no-location",
+    action="store_true",
+    dest="no_location",
+    default=False,
+    help="do not write location lines, ex: '#: filename:lineno'",
+  )
+  parser.add_argument(
+    "--no-obsolete",
+    action="store_true",
+    dest="no_obsolete",
+    default=False,
+    help="remove obsolete message strings",
+  )
+
+
+def add_fuzzy_matching_arguments(
+  parser: argparse.ArgumentParser,
+  fuzzy_threshold_help: str="min similarity of messages for fuzzy matching in range (0, 1]",
+) -> None:
+
+  parser.add_argument(
+    "--fuzzy-threshold",
+    type=float,
+    dest="fuzzy_threshold",
+    default=defaults.DEFAULT_FUZZY_THRESHOLD,
+    help=fuzzy_threshold_help,
+  )
+  parser.add_argument(
+    "--no-fuzzy-matching",
+    action="store_true",
+    dest="no_fuzzy_matching",
+    default=False,
+    help="do not use fuzzy matching when merging new messages into existing ones",
+  )
+
+
+def add_merger_arguments(parser: argparse.ArgumentParser) -> None:
+  parser.add_argument(
+    "--merger",
+    dest="merger",
+    choices=MERGERS,
+    default=MERGER_MSGMERGE,
+    help=(
+      f"merger of new messages into existing '.po' files to use: "
+      f"'{MERGER_MSGMERGE}' runs GNU 'msgmerge' utility, "
+      f"'{MERGER_NATIVE}' merges files in-process"
+    ),
+  )
+  add_fuzzy_matching_arguments(
+    parser,
+    fuzzy_threshold_help=(
+      f"min similarity of messages for fuzzy matching in range (0, 1]; "
+      f"can be changed only for '{MERGER_NATIVE}' merger"
+    ),
+  )
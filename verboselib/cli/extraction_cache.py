@@ -0,0 +1,216 @@
+import hashlib
+import json
+import sys
+
+if sys.version_info >= (3, 9):
+  Dict  = dict
+  List  = list
+  Set   = set
+  Tuple = tuple
+else:
+  from typing import Dict
+  from typing import List
+  from typing import Set
+  from typing import Tuple
+
+from pathlib import Path
+from typing import Optional
+
+from .po import format_message
+from .po import parse_po_lines
+from .po import Message
+from .text import stringify_path
+from .utils import write_file_atomically
+
+
+CACHE_VERSION = 1
+
+
+class ExtractionCache:
+  """
+  Persistent content-addressed storage of messages extracted from source
+  files.
+
+  A fragment of a '.pot' file extracted from a source file is stored under
+  a key made from the content of the file and from all options which affect
+  extraction, so a changed file or changed options result in a cache miss.
+  The path of the file is a part of the key only if locations of messages
+  are written.
+
+  Safe to use from multiple threads: entries are written atomically and
+  never modified.
+
+  Keys of entries which are read or written are remembered, so entries
+  which were not used by a run can be evicted by ``prune()`` after it.
+
+  """
+
+  def __init__(
+    self,
+    dir_path: Path,
+    domain: str,
+    keywords: List[str],
+    no_wrap: bool,
+    no_location: bool,
+    xgettext_extra_args: List[str],
+  ) -> None:
+    self._dir_path = dir_path
+    self._no_location = no_location
+    self._used_keys: Set[str] = set()
+    self._options = json.dumps([
+      CACHE_VERSION,
+      domain,
+      sorted(keywords),
+      no_wrap,
+      no_location,
+      xgettext_extra_args,
+    ]).encode("utf-8")
+
+  def make_key(self, source_file_path: Path) -> str:
+    h = hashlib.sha256(source_file_path.read_bytes())
+    h.update(b"\x00")
+    h.update(self._options)
+
+    if not self._no_location:
+      h.update(b"\x00")
+      h.update(stringify_path(source_file_path).encode("utf-8"))
+
+    return h.hexdigest()
+
+  def _make_entry_path(self, key: str) -> Path:
+    return self._dir_path / key[:2] / f"{key[2:]}.pot"
+
+  def get(self, key: str) -> Optional[str]:
+    try:
+      result = self._make_entry_path(key).read_text(encoding="utf-8")
+    except (OSError, ValueError):
+      return None
+
+    self._used_keys.add(key)
+    return result
+
+  def put(self, key: str, fragment: str) -> None:
+    path = self._make_entry_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_file_atomically(path, fragment.encode("utf-8"))
+
+    self._used_keys.add(key)
+
+  def prune(self) -> int:
+    """
+    Remove entries which were neither read nor written by this instance,
+    e.g., entries of changed or removed source files, so the cache keeps only
+    entries of the last run.
+
+    Returns the number of removed entries.
+
+    """
+    result = 0
+
+    try:
+      dirs_paths = [x for x in self._dir_path.iterdir() if x.is_dir()]
+    except OSError:
+      return result
+
+    for dir_path in dirs_paths:
+      for path in dir_path.iterdir():
+        if path.suffix != ".pot" or f"{dir_path.name}{path.stem}" in self._used_keys:
+          continue
+
+        try:
+          path.unlink()
+        except OSError:
+          continue
+
+        result += 1
+
+      try:
+        dir_path.rmdir()
+      except OSError:
+        pass  # not empty
+
+    return result
+
+
+def _get_reference_line_number(reference: str) -> int:
+  __, __, line_number = reference.rpartition(":")
+  return int(line_number) if line_number.isdigit() else 0
+
+
+def _copy_message(message: Message, references: List[str]) -> Message:
+  return Message(
+    id=message.id,
+    context=message.context,
+    id_plural=message.id_plural,
+    strings=list(message.strings),
+    flags=list(message.flags),
+    translator_comments=list(message.translator_comments),
+    extracted_comments=list(message.extracted_comments),
+    references=references,
+  )
+
+
+def split_fragment(
+  content: str,
+  source_files_paths: List[Path],
+  no_location: bool,
+  no_wrap: bool,
+) -> Optional[Dict[Path, str]]:
+  """
+  Split messages extracted from a batch of source files into fragments of
+  separate files by locations of messages. Messages of each fragment are
+  ordered by their first occurrence in its file, as if the file was
+  extracted alone, and headers are dropped.
+
+  Locations are dropped afterwards if ``no_location`` is set. Returns
+  ``None`` if a message cannot be attributed to files of the batch, e.g.,
+  if it has no locations.
+
+  """
+  file_names = {
+    stringify_path(x): x
+    for x in source_files_paths
+  }
+  messages: Dict[Path, List[Tuple[int, Message]]] = {x: [] for x in source_files_paths}
+
+  for message in parse_po_lines(content.splitlines()):
+    if message.is_header or message.is_obsolete:
+      continue
+
+    if len(source_files_paths) == 1:
+      messages[source_files_paths[0]].append((0, message))
+      continue
+
+    references: Dict[Path, List[str]] = {}
+    for reference in message.references:
+      file_path = file_names.get(reference.rpartition(":")[0])
+      if file_path is None:
+        return None
+
+      references.setdefault(file_path, []).append(reference)
+
+    if not references:
+      return None
+
+    # comments and flags of a message extracted from several files cannot
+    # be attributed to files, so all of them are kept in each fragment and
+    # they are united again when fragments are collected into a catalog
+    for file_path, file_references in references.items():
+      line_number = min(map(_get_reference_line_number, file_references))
+      messages[file_path].append((line_number, _copy_message(message, file_references)))
+
+  result = {}
+
+  for file_path, file_messages in messages.items():
+    file_messages.sort(key=lambda x: x[0])
+
+    if no_location:
+      for __, message in file_messages:
+        message.references = []
+
+    result[file_path] = "\n".join(
+      format_message(message, no_wrap)
+      for __, message in file_messages
+    ).strip("\n")
+
+  return result
@@ -0,0 +1,335 @@
+"""
+Extraction of messages from Python sources without external tools, which
+mimics ``xgettext``.
+
+"""
+import ast
+import sys
+
+if sys.version_info >= (3, 9):
+  from collections.abc import Iterable
+
+  Dict  = dict
+  List  = list
+  Tuple = tuple
+
+else:
+  from typing import Dict
+  from typing import Iterable
+  from typing import List
+  from typing import Tuple
+
+from pathlib import Path
+from typing import NamedTuple
+from typing import Optional
+
+from .formats import is_python_format
+from .po import Catalog
+from .po import Message
+from .text import stringify_path
+
+
+class KeywordSpec(NamedTuple):
+  """
+  A specification of a keyword in the format of ``xgettext``, e.g.,
+  'NP_:1c,2,3'. Positions of arguments are 0-based.
+
+  """
+  name:     str
+  singular: int
+  plural:   Optional[int]=None
+  context:  Optional[int]=None
+  total:    Optional[int]=None
+
+  @property
+  def min_args_count(self) -> int:
+    return 1 + max(
+      x
+      for x in [self.singular, self.plural, self.context]
+      if x is not None
+    )
+
+
+class Occurrence(NamedTuple):
+  context:          Optional[str]
+  id:               str
+  id_plural:        Optional[str]
+  line_number:      int
+  comments:         Tuple[str, ...]
+  is_python_format: bool
+
+
+KEYWORDS = Dict[str, List[KeywordSpec]]
+
+
+def parse_keyword_spec(value: str) -> KeywordSpec:
+  """
+  Parse a keyword specification, e.g., 'N_:1,2' or 'P_:1c,2'.
+
+  Raises ``ValueError`` if the specification is invalid.
+
+  """
+  name, __, args = value.partition(":")
+  name = name.strip()
+  if not name.isidentifier():
+    raise ValueError(f"invalid keyword name in '{value}'")
+
+  if not args:
+    return KeywordSpec(name=name, singular=0)
+
+  positions = []
+  context = None
+  total = None
+
+  for arg in args.split(","):
+    arg = arg.strip()
+
+    if arg.startswith("\""):
+      # an automatic comment, which is not supported
+      continue
+
+    suffix = arg[-1:]
+    if suffix in ("c", "t"):
+      arg = arg[:-1]
+
+    if not arg.isdigit() or int(arg) < 1:
+      raise ValueError(f"invalid argument number in '{value}'")
+
+    number = int(arg)
+
+    if suffix == "c":
+      context = number - 1
+    elif suffix == "t":
+      total = number
+    else:
+      positions.append(number - 1)
+
+  if not positions or len(positions) > 2:
+    raise ValueError(f"invalid number of arguments in '{value}'")
+
+  return KeywordSpec(
+    name=name,
+    singular=positions[0],
+    plural=positions[1] if len(positions) > 1 else None,
+    context=context,
+    total=total,
+  )
+
+
+def parse_keywords(values: Iterable[str]) -> KEYWORDS:
+  """
+  Parse keyword specifications into a mapping of names to their specs.
+
+  """
+  result = {}
+
+  for value in values:
+    spec = parse_keyword_spec(value)
+    result.setdefault(spec.name, []).append(spec)
+
+  return result
+
+
+def _get_function_name(node: ast.Call) -> Optional[str]:
+  func = node.func
+  if isinstance(func, ast.Name):
+    return func.id
+  if isinstance(func, ast.Attribute):
+    return func.attr
+  return None
+
+
+def _get_string(node: ast.AST) -> Optional[str]:
+  if isinstance(node, ast.Constant) and isinstance(node.value, str):
+    return node.value
+
+  if sys.version_info < (3, 8) and isinstance(node, ast.Str):
+    return node.s
+
+  return None
+
+
+def _find_spec(specs: List[KeywordSpec], args_count: int) -> Optional[KeywordSpec]:
+  for spec in specs:
+    if spec.total is not None:
+      if spec.total == args_count:
+        return spec
+    elif spec.min_args_count <= args_count:
+      return spec
+
+  return None
+
+
+class _CommentsFinder:
+  """
+  Finds comments with a tag which precede lines of code, like
+  ``xgettext --add-comments=TAG`` does it: a comment block starting from the
+  first line which begins with the tag and ending right before the code.
+
+  Lines are scanned backwards only from lines of found calls, and only if
+  the tag is present in the source at all, as tokenizing whole sources is
+  much slower than parsing them.
+
+  """
+
+  def __init__(self, source: bytes, tag: str) -> None:
+    self._tag = tag
+    self._lines = (
+      source.decode("utf-8", errors="replace").splitlines()
+      if tag.encode("utf-8") in source
+      else None
+    )
+
+  def find(self, line_number: int) -> Tuple[str, ...]:
+    if self._lines is None:
+      return ()
+
+    block = []
+
+    for i in range(line_number - 2, -1, -1):
+      line = self._lines[i].strip()
+      if not line:
+        continue
+      if not line.startswith("#"):
+        break
+      block.append(line[1:].strip())
+
+    block.reverse()
+
+    for i, comment in enumerate(block):
+      if comment.startswith(self._tag):
+        return tuple(block[i:])
+
+    return ()
+
+
+def extract_messages_from_source(
+  source: bytes,
+  keywords: KEYWORDS,
+  comment_tag: str,
+) -> List[Occurrence]:
+  """
+  Find occurrences of messages in a Python source in the order of their
+  appearance.
+
+  Raises ``SyntaxError`` if the source cannot be parsed.
+
+  """
+  tree = ast.parse(source)
+  comments_finder = _CommentsFinder(source, comment_tag)
+
+  calls = [
+    node
+    for node in ast.walk(tree)
+    if isinstance(node, ast.Call) and _get_function_name(node) in keywords
+  ]
+  calls.sort(key=lambda x: (x.lineno, x.col_offset))
+
+  result = []
+
+  for node in calls:
+    if any(isinstance(x, ast.Starred) for x in node.args):
+      continue
+
+    spec = _find_spec(keywords[_get_function_name(node)], len(node.args))
+    if spec is None:
+      continue
+
+    msgid = _get_string(node.args[spec.singular])
+    if not msgid:
+      continue
+
+    msgid_plural = None
+    if spec.plural is not None:
+      msgid_plural = _get_string(node.args[spec.plural])
+      if msgid_plural is None:
+        continue
+
+    context = None
+    if spec.context is not None:
+      context = _get_string(node.args[spec.context])
+      if context is None:
+        continue
+
+    result.append(Occurrence(
+      context=context,
+      id=msgid,
+      id_plural=msgid_plural,
+      line_number=node.args[spec.singular].lineno,
+      comments=comments_finder.find(node.lineno),
+      is_python_format=(
+           is_python_format(msgid)
+        or (msgid_plural is not None and is_python_format(msgid_plural))
+      ),
+    ))
+
+  return result
+
+
+def extract_messages_from_file(
+  file_path: Path,
+  keywords: KEYWORDS,
+  comment_tag: str,
+) -> Tuple[List[Occurrence], str]:
+  """
+  Find occurrences of messages in a Python source file.
+
+  Returns occurrences and warnings. Files which cannot be parsed are
+  skipped with a warning. Safe to run in worker processes.
+
+  """
+  try:
+    source = file_path.read_bytes()
+    return extract_messages_from_source(source, keywords, comment_tag), ""
+  except (SyntaxError, ValueError) as e:
+    line_number = getattr(e, "lineno", None) or 0
+    message = getattr(e, "msg", None) or str(e)
+    return [], f"{stringify_path(file_path)}:{line_number}: {message}, file is skipped"
+
+
+def extract_messages_from_files(
+  files_paths: List[Path],
+  keywords: KEYWORDS,
+  comment_tag: str,
+) -> List[Tuple[List[Occurrence], str]]:
+  """
+  Find occurrences of messages in a batch of Python source files, which
+  saves round trips to worker processes.
+
+  """
+  return [
+    extract_messages_from_file(x, keywords, comment_tag)
+    for x in files_paths
+  ]
+
+
+def collect_messages(
+  occurrences: Iterable[Tuple[Path, List[Occurrence]]],
+  no_location: bool,
+) -> List[Message]:
+  """
+  Merge occurrences found in files into unique messages of a '.pot' file,
+  ordered by their first occurrence.
+
+  """
+  catalog = Catalog()
+
+  for file_path, file_occurrences in occurrences:
+    file_name = stringify_path(file_path)
+
+    for occurrence in file_occurrences:
+      catalog.add(Message(
+        id=occurrence.id,
+        context=occurrence.context,
+        id_plural=occurrence.id_plural,
+        strings=["", ""] if occurrence.id_plural is not None else [""],
+        flags=["python-format"] if occurrence.is_python_format else [],
+        extracted_comments=list(occurrence.comments),
+        references=(
+          []
+          if no_location
+          else [f"{file_name}:{occurrence.line_number}"]
+        ),
+      ))
+
+  return list(catalog)
@@ -0,0 +1,117 @@
+"""
+Parsing of Python format strings, used for checking and guessing formats of
+messages.
+
+"""
+import re
+import string
+import sys
+
+if sys.version_info >= (3, 9):
+  List  = list
+  Tuple = tuple
+else:
+  from typing import List
+  from typing import Tuple
+
+from typing import Optional
+
+
+# a '%' directive of Python's 'printf'-style formatting
+_PYTHON_FORMAT_RE = re.compile(r"""
+  %
+  (?:\((?P<name>[^)]*)\))?
+  [#0 +-]*
+  (?:\*|\d+)?
+  (?:\.(?:\*|\d+))?
+  [hlL]?
+  (?P<type>[diouxXeEfFgGcrsa%])?
+""", re.VERBOSE)
+
+# conversion types which accept the same arguments
+_PYTHON_FORMAT_TYPE_GROUPS = {
+  "d": "i", "i": "i", "u": "i",
+  "o": "o", "x": "x", "X": "x",
+  "e": "f", "E": "f", "f": "f", "F": "f", "g": "f", "G": "f",
+  "c": "c",
+  "r": "s", "s": "s", "a": "s",
+}
+
+
+class FormatError(ValueError):
+  pass
+
+
+def parse_python_format(value: str) -> List[Tuple[Optional[str], str]]:
+  """
+  Get (name, type group) pairs of directives of a 'printf'-style string.
+
+  """
+  result = []
+  position = 0
+
+  while True:
+    position = value.find("%", position)
+    if position < 0:
+      break
+
+    match = _PYTHON_FORMAT_RE.match(value, position)
+    conversion = match.group("type")
+    if conversion is None:
+      raise FormatError("not a valid Python format string")
+
+    position = match.end()
+    if conversion == "%":
+      continue
+
+    result.append((match.group("name"), _PYTHON_FORMAT_TYPE_GROUPS[conversion]))
+
+  names = {name is None for name, __ in result}
+  if len(names) > 1:
+    raise FormatError("named and unnamed format specifications are mixed")
+
+  return result
+
+
+def parse_python_brace_format(value: str) -> List[str]:
+  """
+  Get names of arguments of replacement fields of a 'str.format()' string.
+
+  """
+  result = []
+  auto_index = 0
+
+  try:
+    for __, field_name, format_spec, __ in string.Formatter().parse(value):
+      if field_name is None:
+        continue
+
+      name = re.split(r"[.\[]", field_name, maxsplit=1)[0]
+      if not name:
+        name = str(auto_index)
+        auto_index += 1
+
+      result.append(name)
+
+      if format_spec and "{" in format_spec:
+        result.extend(parse_python_brace_format(format_spec))
+
+  except ValueError:
+    raise FormatError("not a valid Python brace format string") from None
+
+  return result
+
+
+def is_python_format(value: str) -> bool:
+  """
+  Guess whether a string is meant to be a 'printf'-style format string, like
+  ``xgettext`` does it: the string must be valid and have directives.
+
+  """
+  if "%" not in value:
+    return False
+
+  try:
+    return bool(parse_python_format(value))
+  except FormatError:
+    return False
@@ -2,11 +2,14 @@ import itertools
 import sys
 
 if sys.version_info >= (3, 9):
-  List = list
+  List  = list
+  Tuple = tuple
 else:
   from typing import List
+  from typing import Tuple
 
 from pathlib import Path
+from typing import Optional
 
 from .text import normalize_eols
 from .text import stringify_path
@@ -15,6 +18,8 @@ from .utils import find_executable
 from .utils import popen_wrapper
 from .utils import print_err
 
+from . import defaults
+
 
 GETTEXT_TOOLS_STATUS_OK = 0
 GETTEXT_TOOLS_EXECUTABLES = [
@@ -26,8 +31,8 @@ GETTEXT_TOOLS_EXECUTABLES = [
 ]
 
 
-def validate_gettext_tools_exist() -> None:
-  for executable_name in GETTEXT_TOOLS_EXECUTABLES:
+def validate_gettext_tools_exist(executable_names: List[str]=GETTEXT_TOOLS_EXECUTABLES) -> None:
+  for executable_name in executable_names:
     if find_executable(executable_name) is None:
       raise OSError(
         f"cannot find executable '{executable_name}': make sure you have GNU "
@@ -35,27 +40,38 @@ def validate_gettext_tools_exist() -> None:
       )
 
 
-def get_gettext_tool_output(args: List[str]) -> str:
-  content, errors, status = popen_wrapper(args)
+def run_gettext_tool(args: List[str], input: Optional[str]=None) -> Tuple[str, str]:
+  """
+  Run a gettext tool and return its output along with its warnings.
 
-  if errors:
-    if status != GETTEXT_TOOLS_STATUS_OK:
-      tool_name = args[0]
-      raise RuntimeError(
-        f"failed to run gettext tool '{tool_name}' (status={status}): "
-        f"{errors}"
-      )
-    else:
-      print_err(errors)
+  Does not print anything, so it's safe to call from multiple threads.
+
+  """
+  content, errors, status = popen_wrapper(args, input=input)
+
+  if errors and status != GETTEXT_TOOLS_STATUS_OK:
+    tool_name = args[0]
+    raise RuntimeError(
+      f"failed to run gettext tool '{tool_name}' (status={status}): "
+      f"{errors}"
+    )
 
   if content:
     content = normalize_eols(content)
 
+  return content, errors
+
+
+def get_gettext_tool_output(args: List[str], input: Optional[str]=None) -> str:
+  content, warnings = run_gettext_tool(args, input=input)
+
+  if warnings:
+    print_err(warnings)
+
   return content
 
 
 def _make_xgettext_args(
-  source_file_path: Path,
   domain: str,
   keywords: List[str],
   no_wrap: bool,
@@ -67,7 +83,7 @@ def _make_xgettext_args(
     "xgettext",
     "-d", domain,
     "--from-code=UTF-8",
-    "--add-comments=Translators",
+    f"--add-comments={defaults.COMMENT_TAG}",
     "--output=-",
   ]
 
@@ -82,29 +98,37 @@ def _make_xgettext_args(
   if extra_args:
     args.extend(extra_args)
 
-  args.append(stringify_path(source_file_path))
+  # paths of source files are passed via stdin
+  args.append("--files-from=-")
 
   return args
 
 
 def extract_translations(
-  source_file_path: Path,
+  source_files_paths: List[Path],
   domain: str,
   keywords: List[str],
   no_wrap: bool,
   no_location: bool,
   xgettext_extra_args: List[str],
-) -> str:
+) -> Tuple[str, str]:
+  """
+  Extract messages from a batch of source files by a single run of
+  ``xgettext``. Messages are ordered by their first occurrence in the files
+  taken in the given order.
+
+  Returns the extracted messages and warnings.
 
+  """
   args = _make_xgettext_args(
-    source_file_path=source_file_path,
     domain=domain,
     keywords=keywords,
     no_wrap=no_wrap,
     no_location=no_location,
     extra_args=xgettext_extra_args,
   )
-  return get_gettext_tool_output(args)
+  files_list = "".join(f"{stringify_path(x)}\n" for x in source_files_paths)
+  return run_gettext_tool(args, input=files_list)
 
 
 def strip_translations_header(translations: str) -> str:
@@ -118,7 +142,6 @@ def strip_translations_header(translations: str) -> str:
 
 
 def _make_msguniq_args(
-  pot_file_path: Path,
   no_wrap: bool,
   no_location: bool,
   extra_args: List[str],
@@ -138,30 +161,30 @@ def _make_msguniq_args(
   if extra_args:
     args.extend(extra_args)
 
-  args.append(stringify_path(pot_file_path))
+  # messages are passed via stdin
+  args.append("-")
 
   return args
 
 
 def extract_unique_messages(
-  pot_file_path: Path,
+  pot_content: str,
   no_wrap: bool,
   no_location: bool,
   msguniq_extra_args: List[str],
 ) -> str:
 
   args = _make_msguniq_args(
-    pot_file_path=pot_file_path,
     no_wrap=no_wrap,
     no_location=no_location,
     extra_args=msguniq_extra_args,
   )
-  return get_gettext_tool_output(args)
+  return get_gettext_tool_output(args, input=pot_content)
 
 
 def _make_msgmerge_args(
   po_file_path: Path,
-  pot_file_path: Path,
+  no_fuzzy_matching: bool,
   no_wrap: bool,
   no_location: bool,
   extra_args: List[str],
@@ -173,6 +196,9 @@ def _make_msgmerge_args(
     "--previous",
   ]
 
+  if no_fuzzy_matching:
+    args.append("--no-fuzzy-matching")
+
   if no_wrap:
     args.append("--no-wrap")
 
@@ -183,31 +209,38 @@ def _make_msgmerge_args(
     args.extend(extra_args)
 
   args.append(stringify_path(po_file_path))
-  args.append(stringify_path(pot_file_path))
+
+  # the template is passed via stdin
+  args.append("-")
 
   return args
 
 
 def merge_new_and_existing_translations(
   po_file_path: Path,
-  pot_file_path: Path,
+  pot_content: str,
+  no_fuzzy_matching: bool,
   no_wrap: bool,
   no_location: bool,
   msgmerge_extra_args: List[str],
-) -> str:
+) -> Tuple[str, str]:
+  """
+  Merge existing translations with a template passed as a string.
+
+  Returns merged translations and warnings.
 
+  """
   args = _make_msgmerge_args(
     po_file_path=po_file_path,
-    pot_file_path=pot_file_path,
+    no_fuzzy_matching=no_fuzzy_matching,
     no_wrap=no_wrap,
     no_location=no_location,
     extra_args=msgmerge_extra_args,
   )
-  return get_gettext_tool_output(args)
+  return run_gettext_tool(args, input=pot_content)
 
 
 def _make_msgattrib_args(
-  po_file_path: Path,
   no_wrap: bool,
   no_location: bool,
   extra_args: List[str],
@@ -227,31 +260,30 @@ def _make_msgattrib_args(
   if extra_args:
     args.extend(extra_args)
 
-  po_file_path_str = stringify_path(po_file_path)
-
-  args.extend([
-    "-o",
-    po_file_path_str,
-    po_file_path_str,
-  ])
+  # translations are passed via stdin and are returned via stdout
+  args.append("-")
 
   return args
 
 
 def remove_obsolete_translations(
-  po_file_path: Path,
+  po_content: str,
   no_wrap: bool,
   no_location: bool,
   msgattrib_extra_args: List[str],
-) -> str:
+) -> Tuple[str, str]:
+  """
+  Remove obsolete messages from translations passed as a string.
 
+  Returns the rest of translations and warnings.
+
+  """
   args = _make_msgattrib_args(
-    po_file_path=po_file_path,
     no_wrap=no_wrap,
     no_location=no_location,
     extra_args=msgattrib_extra_args,
   )
-  _ = get_gettext_tool_output(args)
+  return run_gettext_tool(args, input=po_content)
 
 
 def _make_msgfmt_args(
@@ -286,12 +318,16 @@ def compile_translations(
   po_file_path: Path,
   fuzzy: bool,
   msgfmt_extra_args: List[str],
-) -> None:
+) -> str:
+  """
+  Compile a '.po' file into a '.mo' file and return warnings of ``msgfmt``.
 
+  """
   args = _make_msgfmt_args(
     mo_file_path=mo_file_path,
     po_file_path=po_file_path,
     fuzzy=fuzzy,
     extra_args=msgfmt_extra_args,
   )
-  _ = get_gettext_tool_output(args)
+  _, warnings = run_gettext_tool(args)
+  return warnings
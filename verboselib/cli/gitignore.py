@@ -0,0 +1,185 @@
+"""
+Matching of paths against rules of '.gitignore' files.
+
+Supports the commonly used subset of the format: comments, negation by '!',
+rules for directories only ending with '/', rules anchored to the directory
+of a '.gitignore' file by a '/' in the middle or at the start, and '*', '?',
+'[...]' and '**' wildcards.
+
+"""
+import re
+import sys
+
+if sys.version_info >= (3, 9):
+  List  = list
+  Tuple = tuple
+else:
+  from typing import List
+  from typing import Tuple
+
+from pathlib import Path
+from typing import NamedTuple
+from typing import Optional
+
+
+GITIGNORE_FILE_NAME = ".gitignore"
+
+
+class GitIgnoreRule(NamedTuple):
+  regex:    str
+  negated:  bool
+  dir_only: bool
+
+
+def _translate_glob(pattern: str) -> str:
+  result = []
+  i = 0
+  n = len(pattern)
+
+  while i < n:
+    c = pattern[i]
+
+    if pattern.startswith("**/", i):
+      result.append("(?:.*/)?")
+      i += 3
+
+    elif pattern.startswith("/**", i) and i + 3 == n:
+      result.append("/.*")
+      i += 3
+
+    elif c == "*":
+      result.append("[^/]*")
+      i += 1
+
+    elif c == "?":
+      result.append("[^/]")
+      i += 1
+
+    elif c == "[":
+      # a ']' right after the opening bracket belongs to the set
+      end = pattern.find("]", i + 3 if pattern.startswith("[!", i) else i + 2)
+      if end == -1:
+        result.append(re.escape(c))
+        i += 1
+      else:
+        chars = pattern[i + 1:end]
+        if chars.startswith("!"):
+          chars = "^" + chars[1:]
+        chars = chars.replace("\\", "\\\\")
+        result.append(f"[{chars}]")
+        i = end + 1
+
+    elif c == "\\" and i + 1 < n:
+      result.append(re.escape(pattern[i + 1]))
+      i += 2
+
+    else:
+      result.append(re.escape(c))
+      i += 1
+
+  return "".join(result)
+
+
+def parse_gitignore_line(line: str) -> Optional[GitIgnoreRule]:
+  """
+  Parse a line of a '.gitignore' file into a rule, which matches paths
+  relative to the directory of the file, with '/' as a separator.
+
+  Returns ``None`` for blank lines and comments.
+
+  """
+  line = line.rstrip("\n")
+
+  # trailing spaces are ignored unless they are escaped
+  stripped = line.rstrip(" ")
+  if stripped.endswith("\\") and len(stripped) < len(line):
+    stripped += " "
+  line = stripped
+
+  if not line or line.startswith("#"):
+    return None
+
+  negated = line.startswith("!")
+  if negated:
+    line = line[1:]
+  elif line.startswith(("\\#", "\\!")):
+    line = line[1:]
+
+  dir_only = line.endswith("/")
+  line = line.rstrip("/")
+  if not line:
+    return None
+
+  is_anchored = "/" in line
+  line = line.lstrip("/")
+
+  regex = _translate_glob(line)
+  if not is_anchored:
+    regex = f"(?:.*/)?{regex}"
+
+  return GitIgnoreRule(regex=regex, negated=negated, dir_only=dir_only)
+
+
+class GitIgnore:
+  """
+  Rules of a single '.gitignore' file.
+
+  Rules are compiled into one regex for directories and one for files. As
+  the last matching rule wins, alternatives go in the reverse order of rules,
+  and the index of the matched alternative tells which rule has matched.
+
+  """
+
+  def __init__(self, rules: List[GitIgnoreRule]) -> None:
+    self._dirs_matcher = self._compile(rules)
+    self._files_matcher = self._compile([x for x in rules if not x.dir_only])
+
+  @staticmethod
+  def _compile(rules: List[GitIgnoreRule]) -> Tuple[Optional[re.Pattern], List[bool]]:
+    if not rules:
+      return None, []
+
+    rules = list(reversed(rules))
+    regex = re.compile("|".join(f"({x.regex})" for x in rules), re.DOTALL)
+
+    return regex, [x.negated for x in rules]
+
+  @classmethod
+  def from_lines(cls, lines: List[str]) -> "GitIgnore":
+    rules = [parse_gitignore_line(x) for x in lines]
+    return cls([x for x in rules if x is not None])
+
+  @classmethod
+  def from_file(cls, file_path: Path) -> Optional["GitIgnore"]:
+    """
+    Read rules of a '.gitignore' file. Returns ``None`` if the file does not
+    exist, cannot be read or has no rules.
+
+    """
+    try:
+      lines = file_path.read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+      return None
+
+    result = cls.from_lines(lines)
+    return result if result else None
+
+  def __bool__(self) -> bool:
+    return self._dirs_matcher[0] is not None
+
+  def match(self, relative_path: str, is_dir: bool) -> Optional[bool]:
+    """
+    Tell whether a path relative to the directory of the '.gitignore' file is
+    ignored. Returns ``None`` if no rule matches the path, which means that
+    rules of outer directories decide.
+
+    """
+    regex, negations = self._dirs_matcher if is_dir else self._files_matcher
+    if regex is None:
+      return None
+
+    match = regex.fullmatch(relative_path)
+    if match is None:
+      return None
+
+    return not negations[match.lastindex - 1]
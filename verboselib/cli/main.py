@@ -1,19 +1,74 @@
 import argparse
 import functools
+import importlib
+import sys
+
+if sys.version_info >= (3, 9):
+  List = list
+  Type = type
+else:
+  from typing import List
+  from typing import Type
+
+from typing import NamedTuple
+from typing import Optional
 
 from verboselib.version import VERSION
 
+from .command_base import BaseCommand
 from .utils import print_out
 
-from .command_compile import CompileCommand
-from .command_extract import ExtractCommand
+
+class CommandSpec(NamedTuple):
+  name:        str
+  aliases:     List[str]
+  module_name: str
+  class_name:  str
+
+
+# commands are imported only when they are needed, as their modules pull in
+# heavy dependencies, e.g., 'subprocess' and 'concurrent.futures'; names and
+# aliases must match ones of command classes
+COMMANDS = [
+  CommandSpec(name="extract", aliases=["x", ], module_name="command_extract", class_name="ExtractCommand"),
+  CommandSpec(name="compile", aliases=["c", ], module_name="command_compile", class_name="CompileCommand"),
+  CommandSpec(name="watch",   aliases=["w", ], module_name="command_watch",   class_name="WatchCommand"),
+]
+
+
+def load_command(spec: CommandSpec) -> Type[BaseCommand]:
+  module = importlib.import_module(f".{spec.module_name}", __package__)
+  return getattr(module, spec.class_name)
+
+
+def find_command(args: List[str]) -> Optional[CommandSpec]:
+  """
+  Find the command which is going to be run by the first positional
+  argument, as top-level options take no values.
+
+  """
+  name = next((x for x in args if not x.startswith("-")), None)
+
+  for spec in COMMANDS:
+    if name == spec.name or name in spec.aliases:
+      return spec
+
+  return None
 
 
 def show_version() -> None:
   print_out(f"verboselib {VERSION}")
 
 
-def make_parser() -> argparse.Namespace:
+def make_parser(commands: Optional[List[CommandSpec]]=None) -> argparse.ArgumentParser:
+  """
+  Make a parser of arguments with subparsers of given commands, or of all
+  commands if not specified.
+
+  """
+  if commands is None:
+    commands = COMMANDS
+
   parser = argparse.ArgumentParser(
     description="run a verboselib command",
     add_help=True,
@@ -30,29 +85,26 @@ def make_parser() -> argparse.Namespace:
     dest="command_name",
   )
 
-  extract_cmd_parser = ExtractCommand.make_parser(
-    factory=functools.partial(
-      subparsers.add_parser,
-      name=ExtractCommand.name,
-      aliases=ExtractCommand.aliases,
-    ),
-  )
-  extract_cmd_parser.set_defaults(executor_factory=ExtractCommand.make_executor)
-
-  compile_cmd_parser = CompileCommand.make_parser(
-    factory=functools.partial(
-      subparsers.add_parser,
-      name=CompileCommand.name,
-      aliases=CompileCommand.aliases,
-    ),
-  )
-  compile_cmd_parser.set_defaults(executor_factory=CompileCommand.make_executor)
+  for spec in commands:
+    command = load_command(spec)
+    command_parser = command.make_parser(
+      factory=functools.partial(
+        subparsers.add_parser,
+        name=command.name,
+        aliases=command.aliases,
+      ),
+    )
+    command_parser.set_defaults(executor_factory=command.make_executor)
 
   return parser
 
 
 def main():
-  parser = make_parser()
+  # only the command which is run is imported, while all of them are needed
+  # for the help of the tool and for reporting of unknown commands
+  command = find_command(sys.argv[1:])
+
+  parser = make_parser([command, ] if command is not None else None)
   args = parser.parse_args()
 
   if args.show_version:
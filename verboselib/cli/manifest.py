@@ -0,0 +1,135 @@
+import hashlib
+import json
+import sys
+
+if sys.version_info >= (3, 9):
+  Dict = dict
+  List = list
+else:
+  from typing import Dict
+  from typing import List
+
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+from .text import stringify_path
+from .utils import write_file_atomically
+
+
+MANIFEST_FILE_NAME = ".verboselib-compile.json"
+MANIFEST_VERSION = 1
+
+
+def make_manifest_file_path(locales_dir_path: Path) -> Path:
+  return locales_dir_path / MANIFEST_FILE_NAME
+
+
+def make_compilation_key(
+  po_file_content: bytes,
+  fuzzy: bool,
+  msgfmt_extra_args: List[str],
+  engine: str,
+) -> str:
+  """
+  Make a key which changes whenever the result of compilation can change.
+
+  """
+  h = hashlib.sha256(po_file_content)
+  h.update(b"\x00")
+  h.update(json.dumps([fuzzy, msgfmt_extra_args, engine]).encode())
+  return h.hexdigest()
+
+
+class CompileManifest:
+  """
+  Records of compiled '.po' files, used for skipping up-to-date ones.
+
+  Each '.po' file is mapped to its compilation key and to the size and the
+  modification time of its '.mo' file, so that a '.mo' file changed or
+  removed by something else is compiled again.
+
+  Not thread-safe: meant to be used only by the main thread.
+
+  """
+
+  def __init__(self, file_path: Path, entries: Optional[Dict[str, Dict[str, Any]]]=None) -> None:
+    self._file_path = file_path
+    self._entries = entries or {}
+    self._is_changed = False
+
+  @classmethod
+  def load(cls, file_path: Path) -> "CompileManifest":
+    """
+    Load a manifest. Missing, corrupted or outdated manifests are treated as
+    empty ones.
+
+    """
+    try:
+      with file_path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    except (OSError, ValueError):
+      return cls(file_path)
+
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+      return cls(file_path)
+
+    entries = data.get("files")
+    if not isinstance(entries, dict):
+      return cls(file_path)
+
+    return cls(file_path, entries)
+
+  def _make_entry_name(self, po_file_path: Path) -> str:
+    try:
+      return stringify_path(po_file_path.relative_to(self._file_path.parent))
+    except ValueError:
+      return stringify_path(po_file_path)
+
+  @staticmethod
+  def _stat_mo_file(mo_file_path: Path) -> Optional[List[int]]:
+    try:
+      stat = mo_file_path.stat()
+    except OSError:
+      return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+  def is_up_to_date(self, po_file_path: Path, mo_file_path: Path, key: str) -> bool:
+    entry = self._entries.get(self._make_entry_name(po_file_path))
+    if not isinstance(entry, dict) or entry.get("key") != key:
+      return False
+
+    mo_stat = self._stat_mo_file(mo_file_path)
+    return mo_stat is not None and entry.get("mo") == mo_stat
+
+  def update(self, po_file_path: Path, mo_file_path: Path, key: str) -> None:
+    name = self._make_entry_name(po_file_path)
+
+    mo_stat = self._stat_mo_file(mo_file_path)
+    if mo_stat is None:
+      self._entries.pop(name, None)
+    else:
+      self._entries[name] = {
+        "key": key,
+        "mo":  mo_stat,
+      }
+
+    self._is_changed = True
+
+  def save(self) -> None:
+    """
+    Write the manifest if it has changed. The file is replaced atomically.
+
+    """
+    if not self._is_changed:
+      return
+
+    data = {
+      "version": MANIFEST_VERSION,
+      "files":   dict(sorted(self._entries.items())),
+    }
+
+    content = json.dumps(data, indent=2) + "\n"
+    write_file_atomically(self._file_path, content.encode("utf-8"))
+
+    self._is_changed = False
@@ -0,0 +1,346 @@
+"""
+Merging of existing translations with new templates without external tools,
+which mimics ``msgmerge --previous``.
+
+"""
+import collections
+import difflib
+import re
+import sys
+
+if sys.version_info >= (3, 9):
+  from collections.abc import Iterable
+
+  Dict  = dict
+  List  = list
+  Tuple = tuple
+
+else:
+  from typing import Dict
+  from typing import Iterable
+  from typing import List
+  from typing import Tuple
+
+from pathlib import Path
+from typing import Optional
+
+from .po import make_po_content
+from .po import make_previous
+from .po import parse_po_lines
+from .po import read_po_file
+from .po import Message
+
+
+DEFAULT_PLURALS_COUNT = 2
+
+# fields of headers which are taken from templates
+_TEMPLATE_HEADER_FIELDS = ["Report-Msgid-Bugs-To", "POT-Creation-Date", ]
+
+_NPLURALS_RE = re.compile(r"nplurals\s*=\s*(\d+)")
+_CHARSET_RE = re.compile(r"charset=[^\s;]+")
+
+# max number of candidates which share most trigrams with a message and
+# whose similarity to it is computed exactly
+MAX_FUZZY_CANDIDATES = 20
+
+# max number of postings counted for a message: trigrams are taken from the
+# rarest ones, as frequent trigrams are shared by most of messages and do not
+# tell good candidates from bad ones
+MAX_FUZZY_POSTINGS = 5000
+
+
+def _make_trigrams(value: str) -> List[str]:
+  """
+  Get unique trigrams of a padded string in the order of their appearance,
+  which keeps the choice among equally good candidates stable.
+
+  """
+  value = f"  {value} "
+  return list(dict.fromkeys(value[i:i + 3] for i in range(len(value) - 2)))
+
+
+class FuzzyIndex:
+  """
+  Index of translated messages for finding the most similar message by an
+  id within the same context.
+
+  Candidates are preselected by the number of trigrams they share with the
+  id, and only the best of them are compared exactly, like ``msgmerge``
+  compares strings, instead of comparing every pair of messages.
+
+  """
+
+  def __init__(self, messages: Iterable[Message], threshold: float) -> None:
+    self._threshold = threshold
+    self._messages: List[Message] = []
+    self._postings: Dict[Tuple[Optional[str], str], List[int]] = {}
+
+    for message in messages:
+      if message.is_header or not message.is_translated:
+        continue
+
+      index = len(self._messages)
+      self._messages.append(message)
+
+      for trigram in _make_trigrams(message.id):
+        self._postings.setdefault((message.context, trigram), []).append(index)
+
+  def search(self, context: Optional[str], id: str) -> Optional[Message]:
+    counts = collections.Counter()
+    postings_count = 0
+
+    all_postings = [
+      postings
+      for postings in (
+        self._postings.get((context, trigram))
+        for trigram in _make_trigrams(id)
+      )
+      if postings
+    ]
+    all_postings.sort(key=len)
+
+    for postings in all_postings:
+      if counts and postings_count + len(postings) > MAX_FUZZY_POSTINGS:
+        break
+
+      counts.update(postings)
+      postings_count += len(postings)
+
+    if not counts:
+      return None
+
+    matcher = difflib.SequenceMatcher(None, autojunk=False)
+    matcher.set_seq2(id)
+
+    best_index = None
+    best_ratio = self._threshold
+
+    for index, __ in counts.most_common(MAX_FUZZY_CANDIDATES):
+      matcher.set_seq1(self._messages[index].id)
+
+      if (
+            matcher.real_quick_ratio() < best_ratio
+        or matcher.quick_ratio() < best_ratio
+      ):
+        continue
+
+      ratio = matcher.ratio()
+      if (
+           ratio > best_ratio
+        or (ratio == best_ratio and (best_index is None or index < best_index))
+      ):
+        best_index = index
+        best_ratio = ratio
+
+    if best_index is None:
+      return None
+
+    return self._messages[best_index]
+
+
+def _get_plurals_count(header: Optional[Message]) -> int:
+  if header is not None:
+    match = _NPLURALS_RE.search(header.strings[0])
+    if match:
+      return int(match.group(1))
+
+  return DEFAULT_PLURALS_COUNT
+
+
+def _merge_headers(definition: Optional[Message], reference: Optional[Message]) -> Optional[Message]:
+  """
+  Take the header of existing translations with fields of the template
+  which describe the template, and with UTF-8 charset, as merged
+  translations are always written in UTF-8.
+
+  """
+  if definition is None:
+    return reference
+
+  header = definition.strings[0]
+
+  if reference is not None:
+    for field in _TEMPLATE_HEADER_FIELDS:
+      match = re.search(rf"^{field}:.*$", reference.strings[0], re.MULTILINE)
+      if match:
+        header = re.sub(
+          rf"^{field}:.*$",
+          lambda __: match.group(),
+          header,
+          flags=re.MULTILINE,
+        )
+
+  header = _CHARSET_RE.sub("charset=UTF-8", header, count=1)
+
+  return Message(
+    id="",
+    strings=[header],
+    flags=definition.flags,
+    translator_comments=definition.translator_comments,
+    extracted_comments=definition.extracted_comments,
+  )
+
+
+def _adjust_strings(strings: List[str], is_plural: bool, plurals_count: int) -> Tuple[List[str], bool]:
+  """
+  Fit translations to the plurality of a template message. Returns new
+  translations and whether they have been changed.
+
+  """
+  if is_plural and len(strings) == 1:
+    return strings + [""] * (plurals_count - 1), True
+
+  if not is_plural and len(strings) > 1:
+    return strings[:1], True
+
+  return strings, False
+
+
+def _make_flags(reference: Message, is_fuzzy: bool) -> List[str]:
+  flags = [x for x in reference.flags if x != "fuzzy"]
+  if is_fuzzy:
+    flags.insert(0, "fuzzy")
+  return flags
+
+
+def merge_messages(
+  definitions: List[Message],
+  references: List[Message],
+  fuzzy_threshold: Optional[float],
+  no_location: bool=False,
+  no_wrap: bool=False,
+) -> List[Message]:
+  """
+  Merge existing translations with template messages like ``msgmerge
+  --previous`` does it.
+
+  Messages of the template keep their order, their extracted comments,
+  references and format flags, and get translations and translator comments
+  of existing messages with the same context and id. Other messages get
+  translations of the most similar existing messages, if fuzzy matching is
+  enabled by a threshold, and are marked as fuzzy with their previous ids.
+  Existing messages which are not used go to the end as obsolete ones.
+
+  """
+  definition_header = next((x for x in definitions if x.is_header), None)
+  reference_header = next((x for x in references if x.is_header), None)
+
+  plurals_count = _get_plurals_count(definition_header)
+
+  # non-obsolete messages take precedence over obsolete ones
+  exact_matches = {}
+  for definition in definitions:
+    if definition.is_header:
+      continue
+
+    key = (definition.context, definition.id)
+    existing = exact_matches.get(key)
+    if existing is None or existing.is_obsolete:
+      exact_matches[key] = definition
+
+  fuzzy_index = (
+    FuzzyIndex(definitions, fuzzy_threshold)
+    if fuzzy_threshold is not None
+    else None
+  )
+
+  used_ids = set()
+  result = []
+
+  header = _merge_headers(definition_header, reference_header)
+  if header is not None:
+    result.append(header)
+
+  for reference in references:
+    if reference.is_header:
+      continue
+
+    message = Message(
+      id=reference.id,
+      context=reference.context,
+      id_plural=reference.id_plural,
+      extracted_comments=reference.extracted_comments,
+      references=[] if no_location else reference.references,
+    )
+
+    definition = exact_matches.get((reference.context, reference.id))
+    if definition is not None:
+      strings, is_changed = _adjust_strings(definition.strings, reference.is_plural, plurals_count)
+      is_fuzzy = definition.is_fuzzy or (is_changed and any(strings))
+
+      message.strings = strings
+      message.translator_comments = definition.translator_comments
+      message.flags = _make_flags(reference, is_fuzzy)
+      message.previous = definition.previous if is_fuzzy else []
+
+      used_ids.add(id(definition))
+      result.append(message)
+      continue
+
+    definition = (
+      fuzzy_index.search(reference.context, reference.id)
+      if fuzzy_index is not None
+      else None
+    )
+    if definition is not None:
+      message.strings, __ = _adjust_strings(definition.strings, reference.is_plural, plurals_count)
+      message.translator_comments = definition.translator_comments
+      message.flags = _make_flags(reference, is_fuzzy=True)
+      message.previous = make_previous(definition, no_wrap=no_wrap)
+
+      used_ids.add(id(definition))
+      result.append(message)
+      continue
+
+    message.strings = [""] * (plurals_count if reference.is_plural else 1)
+    message.flags = _make_flags(reference, is_fuzzy=False)
+    result.append(message)
+
+  for definition in definitions:
+    if (
+         definition.is_header
+      or id(definition) in used_ids
+      or not definition.is_translated
+    ):
+      continue
+
+    result.append(Message(
+      id=definition.id,
+      context=definition.context,
+      id_plural=definition.id_plural,
+      strings=definition.strings,
+      flags=definition.flags,
+      translator_comments=definition.translator_comments,
+      previous=definition.previous,
+      is_obsolete=True,
+    ))
+
+  return result
+
+
+def merge_po_file(
+  po_file_path: Path,
+  pot_content: str,
+  fuzzy_threshold: Optional[float],
+  no_obsolete: bool,
+  no_location: bool,
+  no_wrap: bool,
+) -> str:
+  """
+  Merge translations of a '.po' file with a template passed as a string.
+
+  Returns merged translations, optionally without obsolete messages.
+
+  """
+  messages = merge_messages(
+    definitions=list(read_po_file(po_file_path)),
+    references=list(parse_po_lines(pot_content.splitlines())),
+    fuzzy_threshold=fuzzy_threshold,
+    no_location=no_location,
+    no_wrap=no_wrap,
+  )
+
+  if no_obsolete:
+    messages = [x for x in messages if not x.is_obsolete]
+
+  return make_po_content(messages, no_wrap=no_wrap)
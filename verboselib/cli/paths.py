@@ -1,16 +1,29 @@
 import fnmatch
 import os
+import re
 import sys
 
 if sys.version_info >= (3, 9):
-  List = list
-  Set  = list
+  from collections.abc import Callable
+  from collections.abc import Iterator
+
+  List  = list
+  Set   = set
+  Tuple = tuple
+
 else:
+  from typing import Callable
+  from typing import Iterator
   from typing import List
   from typing import Set
+  from typing import Tuple
 
 from pathlib import Path
+from typing import Any
+from typing import Optional
 
+from .gitignore import GITIGNORE_FILE_NAME
+from .gitignore import GitIgnore
 from .text import stringify_path
 from .utils import print_out
 
@@ -54,16 +67,8 @@ def ensure_dir_exists(path: Path) -> None:
   path.mkdir(parents=True, exist_ok=True)
 
 
-def is_path_ignored(path: Path, ignore_patterns: List[str]) -> bool:
-  for pattern in ignore_patterns:
-    if fnmatch.fnmatchcase(path.name, pattern):
-      return True
-  else:
-    return False
-
-
 def normalize_dir_patterns(patterns: List[str]) -> List[str]:
-  dir_suffix = "{os.sep}*"
+  dir_suffix = f"{os.sep}*"
   return [
     (
        p[:-len(dir_suffix)]
@@ -74,39 +79,194 @@ def normalize_dir_patterns(patterns: List[str]) -> List[str]:
   ]
 
 
-def find_source_files_paths(
+def compile_ignore_patterns(patterns: List[str]) -> Optional[Callable[[str], Any]]:
+  """
+  Compile glob-style patterns into a single regex matching names of files or
+  directories, so a name is matched once instead of once per pattern.
+
+  Returns ``None`` if there are no patterns.
+
+  """
+  if not patterns:
+    return None
+
+  return re.compile("|".join(fnmatch.translate(x) for x in patterns)).match
+
+
+def _scan_dir(dir_path: str) -> List[os.DirEntry]:
+  try:
+    with os.scandir(dir_path) as entries:
+      result = list(entries)
+  except OSError:
+    return []
+
+  result.sort(key=lambda x: x.name)
+  return result
+
+
+def _is_git_ignored(
+  gitignores: List[Tuple[str, GitIgnore]],
+  relative_path: str,
+  is_dir: bool,
+) -> bool:
+  # rules of inner directories take precedence over rules of outer ones
+  for prefix, gitignore in reversed(gitignores):
+    result = gitignore.match(relative_path[len(prefix):], is_dir)
+    if result is not None:
+      return result
+
+  return False
+
+
+def iter_source_files_paths(
   root_dir_path: Path,
   ignore_patterns: List[str],
   extensions: Set[str],
   follow_links: bool,
   verbose: bool,
-) -> List[Path]:
+  use_gitignore: bool=False,
+) -> Iterator[Path]:
+  """
+  Find source files by a depth-first walk over sorted entries of
+  directories, yielding paths lazily in their sorted order, so consumers can
+  start processing files while the tree is still being scanned.
+
+  Ignored directories are not entered. If ``use_gitignore`` is set, rules of
+  '.gitignore' files found in the tree are honored too, and '.git'
+  directories are skipped.
+
+  """
+  match_ignored_file = compile_ignore_patterns(ignore_patterns)
+  match_ignored_dir = compile_ignore_patterns(normalize_dir_patterns(ignore_patterns))
+
+  current_dir_path = os.getcwd() if verbose else ""
+
+  root = os.path.normpath(stringify_path(root_dir_path))
+  root_prefix = "" if root == os.curdir else os.path.join(root, "")
+
+  gitignores = []
+  if use_gitignore:
+    gitignore = GitIgnore.from_file(Path(root, GITIGNORE_FILE_NAME))
+    if gitignore:
+      gitignores.append(("", gitignore))
+
+  # each frame is (entries, prefix of paths, prefix of paths relative to the
+  # root with '/' separators, rules of '.gitignore' files)
+  stack = [(iter(_scan_dir(root)), root_prefix, "", gitignores)]
+
+  while stack:
+    entries, prefix, relative_prefix, gitignores = stack[-1]
+
+    entry = next(entries, None)
+    if entry is None:
+      stack.pop()
+      continue
+
+    path = prefix + entry.name
+    relative_path = relative_prefix + entry.name
+
+    try:
+      is_dir = entry.is_dir()
+    except OSError:
+      is_dir = False
+
+    if is_dir:
+      if (
+           (match_ignored_dir and match_ignored_dir(entry.name))
+        or (use_gitignore and entry.name == ".git")
+        or (gitignores and _is_git_ignored(gitignores, relative_path, is_dir=True))
+      ):
+        if verbose:
+          print_out(f"ignoring dir '{os.path.join(current_dir_path, path)}'")
+        continue
+
+      if not follow_links and entry.is_symlink():
+        continue
+
+      child_gitignores = gitignores
+      if use_gitignore:
+        gitignore = GitIgnore.from_file(Path(path, GITIGNORE_FILE_NAME))
+        if gitignore:
+          child_gitignores = gitignores + [(f"{relative_path}/", gitignore)]
+
+      stack.append((
+        iter(_scan_dir(path)),
+        path + os.sep,
+        f"{relative_path}/",
+        child_gitignores,
+      ))
+
+    elif (
+         (match_ignored_file and match_ignored_file(entry.name))
+      or (gitignores and _is_git_ignored(gitignores, relative_path, is_dir=False))
+    ):
+      if verbose:
+        print_out(f"ignoring file '{os.path.join(current_dir_path, path)}'")
+
+    elif os.path.splitext(entry.name)[1] in extensions:
+      yield Path(path)
+
+
+def is_source_file_path(
+  file_path: Path,
+  ignore_patterns: List[str],
+  extensions: Set[str],
+  follow_links: bool,
+  use_gitignore: bool=False,
+) -> bool:
+  """
+  Check whether a file given by its path relative to the current directory
+  would be found by walking the current directory with
+  ``iter_source_files_paths()``, without walking the tree.
+
+  """
+  parts = file_path.parts
+
+  if (
+       not parts
+    or file_path.is_absolute()
+    or parts[0] == os.pardir
+    or os.path.splitext(parts[-1])[1] not in extensions
+  ):
+    return False
 
-  result = []
+  match_ignored_file = compile_ignore_patterns(ignore_patterns)
+  match_ignored_dir = compile_ignore_patterns(normalize_dir_patterns(ignore_patterns))
 
-  walker = os.walk(
-    top=stringify_path(root_dir_path),
-    topdown=True,
-    followlinks=follow_links,
-  )
+  gitignores = []
+  if use_gitignore:
+    gitignore = GitIgnore.from_file(Path(os.curdir, GITIGNORE_FILE_NAME))
+    if gitignore:
+      gitignores.append(("", gitignore))
 
-  normalized_ignore_patterns = normalize_dir_patterns(ignore_patterns)
+  path = ""
+  relative_prefix = ""
 
-  for dir_path, dir_names, file_names in walker:
+  for name in parts[:-1]:
+    path = os.path.join(path, name)
+    relative_path = relative_prefix + name
 
-    for dir_name in dir_names[:]:
-      path = Path(os.path.normpath(os.path.join(dir_path, dir_name)))
-      if is_path_ignored(path, normalized_ignore_patterns):
-        dir_names.remove(dir_name)
-        if verbose:
-          print_out(f"ignoring dir '{stringify_path(path.absolute())}'")
+    if (
+         (match_ignored_dir and match_ignored_dir(name))
+      or (use_gitignore and name == ".git")
+      or (gitignores and _is_git_ignored(gitignores, relative_path, is_dir=True))
+      or (not follow_links and os.path.islink(path))
+    ):
+      return False
 
-    for file_name in file_names:
-      path = Path(os.path.normpath(os.path.join(dir_path, file_name)))
-      if is_path_ignored(path, ignore_patterns):
-        if verbose:
-          print_out(f"ignoring file '{stringify_path(path.absolute())}'")
-      elif path.suffix in extensions:
-        result.append(path)
+    if use_gitignore:
+      gitignore = GitIgnore.from_file(Path(path, GITIGNORE_FILE_NAME))
+      if gitignore:
+        gitignores = gitignores + [(f"{relative_path}/", gitignore)]
+
+    relative_prefix = f"{relative_path}/"
+
+  name = parts[-1]
+
+  if (
+       (match_ignored_file and match_ignored_file(name))
+    or (gitignores and _is_git_ignored(gitignores, relative_prefix + name, is_dir=False))
+  ):
+    return False
 
-  return list(sorted(result))
+  return os.path.isfile(file_path)
@@ -0,0 +1,673 @@
+"""
+Reading and writing of '.po' files.
+
+"""
+import datetime
+import itertools
+import re
+import sys
+
+if sys.version_info >= (3, 9):
+  from collections.abc import Iterable
+  from collections.abc import Iterator
+
+  Dict  = dict
+  List  = list
+  Set   = set
+  Tuple = tuple
+
+else:
+  from typing import Dict
+  from typing import Iterable
+  from typing import Iterator
+  from typing import List
+  from typing import Set
+  from typing import Tuple
+
+from pathlib import Path
+from typing import Optional
+
+from .text import stringify_path
+
+
+DEFAULT_CHARSET = "utf-8"
+
+PAGE_WIDTH = 79
+
+_CHARSET_RE = re.compile(rb"charset=([A-Za-z0-9_.:-]+)")
+_ESCAPE_RE = re.compile(r"""\\(?:([0-7]{1,3})|x([0-9A-Fa-f]+)|(.))""", re.DOTALL)
+_KEYWORD_RE = re.compile(r"(msgctxt|msgid_plural|msgid|msgstr)(?:\[(\d+)\])?\s*(\".*)")
+
+# opportunities to break lines: after spaces and between a letter and '%',
+# as Unicode line breaking algorithm used by GNU gettext tools allows it
+_LINE_BREAK_RE = re.compile(r"(?<= )(?=[^ ])|(?<=[A-Za-z])(?=%)")
+
+_ESCAPES = {
+  "\n":  "\\n",
+  "\t":  "\\t",
+  "\r":  "\\r",
+  "\a":  "\\a",
+  "\b":  "\\b",
+  "\f":  "\\f",
+  "\v":  "\\v",
+  "\\": "\\\\",
+  "\"": "\\\"",
+}
+_ESCAPES_RE = re.compile("[%s]" % re.escape("".join(_ESCAPES)))
+
+_SIMPLE_ESCAPES = {
+  "n":  "\n",
+  "t":  "\t",
+  "r":  "\r",
+  "a":  "\a",
+  "b":  "\b",
+  "f":  "\f",
+  "v":  "\v",
+  "\\": "\\",
+  "\"": "\"",
+  "'":  "'",
+  "?":  "?",
+}
+
+
+class POSyntaxError(ValueError):
+
+  def __init__(self, message: str, file_name: str="", line_number: int=0) -> None:
+    self.file_name = file_name
+    self.line_number = line_number
+    location = f"{file_name}:{line_number}: " if file_name else ""
+    super().__init__(f"{location}{message}")
+
+
+class Message:
+  """
+  A single entry of a '.po' file.
+
+  Translations are stored in ``strings``: it has a single item for regular
+  messages and an item per plural form for plural ones.
+
+  """
+
+  __slots__ = (
+    "context",
+    "id",
+    "id_plural",
+    "strings",
+    "flags",
+    "translator_comments",
+    "extracted_comments",
+    "references",
+    "previous",
+    "is_obsolete",
+    "line_number",
+  )
+
+  def __init__(
+    self,
+    id: str="",
+    context: Optional[str]=None,
+    id_plural: Optional[str]=None,
+    strings: Optional[List[str]]=None,
+    flags: Optional[List[str]]=None,
+    translator_comments: Optional[List[str]]=None,
+    extracted_comments: Optional[List[str]]=None,
+    references: Optional[List[str]]=None,
+    previous: Optional[List[str]]=None,
+    is_obsolete: bool=False,
+    line_number: int=0,
+  ) -> None:
+    self.context = context
+    self.id = id
+    self.id_plural = id_plural
+    self.strings = strings if strings is not None else [""]
+    self.flags = flags or []
+    self.translator_comments = translator_comments or []
+    self.extracted_comments = extracted_comments or []
+    self.references = references or []
+    self.previous = previous or []
+    self.is_obsolete = is_obsolete
+    self.line_number = line_number
+
+  def __repr__(self) -> str:
+    return f"<{self.__class__.__name__} context={self.context!r} id={self.id!r}>"
+
+  @property
+  def key(self) -> str:
+    """
+    The key of the message in '.mo' files: the context and the id separated
+    by EOT.
+
+    """
+    if self.context is None:
+      return self.id
+    return f"{self.context}\x04{self.id}"
+
+  @property
+  def is_header(self) -> bool:
+    return self.id == "" and self.context is None
+
+  @property
+  def is_plural(self) -> bool:
+    return self.id_plural is not None
+
+  @property
+  def is_fuzzy(self) -> bool:
+    return "fuzzy" in self.flags
+
+  @property
+  def is_translated(self) -> bool:
+    return bool(self.strings and self.strings[0])
+
+
+def unescape(value: str) -> str:
+  """
+  Unescape the content of a C string literal.
+
+  """
+  if "\\" not in value:
+    return value
+
+  def replace(match: re.Match) -> str:
+    octal, hexadecimal, char = match.groups()
+    if octal is not None:
+      return chr(int(octal, 8))
+    if hexadecimal is not None:
+      return chr(int(hexadecimal, 16))
+    return _SIMPLE_ESCAPES.get(char, "\\" + char)
+
+  return _ESCAPE_RE.sub(replace, value)
+
+
+def _parse_string(value: str, file_name: str, line_number: int) -> str:
+  value = value.strip()
+  if len(value) < 2 or value[0] != "\"" or value[-1] != "\"":
+    raise POSyntaxError("invalid string literal", file_name, line_number)
+  return unescape(value[1:-1])
+
+
+def detect_charset(content: bytes) -> str:
+  """
+  Find the charset declared in the header of a '.po' file.
+
+  """
+  match = _CHARSET_RE.search(content, 0, 4096)
+  if match is None:
+    return DEFAULT_CHARSET
+
+  charset = match.group(1).decode("ascii")
+  if charset.upper() == "CHARSET":
+    # the placeholder of template files
+    return DEFAULT_CHARSET
+
+  return charset
+
+
+class _MessageBuilder:
+
+  def __init__(self, file_name: str) -> None:
+    self._file_name = file_name
+    self._reset()
+
+  def _reset(self) -> None:
+    self._context = None
+    self._id = None
+    self._id_plural = None
+    self._strings = {}
+    self._flags = []
+    self._translator_comments = []
+    self._extracted_comments = []
+    self._references = []
+    self._previous = []
+    self._is_obsolete = False
+    self._line_number = 0
+
+    self._last_field = None
+    self._last_index = None
+
+  @property
+  def has_keywords(self) -> bool:
+    return self._id is not None or self._context is not None
+
+  def add_comment(self, line: str, line_number: int) -> Optional[Message]:
+    message = None
+    if self._strings:
+      # comments start a new message
+      message = self.build()
+
+    if line.startswith("#,"):
+      for flag in line[2:].split(","):
+        flag = flag.strip()
+        if flag and flag not in self._flags:
+          self._flags.append(flag)
+    elif line.startswith("#."):
+      self._extracted_comments.append(line[2:].strip())
+    elif line.startswith("#:"):
+      self._references.extend(line[2:].split())
+    elif line.startswith("#|"):
+      self._previous.append(line[2:].strip())
+    elif line.startswith("# ") or line == "#":
+      self._translator_comments.append(line[2:])
+    else:
+      self._translator_comments.append(line[1:])
+
+    return message
+
+  def add_keyword(
+    self,
+    keyword: str,
+    index: Optional[str],
+    value: str,
+    is_obsolete: bool,
+    line_number: int,
+  ) -> Optional[Message]:
+
+    message = None
+    if self._strings and keyword in ("msgctxt", "msgid"):
+      message = self.build()
+
+    if not self._line_number:
+      self._line_number = line_number
+
+    self._is_obsolete = is_obsolete
+    value = _parse_string(value, self._file_name, line_number)
+
+    if keyword == "msgctxt":
+      self._context = value
+    elif keyword == "msgid":
+      self._id = value
+    elif keyword == "msgid_plural":
+      self._id_plural = value
+    else:
+      if self._id is None:
+        raise POSyntaxError("missing 'msgid' before 'msgstr'", self._file_name, line_number)
+
+      index = int(index) if index is not None else 0
+      if index in self._strings:
+        raise POSyntaxError(f"duplicate 'msgstr[{index}]'", self._file_name, line_number)
+      self._strings[index] = value
+
+    self._last_field = keyword
+    self._last_index = index
+    return message
+
+  def add_continuation(self, value: str, line_number: int) -> None:
+    if self._last_field is None:
+      raise POSyntaxError("unexpected string literal", self._file_name, line_number)
+
+    value = _parse_string(value, self._file_name, line_number)
+
+    if self._last_field == "msgctxt":
+      self._context += value
+    elif self._last_field == "msgid":
+      self._id += value
+    elif self._last_field == "msgid_plural":
+      self._id_plural += value
+    else:
+      self._strings[self._last_index] += value
+
+  def build(self) -> Optional[Message]:
+    if not self.has_keywords:
+      self._reset()
+      return None
+
+    if self._id is None:
+      raise POSyntaxError("missing 'msgid'", self._file_name, self._line_number)
+
+    if not self._strings:
+      raise POSyntaxError("missing 'msgstr'", self._file_name, self._line_number)
+
+    strings = [self._strings.get(i, "") for i in range(max(self._strings) + 1)]
+
+    message = Message(
+      id=self._id,
+      context=self._context,
+      id_plural=self._id_plural,
+      strings=strings,
+      flags=self._flags,
+      translator_comments=self._translator_comments,
+      extracted_comments=self._extracted_comments,
+      references=self._references,
+      previous=self._previous,
+      is_obsolete=self._is_obsolete,
+      line_number=self._line_number,
+    )
+    self._reset()
+    return message
+
+
+def parse_po_lines(lines: Iterable[str], file_name: str="") -> Iterator[Message]:
+  """
+  Parse lines of a '.po' file into messages, including the header entry and
+  obsolete messages.
+
+  Messages are produced one by one while lines are consumed.
+
+  """
+  builder = _MessageBuilder(file_name)
+
+  for line_number, line in enumerate(lines, start=1):
+    line = line.strip()
+    if not line:
+      continue
+
+    is_obsolete = line.startswith("#~")
+    if is_obsolete:
+      line = line[2:].lstrip()
+      if not line:
+        continue
+
+      if line.startswith("|"):
+        # previous strings of an obsolete message
+        line = "#" + line
+
+    if line.startswith("#"):
+      message = builder.add_comment(line, line_number)
+
+    elif line.startswith("\""):
+      builder.add_continuation(line, line_number)
+      message = None
+
+    else:
+      match = _KEYWORD_RE.match(line)
+      if match is None:
+        raise POSyntaxError(f"unexpected line: {line!r}", file_name, line_number)
+
+      keyword, index, value = match.groups()
+      message = builder.add_keyword(keyword, index, value, is_obsolete, line_number)
+
+    if message is not None:
+      yield message
+
+  message = builder.build()
+  if message is not None:
+    yield message
+
+
+def read_po_file(file_path: Path) -> Iterator[Message]:
+  """
+  Read messages from a '.po' file using the charset declared in its header.
+
+  """
+  with file_path.open("rb") as f:
+    head = f.read(4096)
+
+  charset = detect_charset(head)
+
+  with file_path.open("r", encoding=charset, newline=None) as f:
+    yield from parse_po_lines(f, stringify_path(file_path))
+
+
+def find_duplicates(messages: Iterable[Message]) -> List[Message]:
+  """
+  Find non-obsolete messages which have the same context and id as previous
+  ones.
+
+  """
+  seen: Set[str] = set()
+  result = []
+
+  for message in messages:
+    if message.is_obsolete:
+      continue
+
+    key = message.key
+    if key in seen:
+      result.append(message)
+    else:
+      seen.add(key)
+
+  return result
+
+
+def escape(value: str) -> str:
+  """
+  Escape a string to be the content of a C string literal.
+
+  """
+  return _ESCAPES_RE.sub(lambda x: _ESCAPES[x.group()], value)
+
+
+def _wrap_text(text: str, width: int) -> List[str]:
+  """
+  Split escaped text into lines not longer than the width, if possible.
+  Words longer than the width are never split.
+
+  """
+  lines = []
+  line = ""
+
+  for word in _LINE_BREAK_RE.split(text):
+    if line and len(line) + len(word) > width:
+      lines.append(line)
+      line = word
+    else:
+      line += word
+
+  if line or not lines:
+    lines.append(line)
+
+  return lines
+
+
+def _format_string(keyword: str, value: str, prefix: str, no_wrap: bool) -> List[str]:
+  """
+  Format a keyword with its string like GNU gettext tools do it: strings
+  which have inner newlines or which are too long start with an empty
+  string on the line of the keyword and continue on the next lines.
+
+  """
+  parts = value.split("\n")
+  parts = [f"{x}\n" for x in parts[:-1]] + ([parts[-1]] if parts[-1] else [])
+
+  head = f"{prefix}{keyword} "
+
+  if len(parts) <= 1:
+    text = escape(value)
+    if no_wrap or len(head) + len(text) + 2 <= PAGE_WIDTH:
+      return [f"{head}\"{text}\""]
+
+  lines = [f"{head}\"\""]
+  width = PAGE_WIDTH - len(prefix) - 2
+
+  for part in parts:
+    text = escape(part)
+    chunks = [text] if no_wrap else _wrap_text(text, width)
+    lines.extend(f"{prefix}\"{x}\"" for x in chunks)
+
+  return lines
+
+
+def _format_references(references: List[str]) -> List[str]:
+  lines = []
+  line = "#:"
+
+  for reference in references:
+    if line != "#:" and len(line) + len(reference) + 1 > PAGE_WIDTH:
+      lines.append(line)
+      line = "#:"
+    line += f" {reference}"
+
+  lines.append(line)
+  return lines
+
+
+def format_message(message: Message, no_wrap: bool=False) -> str:
+  """
+  Format a message as an entry of a '.po' file, which ends with a newline.
+
+  """
+  lines = []
+
+  for comment in message.translator_comments:
+    lines.append(f"# {comment}" if comment else "#")
+
+  for comment in message.extracted_comments:
+    lines.append(f"#. {comment}" if comment else "#.")
+
+  if message.references:
+    lines.extend(_format_references(message.references))
+
+  if message.flags:
+    lines.append("#, " + ", ".join(message.flags))
+
+  prefix = "#~ " if message.is_obsolete else ""
+
+  previous_prefix = "#~| " if message.is_obsolete else "#| "
+  for previous in message.previous:
+    lines.append(f"{previous_prefix}{previous}")
+
+  if message.context is not None:
+    lines.extend(_format_string("msgctxt", message.context, prefix, no_wrap))
+
+  lines.extend(_format_string("msgid", message.id, prefix, no_wrap))
+
+  if message.is_plural:
+    lines.extend(_format_string("msgid_plural", message.id_plural, prefix, no_wrap))
+    for i, string in enumerate(message.strings):
+      lines.extend(_format_string(f"msgstr[{i}]", string, prefix, no_wrap))
+  else:
+    lines.extend(_format_string("msgstr", message.strings[0], prefix, no_wrap))
+
+  return "\n".join(lines) + "\n"
+
+
+def make_previous(message: Message, no_wrap: bool=False) -> List[str]:
+  """
+  Make lines of previous strings of a message, as ``msgmerge --previous``
+  writes them for fuzzy messages, without their '#| ' prefixes.
+
+  """
+  prefix = "#| "
+  lines = []
+
+  if message.context is not None:
+    lines.extend(_format_string("msgctxt", message.context, prefix, no_wrap))
+
+  lines.extend(_format_string("msgid", message.id, prefix, no_wrap))
+
+  if message.is_plural:
+    lines.extend(_format_string("msgid_plural", message.id_plural, prefix, no_wrap))
+
+  return [x[len(prefix):] for x in lines]
+
+
+def make_po_content(messages: Iterable[Message], no_wrap: bool=False) -> str:
+  """
+  Format messages as the content of a '.po' file.
+
+  """
+  return "\n".join(format_message(x, no_wrap) for x in messages)
+
+
+POT_PLURAL_FORMS = "Plural-Forms: nplurals=INTEGER; plural=EXPRESSION;\n"
+
+
+def make_pot_header(now: Optional[datetime.datetime]=None) -> Message:
+  """
+  Make the header entry of a '.pot' file the same way ``xgettext`` does it.
+
+  """
+  now = now or datetime.datetime.now().astimezone()
+  creation_date = now.strftime("%Y-%m-%d %H:%M%z")
+
+  fields = [
+    "Project-Id-Version: PACKAGE VERSION",
+    "Report-Msgid-Bugs-To: ",
+    f"POT-Creation-Date: {creation_date}",
+    "PO-Revision-Date: YEAR-MO-DA HO:MI+ZONE",
+    "Last-Translator: FULL NAME <EMAIL@ADDRESS>",
+    "Language-Team: LANGUAGE <LL@li.org>",
+    "Language: ",
+    "MIME-Version: 1.0",
+    "Content-Type: text/plain; charset=UTF-8",
+    "Content-Transfer-Encoding: 8bit",
+  ]
+
+  return Message(
+    id="",
+    strings=["".join(f"{x}\n" for x in fields)],
+    flags=["fuzzy"],
+    translator_comments=[
+      "SOME DESCRIPTIVE TITLE.",
+      "Copyright (C) YEAR THE PACKAGE'S COPYRIGHT HOLDER",
+      "This file is distributed under the same license as the PACKAGE package.",
+      "FIRST AUTHOR <EMAIL@ADDRESS>, YEAR.",
+      "",
+    ],
+  )
+
+
+def _merge_lists(target: List[str], source: List[str]) -> None:
+  for item in source:
+    if item not in target:
+      target.append(item)
+
+
+class Catalog:
+  """
+  An ordered collection of unique messages with a header, which is
+  accumulated in memory and serialized once.
+
+  Duplicates are merged like ``msguniq`` does it: their comments, references
+  and flags are united.
+
+  """
+
+  def __init__(self, header: Optional[Message]=None) -> None:
+    self.header = header
+    self._messages: Dict[Tuple[Optional[str], str], Message] = {}
+
+  def __len__(self) -> int:
+    return len(self._messages)
+
+  def __iter__(self) -> Iterator[Message]:
+    return iter(self._messages.values())
+
+  def add(self, message: Message) -> None:
+    if message.is_header:
+      if self.header is None:
+        self.header = message
+      return
+
+    key = (message.context, message.id)
+
+    existing = self._messages.get(key)
+    if existing is None:
+      self._messages[key] = message
+      return
+
+    if existing.id_plural is None and message.id_plural is not None:
+      existing.id_plural = message.id_plural
+      existing.strings = message.strings
+
+    _merge_lists(existing.translator_comments, message.translator_comments)
+    _merge_lists(existing.extracted_comments, message.extracted_comments)
+    _merge_lists(existing.references, message.references)
+    _merge_lists(existing.flags, message.flags)
+
+  def update(self, messages: Iterable[Message]) -> None:
+    for message in messages:
+      self.add(message)
+
+  @property
+  def has_plurals(self) -> bool:
+    return any(x.is_plural for x in self._messages.values())
+
+  def _make_header(self) -> Message:
+    header = self.header or make_pot_header()
+
+    if self.has_plurals and "Plural-Forms:" not in header.strings[0]:
+      header.strings = [header.strings[0] + POT_PLURAL_FORMS]
+
+    return header
+
+  def serialize(self, no_wrap: bool=False) -> str:
+    """
+    Make the content of a '.pot' file. The header is made if it is missing,
+    and it gets a 'Plural-Forms' template if there are plural messages.
+
+    """
+    return make_po_content(
+      itertools.chain([self._make_header()], self._messages.values()),
+      no_wrap=no_wrap,
+    )
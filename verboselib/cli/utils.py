@@ -1,6 +1,5 @@
 import functools
 import os
-import subprocess
 import sys
 
 if sys.version_info >= (3, 9):
@@ -14,6 +13,7 @@ else:
   from typing import List
   from typing import Tuple
 
+from pathlib import Path
 from typing import Optional
 
 
@@ -57,18 +57,24 @@ def find_executable(
   return None
 
 
-def popen_wrapper(args: List[str]) -> Tuple[str, str, int]:
+def popen_wrapper(args: List[str], input: Optional[str]=None) -> Tuple[str, str, int]:
   """
   Friendly wrapper for Popen.
 
-  Returns stdout output, stderr output and OS status code.
+  Passes input, if any, to stdin. Returns stdout output, stderr output and
+  OS status code.
 
   """
+  # imported here, as the module is used by the entry point of the tool,
+  # which must start fast
+  import subprocess
+
   is_windows = (os.name == "nt")
   try:
     p = subprocess.Popen(
       args,
       shell=False,
+      stdin=(subprocess.PIPE if input is not None else None),
       stdout=subprocess.PIPE,
       stderr=subprocess.PIPE,
       close_fds=(not is_windows),
@@ -76,7 +82,9 @@ def popen_wrapper(args: List[str]) -> Tuple[str, str, int]:
   except OSError as e:
     raise OSError(f"failed to execute '{args[0]}'") from e
   else:
-    output, errors = p.communicate()
+    output, errors = p.communicate(
+      input.encode("utf-8") if input is not None else None
+    )
     return (
       output.decode("utf-8"),
       errors.decode("utf-8"),
@@ -84,6 +92,56 @@ def popen_wrapper(args: List[str]) -> Tuple[str, str, int]:
     )
 
 
+def _read_umask() -> int:
+  # Linux reports umask of a process without changing it
+  try:
+    with open("/proc/self/status", "r") as f:
+      for line in f:
+        if line.startswith("Umask:"):
+          return int(line.split()[1], 8)
+  except (OSError, ValueError, IndexError):
+    pass
+
+  result = os.umask(0)
+  os.umask(result)
+  return result
+
+
+# umask is read once at import, before any threads or child processes are
+# started, as otherwise they could create files with a temporarily reset one
+_umask = _read_umask()
+
+
+def write_file_atomically(file_path: Path, content: bytes) -> None:
+  """
+  Write content to a temporary file and move it into place, so that readers
+  never see a partially written file.
+
+  """
+  import tempfile
+
+  # temporary files are created with owner-only permissions, so give the
+  # file permissions of the replaced one or the ones of a new file
+  try:
+    mode = os.stat(str(file_path)).st_mode & 0o7777
+  except FileNotFoundError:
+    mode = 0o666 & ~_umask
+
+  fd, tmp_path = tempfile.mkstemp(
+    prefix=f"{file_path.name}.",
+    suffix=".tmp",
+    dir=str(file_path.parent),
+  )
+  try:
+    with os.fdopen(fd, "wb") as f:
+      f.write(content)
+    os.chmod(tmp_path, mode)
+    os.replace(tmp_path, str(file_path))
+  except BaseException:
+    os.unlink(tmp_path)
+    raise
+
+
 def halt() -> None:
   sys.exit(ERROR_CODE)
 
@@ -0,0 +1,369 @@
+"""
+Watching of directories for changes of files: via inotify on Linux and by
+polling elsewhere.
+
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+
+if sys.version_info >= (3, 9):
+  from collections.abc import Callable
+  from collections.abc import Iterator
+
+  Dict  = dict
+  List  = list
+  Set   = set
+  Tuple = tuple
+
+else:
+  from typing import Callable
+  from typing import Dict
+  from typing import Iterator
+  from typing import List
+  from typing import Set
+  from typing import Tuple
+
+from typing import Optional
+
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM  = 0x00000040
+_IN_MOVED_TO    = 0x00000080
+_IN_CREATE      = 0x00000100
+_IN_DELETE      = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW  = 0x00004000
+_IN_IGNORED     = 0x00008000
+_IN_ONLYDIR     = 0x01000000
+_IN_ISDIR       = 0x40000000
+_IN_NONBLOCK    = 0o4000
+_IN_CLOEXEC     = 0o2000000
+
+_IN_WATCH_MASK = (
+    _IN_CLOSE_WRITE
+  | _IN_MOVED_FROM
+  | _IN_MOVED_TO
+  | _IN_CREATE
+  | _IN_DELETE
+  | _IN_DELETE_SELF
+  | _IN_ONLYDIR
+)
+
+_EVENT_STRUCT = struct.Struct("iIII")
+_EVENTS_BUFFER_SIZE = 64 * 1024
+
+
+def _iter_dirs(dir_path: str, is_dir_ignored: Callable[[str], bool]) -> Iterator[str]:
+  yield dir_path
+
+  try:
+    with os.scandir(dir_path) as entries:
+      subdirs = [
+        x.path
+        for x in entries
+        if x.is_dir(follow_symlinks=False) and not is_dir_ignored(x.name)
+      ]
+  except OSError:
+    return
+
+  for path in subdirs:
+    yield from _iter_dirs(path, is_dir_ignored)
+
+
+class PollingWatcher:
+  """
+  Detects changes by comparing modification times and sizes of files with
+  given extensions between walks over directories.
+
+  """
+
+  def __init__(
+    self,
+    dir_paths: List[str],
+    extensions: Set[str],
+    is_dir_ignored: Callable[[str], bool],
+    interval: float,
+  ) -> None:
+    self._dir_paths = [os.path.abspath(x) for x in dir_paths]
+    self._extensions = tuple(extensions)
+    self._is_dir_ignored = is_dir_ignored
+    self._interval = interval
+    self._snapshot = self._make_snapshot()
+
+  def _make_snapshot(self) -> Dict[str, Tuple[int, int]]:
+    result = {}
+
+    for root in self._dir_paths:
+      for dir_path in _iter_dirs(root, self._is_dir_ignored):
+        try:
+          with os.scandir(dir_path) as entries:
+            for entry in entries:
+              if not entry.name.endswith(self._extensions):
+                continue
+
+              try:
+                stat = entry.stat()
+              except OSError:
+                continue
+
+              result[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+        except OSError:
+          continue
+
+    return result
+
+  def wait(self, timeout: Optional[float]=None) -> Optional[Set[str]]:
+    """
+    Wait for changes at most for ``timeout`` seconds, or until they happen
+    if ``timeout`` is ``None``. Returns absolute paths of changed files,
+    which are empty if nothing has changed.
+
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    while True:
+      delay = self._interval
+      if deadline is not None:
+        delay = min(delay, max(0.0, deadline - time.monotonic()))
+
+      time.sleep(delay)
+
+      snapshot = self._make_snapshot()
+      changes = {
+        path
+        for path in snapshot.keys() | self._snapshot.keys()
+        if snapshot.get(path) != self._snapshot.get(path)
+      }
+      self._snapshot = snapshot
+
+      if changes or (deadline is not None and time.monotonic() >= deadline):
+        return changes
+
+  def close(self) -> None:
+    pass
+
+  def __enter__(self) -> "PollingWatcher":
+    return self
+
+  def __exit__(self, *args) -> None:
+    self.close()
+
+
+class InotifyWatcher:
+  """
+  Receives changes of files with given extensions from inotify, watching
+  all directories of given trees except ignored ones, including directories
+  created later.
+
+  """
+
+  _libc = None
+
+  @classmethod
+  def _get_libc(cls):
+    if cls._libc is None:
+      libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+      libc.inotify_init1.argtypes = [ctypes.c_int]
+      libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+      cls._libc = libc
+
+    return cls._libc
+
+  @classmethod
+  def is_available(cls) -> bool:
+    if not sys.platform.startswith("linux"):
+      return False
+
+    try:
+      libc = cls._get_libc()
+    except OSError:
+      return False
+
+    return hasattr(libc, "inotify_init1")
+
+  def __init__(
+    self,
+    dir_paths: List[str],
+    extensions: Set[str],
+    is_dir_ignored: Callable[[str], bool],
+  ) -> None:
+    self._libc = self._get_libc()
+    self._extensions = tuple(extensions)
+    self._is_dir_ignored = is_dir_ignored
+    self._dirs: Dict[int, str] = {}
+
+    self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    if self._fd < 0:
+      self._raise_os_error("inotify_init1")
+
+    try:
+      for root in dir_paths:
+        self._add_watches(os.path.abspath(root))
+    except BaseException:
+      self.close()
+      raise
+
+  @staticmethod
+  def _raise_os_error(name: str) -> None:
+    code = ctypes.get_errno()
+    raise OSError(code, f"{name}: {os.strerror(code)}")
+
+  def _add_watches(self, root: str) -> Set[str]:
+    """
+    Watch a tree of directories. Returns paths of files with watched
+    extensions found in it, as they can be created before the watches.
+
+    """
+    result = set()
+
+    for dir_path in _iter_dirs(root, self._is_dir_ignored):
+      wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dir_path), _IN_WATCH_MASK)
+      if wd < 0:
+        code = ctypes.get_errno()
+        # directories can disappear while they are being added
+        if code not in (errno.ENOENT, errno.ENOTDIR):
+          self._raise_os_error("inotify_add_watch")
+        continue
+
+      self._dirs[wd] = dir_path
+
+      try:
+        with os.scandir(dir_path) as entries:
+          result.update(
+            x.path
+            for x in entries
+            if x.name.endswith(self._extensions) and not x.is_dir()
+          )
+      except OSError:
+        pass
+
+    return result
+
+  def _read_events(self) -> Optional[Set[str]]:
+    changes = set()
+
+    while True:
+      try:
+        data = os.read(self._fd, _EVENTS_BUFFER_SIZE)
+      except BlockingIOError:
+        return changes
+
+      offset = 0
+      while offset < len(data):
+        wd, mask, __, length = _EVENT_STRUCT.unpack_from(data, offset)
+        offset += _EVENT_STRUCT.size
+        name = os.fsdecode(data[offset:offset + length].rstrip(b"\x00"))
+        offset += length
+
+        if mask & _IN_Q_OVERFLOW:
+          changes = None
+          continue
+
+        if mask & _IN_IGNORED:
+          self._dirs.pop(wd, None)
+          continue
+
+        dir_path = self._dirs.get(wd)
+        if dir_path is None or not name:
+          continue
+
+        path = os.path.join(dir_path, name)
+
+        if mask & _IN_ISDIR:
+          if self._is_dir_ignored(name):
+            continue
+
+          if mask & (_IN_CREATE | _IN_MOVED_TO):
+            files_paths = self._add_watches(path)
+            if changes is not None:
+              changes.update(files_paths)
+
+        elif not name.endswith(self._extensions):
+          continue
+
+        if changes is not None:
+          changes.add(path)
+
+  def wait(self, timeout: Optional[float]=None) -> Optional[Set[str]]:
+    """
+    Wait for changes at most for ``timeout`` seconds, or until they happen
+    if ``timeout`` is ``None``. Returns absolute paths of changed files and
+    directories, which are empty if nothing has changed, or ``None`` if
+    events were lost and anything could change.
+
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    while True:
+      remaining = None
+      if deadline is not None:
+        remaining = max(0.0, deadline - time.monotonic())
+
+      readable, __, __ = select.select([self._fd], [], [], remaining)
+      if not readable:
+        return set()
+
+      changes = self._read_events()
+      if changes is None or changes:
+        return changes
+
+  def close(self) -> None:
+    if self._fd >= 0:
+      os.close(self._fd)
+      self._fd = -1
+
+  def __enter__(self) -> "InotifyWatcher":
+    return self
+
+  def __exit__(self, *args) -> None:
+    self.close()
+
+
+def make_watcher(
+  dir_paths: List[str],
+  extensions: Set[str],
+  is_dir_ignored: Callable[[str], bool],
+  use_polling: bool,
+  poll_interval: float,
+):
+  """
+  Make an inotify watcher if it's available and is not disabled, or a
+  polling watcher otherwise, e.g., if the limit of inotify watches is hit.
+
+  """
+  if not use_polling and InotifyWatcher.is_available():
+    try:
+      return InotifyWatcher(dir_paths, extensions, is_dir_ignored)
+    except OSError:
+      pass
+
+  return PollingWatcher(dir_paths, extensions, is_dir_ignored, poll_interval)
+
+
+def wait_for_changes(watcher, debounce: float) -> Optional[Set[str]]:
+  """
+  Wait for changes and collect them until nothing changes for ``debounce``
+  seconds, so a burst of saves is handled at once.
+
+  Returns ``None`` if anything could change.
+
+  """
+  result = watcher.wait()
+
+  while True:
+    changes = watcher.wait(debounce)
+    if changes is not None and not changes:
+      return result
+
+    result = (
+      None
+      if result is None or changes is None
+      else result | changes
+    )
@@ -1,22 +1,178 @@
+import abc
+import contextvars
+import functools
+import sys
 import threading
 
+if sys.version_info >= (3, 9):
+  from collections.abc import Callable
+else:
+  from typing import Callable
+
+from typing import Any
 from typing import Optional
 
 from ._utils import export
 
 
-_bypass_value  = "__bypass__"
-_local_storage = threading.local()
+_bypass_value = "__bypass__"
+
+
+@export
+class LanguageState(abc.ABC):
+  """
+  Storage of the current and the default languages.
+
+  """
+
+  @abc.abstractmethod
+  def get_default_language(self) -> Optional[str]:
+    ...
+
+  @abc.abstractmethod
+  def set_default_language(self, value: Optional[str]) -> None:
+    ...
+
+  def drop_default_language(self) -> None:
+    self.set_default_language(None)
+
+  @abc.abstractmethod
+  def set_language(self, value: Optional[str]) -> None:
+    ...
+
+  def set_language_bypass(self) -> None:
+    self.set_language(_bypass_value)
+
+  def drop_language(self) -> None:
+    self.set_language(None)
+
+  @abc.abstractmethod
+  def get_language(self) -> Optional[str]:
+    ...
+
+  @abc.abstractmethod
+  def push_language(self, value: Optional[str]) -> Any:
+    """
+    Set the current language and return a token for restoring the previous one.
+
+    """
+
+  @abc.abstractmethod
+  def pop_language(self, token: Any) -> None:
+    """
+    Restore the current language which was set before a call to ``push_language()``.
+
+    """
+
+
+@export
+class ThreadLocalLanguageState(LanguageState):
+  """
+  Storage of languages which are local to threads.
+
+  All coroutines running on the same thread share the same values.
+
+  """
+
+  def __init__(self):
+    self._storage = threading.local()
+
+  def get_default_language(self) -> Optional[str]:
+    return getattr(self._storage, "default_value", None)
+
+  def set_default_language(self, value: Optional[str]) -> None:
+    setattr(self._storage, "default_value", value)
+
+  def set_language(self, value: Optional[str]) -> None:
+    setattr(self._storage, "current_value", value)
+
+  def get_language(self) -> Optional[str]:
+    storage = self._storage
+    language = getattr(storage, "current_value", None)
+
+    if language is _bypass_value:
+      return None
+
+    return language or getattr(storage, "default_value", None)
+
+  def push_language(self, value: Optional[str]) -> Any:
+    token = getattr(self._storage, "current_value", None)
+    self.set_language(value)
+    return token
+
+  def pop_language(self, token: Any) -> None:
+    self.set_language(token)
+
+
+@export
+class ContextVarLanguageState(LanguageState):
+  """
+  Storage of languages which are local to contexts of ``contextvars``.
+
+  Each ``asyncio`` task runs in its own copy of the context, so values set by
+  one task are not visible to other tasks, even if they run on the same
+  thread. Values set before a task is created are inherited by the task.
+
+  """
+
+  def __init__(self):
+    self._default_value = contextvars.ContextVar("verboselib_default_language", default=None)
+    self._current_value = contextvars.ContextVar("verboselib_current_language", default=None)
+
+  def get_default_language(self) -> Optional[str]:
+    return self._default_value.get()
+
+  def set_default_language(self, value: Optional[str]) -> None:
+    self._default_value.set(value)
+
+  def set_language(self, value: Optional[str]) -> None:
+    self._current_value.set(value)
+
+  def get_language(self) -> Optional[str]:
+    language = self._current_value.get()
+
+    if language is _bypass_value:
+      return None
+
+    return language or self._default_value.get()
+
+  def push_language(self, value: Optional[str]) -> Any:
+    return self._current_value.set(value)
+
+  def pop_language(self, token: Any) -> None:
+    self._current_value.reset(token)
+
+
+_state = ThreadLocalLanguageState()
+
+
+@export
+def get_language_state() -> LanguageState:
+  return _state
+
+
+@export
+def set_language_state(state: LanguageState) -> None:
+  """
+  Set the storage of languages used by module-level functions like
+  ``set_language()`` and by translations registries created without
+  an explicit ``language_state``.
+
+  Values stored in the previous storage are not carried over.
+
+  """
+  global _state
+  _state = state
 
 
 @export
 def get_default_language() -> Optional[str]:
-  return getattr(_local_storage, "default_value", None)
+  return _state.get_default_language()
 
 
 @export
 def set_default_language(value: Optional[str]) -> None:
-  setattr(_local_storage, "default_value", value)
+  _state.set_default_language(value)
 
 
 @export
@@ -26,7 +182,7 @@ def drop_default_language() -> None:
 
 @export
 def set_language(value: Optional[str]) -> None:
-  setattr(_local_storage, "current_value", value)
+  _state.set_language(value)
 
 
 @export
@@ -41,9 +197,55 @@ def drop_language() -> None:
 
 @export
 def get_language() -> Optional[str]:
-  language = getattr(_local_storage, "current_value", None)
+  return _state.get_language()
+
+
+@export
+class language:
+  """
+  Set the current language temporarily.
+
+  Can be used as a context manager or as a decorator of both regular and
+  coroutine functions. The previous value of the current language is
+  restored on exit. An instance used as a context manager is not reentrant,
+  while decorated functions can be called recursively and concurrently.
+
+  :param value: The language to set. Use ``None`` to drop the current
+                language.
+  :param state: The storage of languages. The global one is used if not
+                specified.
+
+  """
+
+  __slots__ = ("_value", "_state", "_entered_state", "_token", )
+
+  def __init__(self, value: Optional[str], state: Optional[LanguageState]=None):
+    self._value = value
+    self._state = state
+
+  def __enter__(self) -> None:
+    state = self._entered_state = self._state or _state
+    self._token = state.push_language(self._value)
+
+  def __exit__(self, *exc_info: Any) -> None:
+    self._entered_state.pop_language(self._token)
+
+  def __call__(self, func: Callable) -> Callable:
+    # 'inspect' is heavy to import, while it's needed only by decorators
+    import inspect
+
+    value, state = self._value, self._state
+
+    if inspect.iscoroutinefunction(func):
+      @functools.wraps(func)
+      async def wrapper(*args, **kwargs):
+        with language(value, state):
+          return await func(*args, **kwargs)
 
-  if language is _bypass_value:
-    return None
+    else:
+      @functools.wraps(func)
+      def wrapper(*args, **kwargs):
+        with language(value, state):
+          return func(*args, **kwargs)
 
-  return language or getattr(_local_storage, "default_value", None)
+    return wrapper
@@ -0,0 +1,283 @@
+"""
+Optional collection of metrics of translations registries: counters of
+lookups and of untranslated messages, histograms of load times of catalogs,
+and samples of untranslated messages.
+
+"""
+import bisect
+import random
+import sys
+import weakref
+
+if sys.version_info >= (3, 9):
+  from collections.abc import Callable
+  from collections.abc import Iterable
+
+  Dict  = dict
+  List  = list
+  Tuple = tuple
+
+else:
+  from typing import Callable
+  from typing import Dict
+  from typing import Iterable
+  from typing import List
+  from typing import Tuple
+
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+from ._utils import export
+
+
+DEFAULT_SAMPLE_RATE = 0.01
+DEFAULT_MAX_SAMPLES = 1000
+
+# seconds
+DEFAULT_LOAD_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, )
+
+METRIC_KIND_COUNTER   = "counter"
+METRIC_KIND_GAUGE     = "gauge"
+METRIC_KIND_HISTOGRAM = "histogram"
+
+
+@export
+class Metric(NamedTuple):
+  """
+  A single sample of a metric named in the style of Prometheus.
+
+  :param name:   Name of the sample, e.g., ``verboselib_lookups_total`` or
+                 ``verboselib_catalog_load_seconds_bucket``.
+  :param kind:   Kind of the metric the sample belongs to: ``counter``,
+                 ``gauge`` or ``histogram``.
+  :param labels: Labels of the sample, e.g., ``{"domain": "messages"}``.
+  :param value:  Value of the sample.
+
+  """
+  name:   str
+  kind:   str
+  labels: Dict[str, str]
+  value:  float
+
+
+@export
+class UntranslatedMessage(NamedTuple):
+  domain:   str
+  language: str
+  context:  Optional[str]
+  msgid:    str
+
+
+@export
+class Histogram:
+  """
+  Counts of observed values in buckets with fixed upper bounds, plus a bucket
+  for values exceeding all bounds.
+
+  """
+
+  __slots__ = ("bounds", "counts", "sum", "count", )
+
+  def __init__(self, bounds: Iterable[float]) -> None:
+    self.bounds = tuple(sorted(bounds))
+    self.counts = [0, ] * (len(self.bounds) + 1)
+    self.sum = 0.0
+    self.count = 0
+
+  def observe(self, value: float) -> None:
+    self.counts[bisect.bisect_left(self.bounds, value)] += 1
+    self.sum += value
+    self.count += 1
+
+  def get_cumulative_counts(self) -> List[Tuple[float, int]]:
+    """
+    Get numbers of values less than or equal to each bound, including
+    the infinite one, like buckets of Prometheus histograms.
+
+    """
+    result = []
+    total = 0
+
+    for bound, count in zip(self.bounds + (float("inf"), ), self.counts):
+      total += count
+      result.append((bound, total))
+
+    return result
+
+
+class _DomainStats:
+  """
+  Counters of a single translations registry, which are updated by its
+  lookups directly.
+
+  Counters are not synchronized between threads, so they are approximate
+  under concurrent usage.
+
+  """
+
+  __slots__ = ("domain", "lookups", "untranslated", "load_time", )
+
+  def __init__(self, domain: str, load_time_buckets: Iterable[float]) -> None:
+    self.domain = domain
+    self.lookups = 0
+    self.untranslated = 0
+    self.load_time = Histogram(load_time_buckets)
+
+
+@export
+class Instrumentation:
+  """
+  Collector of metrics of translations registries. Pass it to
+  ``verboselib.Translations`` via ``instrumentation`` argument. A single
+  instance can be shared by multiple registries, in which case metrics are
+  labeled by their domains.
+
+  Lookups of registries without instrumentation pay nothing for it. With
+  instrumentation, each lookup increments a counter and checks whether the
+  result is the original message by identity. Only untranslated messages are
+  sampled, and samples are bounded by their max number.
+
+  :param sample_rate:       Probability for an untranslated message to be
+                            sampled.
+  :param max_samples:       Max number of distinct sampled messages. Once the
+                            limit is reached, only counts of already sampled
+                            messages are updated.
+  :param load_time_buckets: Upper bounds of buckets of the histogram of load
+                            times of catalogs in seconds.
+  :param sinks:             Callables which receive metrics as a list of
+                            ``verboselib.Metric`` on ``export()``, e.g., for
+                            pushing them into a registry of a monitoring
+                            system.
+
+  """
+
+  def __init__(
+    self,
+    sample_rate: float=DEFAULT_SAMPLE_RATE,
+    max_samples: int=DEFAULT_MAX_SAMPLES,
+    load_time_buckets: Iterable[float]=DEFAULT_LOAD_TIME_BUCKETS,
+    sinks: Iterable[Callable[[List[Metric]], Any]]=(),
+  ) -> None:
+    if not (0.0 <= sample_rate <= 1.0):
+      raise ValueError(f"sample rate must be between 0 and 1 (sample_rate={sample_rate})")
+
+    self._sample_rate = sample_rate
+    self._max_samples = max_samples
+    self._load_time_buckets = tuple(load_time_buckets)
+    self._sinks = list(sinks)
+
+    # registries mapped to their counters
+    self._stats = weakref.WeakKeyDictionary()
+
+    # sampled untranslated messages mapped to numbers of their samples
+    self._samples = {}
+
+  def _attach(self, translations: Any, domain: str) -> _DomainStats:
+    """
+    Make counters for a translations registry, which updates them by itself.
+
+    """
+    result = _DomainStats(domain, self._load_time_buckets)
+    self._stats[translations] = result
+    return result
+
+  def _record_untranslated(
+    self,
+    stats: _DomainStats,
+    language: Optional[str],
+    context: Optional[str],
+    msgid: str,
+  ) -> None:
+    if language is None:
+      # no translations are expected without a language
+      return
+
+    stats.untranslated += 1
+
+    if random.random() >= self._sample_rate:
+      return
+
+    key = UntranslatedMessage(domain=stats.domain, language=language, context=context, msgid=msgid)
+
+    samples = self._samples
+    if key in samples:
+      samples[key] += 1
+    elif len(samples) < self._max_samples:
+      samples[key] = 1
+
+  def get_samples(self) -> Dict[UntranslatedMessage, int]:
+    """
+    Get sampled untranslated messages with numbers of their samples.
+
+    """
+    return dict(self._samples)
+
+  def clear_samples(self) -> None:
+    self._samples = {}
+
+  def get_metrics(self) -> List[Metric]:
+    """
+    Get current values of metrics of all registries, labeled by domains.
+    Values of registries with the same domain are summed up.
+
+    """
+    counters = {}
+    histograms = {}
+
+    for translations, stats in list(self._stats.items()):
+      domain = stats.domain
+      cache_info = translations.cache_info()
+
+      values = counters.setdefault(domain, {})
+      for name, kind, value in [
+        ("verboselib_lookups_total",                METRIC_KIND_COUNTER, stats.lookups),
+        ("verboselib_untranslated_total",           METRIC_KIND_COUNTER, stats.untranslated),
+        ("verboselib_catalog_cache_hits_total",     METRIC_KIND_COUNTER, cache_info.hits),
+        ("verboselib_catalog_cache_misses_total",   METRIC_KIND_COUNTER, cache_info.misses),
+        ("verboselib_catalog_evictions_total",      METRIC_KIND_COUNTER, cache_info.evictions),
+        ("verboselib_catalogs",                     METRIC_KIND_GAUGE,   cache_info.catalogs),
+        ("verboselib_catalogs_size_bytes",          METRIC_KIND_GAUGE,   cache_info.size),
+      ]:
+        values[(name, kind)] = values.get((name, kind), 0) + value
+
+      histogram = histograms.get(domain)
+      if histogram is None:
+        histogram = histograms[domain] = Histogram(self._load_time_buckets)
+
+      for i, count in enumerate(stats.load_time.counts):
+        histogram.counts[i] += count
+      histogram.sum += stats.load_time.sum
+      histogram.count += stats.load_time.count
+
+    result = []
+
+    for domain in sorted(counters):
+      labels = {"domain": domain}
+
+      for (name, kind), value in counters[domain].items():
+        result.append(Metric(name=name, kind=kind, labels=labels, value=value))
+
+      histogram = histograms[domain]
+      name = "verboselib_catalog_load_seconds"
+
+      for bound, count in histogram.get_cumulative_counts():
+        bucket_labels = dict(labels, le=("+Inf" if bound == float("inf") else repr(bound)))
+        result.append(Metric(name=f"{name}_bucket", kind=METRIC_KIND_HISTOGRAM, labels=bucket_labels, value=count))
+
+      result.append(Metric(name=f"{name}_sum",   kind=METRIC_KIND_HISTOGRAM, labels=labels, value=histogram.sum))
+      result.append(Metric(name=f"{name}_count", kind=METRIC_KIND_HISTOGRAM, labels=labels, value=histogram.count))
+
+    return result
+
+  def export(self) -> List[Metric]:
+    """
+    Pass current metrics to all sinks and return them.
+
+    """
+    result = self.get_metrics()
+
+    for sink in self._sinks:
+      sink(result)
+
+    return result
@@ -0,0 +1,188 @@
+import functools
+import sys
+
+if sys.version_info >= (3, 9):
+  from collections.abc import Callable
+  from collections.abc import Iterator
+
+  List  = list
+  Tuple = tuple
+
+else:
+  from typing import Callable
+  from typing import Iterator
+  from typing import List
+  from typing import Tuple
+
+from collections import UserString
+from typing import Any
+from typing import Union
+
+from ._utils import export
+
+
+_NOT_SET = object()
+
+
+def _unwrap(value: Any) -> Any:
+  if isinstance(value, UserString):
+    return value.data
+  return value
+
+
+@export
+class LazyTranslation(UserString):
+  """
+  A translated string with delayed evaluation.
+
+  A drop-in replacement of ``lazy_string.LazyString``: it's a proxy of a
+  string, which is evaluated via a call to ``func`` every time the value is
+  needed. Results of operations on the proxy are plain strings.
+
+  Additionally, if ``func`` is a bound method of a translations registry, the
+  evaluated value is memoized together with the language it was evaluated
+  for. The value is reused until the current language (as seen by the
+  registry) or the generation of catalogs of the registry changes. Values are
+  not memoized if any of arguments is callable, e.g., a lazy ``n`` of plural
+  forms, or if ``func`` is any other callable, as its result can depend on
+  anything.
+
+  :param func:   A bound method of a translations registry, e.g.,
+                 ``Translations.gettext``, or any callable returning a string.
+  :param args:   Positional arguments which will be passed to the ``func``.
+  :param kwargs: Keyword arguments which will be passed to the ``func``.
+
+  """
+
+  __slots__ = ("_func", "_args", "_kwargs", "_owner", "_cache", )
+
+  def __new__(cls, func: Union[Callable[..., str], str], *args: Any, **kwargs: Any) -> Any:
+    if isinstance(func, str):
+      # methods of 'UserString' wrap their results into 'self.__class__(...)',
+      # but results are plain strings, so there's nothing to wrap
+      return func
+
+    return object.__new__(cls)
+
+  def __init__(self, func: Callable[..., str], *args: Any, **kwargs: Any) -> None:
+    self._func = func
+    self._args = args
+    self._kwargs = kwargs
+
+    owner = getattr(func, "__self__", None)
+    is_cacheable = (
+          hasattr(owner, "generation")
+      and not any(callable(x) for x in args)
+      and not any(callable(x) for x in kwargs.values())
+    )
+    self._owner = owner if is_cacheable else None
+
+    # (language, generation, value), stored as a single tuple to be
+    # replaced atomically when used concurrently from multiple threads
+    self._cache = (_NOT_SET, None, None)
+
+  @property
+  def data(self) -> str:
+    owner = self._owner
+    if owner is None:
+      return self._func(*self._args, **self._kwargs)
+
+    language = owner.get_language()
+    generation = owner.generation
+
+    cached_language, cached_generation, value = self._cache
+    if cached_language == language and cached_generation == generation:
+      return value
+
+    value = self._func(*self._args, **self._kwargs)
+    self._cache = (language, generation, value)
+    return value
+
+  def __str__(self) -> str:
+    return str(self.data)
+
+  def __repr__(self) -> str:
+    try:
+      r = repr(str(self.data))
+      return f"{self.__class__.__name__}({r})"
+    except Exception:
+      return "<%s broken>" % self.__class__.__name__
+
+  def __format__(self, format_spec: str) -> str:
+    return format(self.data, format_spec)
+
+  def __int__(self) -> int:
+    return int(self.data)
+
+  def __float__(self) -> float:
+    return float(self.data)
+
+  def __complex__(self) -> complex:
+    return complex(self.data)
+
+  def __hash__(self) -> int:
+    return hash(self.data)
+
+  def __eq__(self, other: Any) -> bool:
+    return self.data == _unwrap(other)
+
+  def __ne__(self, other: Any) -> bool:
+    return self.data != _unwrap(other)
+
+  def __lt__(self, other: Any) -> bool:
+    return self.data < _unwrap(other)
+
+  def __le__(self, other: Any) -> bool:
+    return self.data <= _unwrap(other)
+
+  def __gt__(self, other: Any) -> bool:
+    return self.data > _unwrap(other)
+
+  def __ge__(self, other: Any) -> bool:
+    return self.data >= _unwrap(other)
+
+  def __contains__(self, char: Any) -> bool:
+    return _unwrap(char) in self.data
+
+  def __len__(self) -> int:
+    return len(self.data)
+
+  def __getitem__(self, index: Any) -> str:
+    return self.data[index]
+
+  def __iter__(self) -> Iterator[str]:
+    return iter(self.data)
+
+  def __add__(self, other: Any) -> str:
+    other = _unwrap(other)
+    if isinstance(other, str):
+      return self.data + other
+    return self.data + str(other)
+
+  def __radd__(self, other: Any) -> str:
+    if isinstance(other, str):
+      return other + self.data
+    return str(other) + self.data
+
+  def __mul__(self, n: int) -> str:
+    return self.data * n
+
+  __rmul__ = __mul__
+
+  def __mod__(self, args: Any) -> str:
+    return self.data % args
+
+  def __rmod__(self, template: Any) -> str:
+    return str(template) % self.data
+
+  def __getattr__(self, name: str) -> Any:
+    return getattr(self.data, name)
+
+  def __dir__(self) -> List[str]:
+    return dir(str)
+
+  def __copy__(self) -> "LazyTranslation":
+    return self
+
+  def __reduce__(self) -> Tuple[Callable[[], "LazyTranslation"], Tuple]:
+    return (functools.partial(self.__class__, self._func, *self._args, **self._kwargs), ())
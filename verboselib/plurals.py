@@ -0,0 +1,147 @@
+import functools
+import gettext as _gettext
+import sys
+
+if sys.version_info >= (3, 9):
+  from collections.abc import Callable
+else:
+  from typing import Callable
+
+from ._utils import export
+
+
+PluralFunction = Callable[[int], int]
+
+
+# Expressions of common plural rules as they are written by CLDR-based tools
+# and by the GNU gettext manual. For all of them the form of a number which
+# is greater than or equal to 100 depends only on the last two digits of the
+# number, so any such form can be looked up in a table of 100 entries.
+#
+# Expressions are normalized via '_normalize_expression()'.
+_PERIODIC_EXPRESSIONS = [
+  # Japanese, Chinese, Korean, Vietnamese, Thai, ...
+  "0",
+
+  # English, German, Dutch, Swedish, Spanish, Italian, ...
+  "n!=1",
+
+  # French, Brazilian Portuguese, Turkish, ...
+  "n>1",
+
+  # Latvian
+  "n%10==1&&n%100!=11?0:n!=0?1:2",
+
+  # Irish (simplified)
+  "n==1?0:n==2?1:2",
+
+  # Irish
+  "n==1?0:n==2?1:n<7?2:n<11?3:4",
+
+  # Romanian
+  "n==1?0:(n==0||(n%100>0&&n%100<20))?1:2",
+
+  # Lithuanian
+  "n%10==1&&n%100!=11?0:n%10>=2&&(n%100<10||n%100>=20)?1:2",
+
+  # Russian, Ukrainian, Belarusian, Serbian, Croatian, Bosnian
+  "n%10==1&&n%100!=11?0:n%10>=2&&n%10<=4&&(n%100<10||n%100>=20)?1:2",
+
+  # Czech, Slovak
+  "(n==1)?0:(n>=2&&n<=4)?1:2",
+  "n==1?0:(n>=2&&n<=4)?1:2",
+
+  # Polish
+  "n==1?0:n%10>=2&&n%10<=4&&(n%100<10||n%100>=20)?1:2",
+
+  # Slovenian
+  "n%100==1?0:n%100==2?1:n%100==3||n%100==4?2:3",
+
+  # Arabic
+  "n==0?0:n==1?1:n==2?2:n%100>=3&&n%100<=10?3:n%100>=11?4:5",
+
+  # Icelandic
+  "n%10!=1||n%100==11",
+]
+
+
+def _normalize_expression(expression: str) -> str:
+  """
+  Remove whitespace and parentheses enclosing the whole expression.
+
+  """
+  expression = "".join(expression.split())
+
+  while expression.startswith("(") and expression.endswith(")"):
+    depth = 0
+
+    for i, c in enumerate(expression):
+      if c == "(":
+        depth += 1
+      elif c == ")":
+        depth -= 1
+        if depth == 0 and i < len(expression) - 1:
+          # the opening parenthesis is closed before the end
+          return expression
+
+    expression = expression[1:-1]
+
+  return expression
+
+
+def _make_table_evaluator(generic: PluralFunction) -> PluralFunction:
+  """
+  Make an evaluator of a plural rule which is periodic for numbers >= 100.
+
+  Forms of numbers less than 200 are looked up directly, forms of greater
+  numbers are looked up by their last two digits. Anything other than
+  non-negative integers is passed to the generic evaluator.
+
+  """
+  forms = tuple(generic(n) for n in range(200))
+  periodic_forms = forms[100:]
+
+  if len(set(forms)) == 1:
+    form = forms[0]
+
+    def evaluate(n: int) -> int:
+      if n.__class__ is int and n >= 0:
+        return form
+      return generic(n)
+
+  else:
+    def evaluate(n: int) -> int:
+      if n.__class__ is int and n >= 0:
+        if n < 200:
+          return forms[n]
+        return periodic_forms[n % 100]
+      return generic(n)
+
+  return evaluate
+
+
+_known_expressions = {
+  _normalize_expression(x)
+  for x in _PERIODIC_EXPRESSIONS
+}
+
+
+@export
+@functools.lru_cache(maxsize=None)
+def compile_plural(expression: str) -> PluralFunction:
+  """
+  Make a function which evaluates a plural form for a number.
+
+  Common plural rules are evaluated via precomputed tables. Other rules are
+  compiled via ``gettext.c2py()``. Both variants have the same semantics.
+
+  :param expression: A C expression as used in 'Plural-Forms' header of
+                     catalogs, e.g., ``n != 1``.
+
+  """
+  generic = _gettext.c2py(expression)
+
+  if _normalize_expression(expression) in _known_expressions:
+    return _make_table_evaluator(generic)
+
+  return generic
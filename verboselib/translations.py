@@ -1,119 +1,988 @@
+import gc
 import gettext as _gettext
+import itertools
+import os
 import sys
 import threading
+import time
+import weakref
 
 if sys.version_info >= (3, 9):
   from collections.abc import Callable
+  from collections.abc import Iterable
+
+  Dict  = dict
+  List  = list
+  Tuple = tuple
+  Type  = type
+
 else:
   from typing import Callable
+  from typing import Dict
+  from typing import Iterable
+  from typing import List
+  from typing import Tuple
+  from typing import Type
 
-from pathlib import Path
+from typing import NamedTuple
+from typing import Optional
+from typing import TYPE_CHECKING
 from typing import Union
 
-from lazy_string import LazyString
-
+from .bundles import CatalogBundle
+from .catalogs import DictTranslations
 from .core import get_language
+from .core import LanguageState
+from .helpers import to_language
 from .helpers import to_locale
+from .lazy import LazyTranslation
 
 from ._utils import export
 
 
-StringOrPath = Union[str, Path]
+if TYPE_CHECKING:
+  from pathlib import Path
+
+  from .instrumentation import Instrumentation
+
+
+StringOrPath = Union[str, "Path"]
 MaybeLazyInteger = Union[int, Callable[..., int]]
 
 
+DEFAULT_MAX_MISSING_LOCALES = 1024
+
+# max number of languages mapped to loaded catalogs as they are set by users
+_MAX_LANGUAGES = 1024
+
+
+_registry = weakref.WeakSet()
+
+
+class _FileStat(NamedTuple):
+  inode:    int
+  size:     int
+  mtime_ns: int
+
+
+def _make_file_stat(stat: os.stat_result) -> _FileStat:
+  return _FileStat(inode=stat.st_ino, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+
+def _stat_files(file_paths: Iterable[str]) -> Tuple[Optional[_FileStat], ...]:
+  result = []
+
+  for file_path in file_paths:
+    try:
+      result.append(_make_file_stat(os.stat(file_path)))
+    except OSError:
+      result.append(None)
+
+  return tuple(result)
+
+
+def _close_catalog(catalog: _gettext.NullTranslations) -> None:
+  """
+  Release resources of an unloaded catalog and of its fallbacks right away,
+  e.g., files mapped by ``verboselib.MmapTranslations``.
+
+  """
+  while catalog is not None:
+    close = getattr(catalog, "close", None)
+    if close is not None:
+      close()
+    catalog = getattr(catalog, "_fallback", None)
+
+
+def _get_oldest_language(translations: Dict[Optional[str], _gettext.NullTranslations]) -> str:
+  # 'None' stands for no language and is always kept
+  return next(x for x in translations if x is not None)
+
+
+def _normalize_locale(language: str) -> str:
+  """
+  Make a locale name which is used as a key of a catalog.
+
+  Languages and locales like 'en-US', 'en-us' and 'en_US' result in the same
+  key, which is 'en_US'.
+
+  """
+  return to_locale(to_language(language))
+
+
+@export
+class CatalogInfo(NamedTuple):
+  """
+  Information about a loaded translations catalog.
+
+  :param locale:        Locale of the catalog. It's shared by variants of
+                        the locale which have no catalogs of their own,
+                        e.g., 'uk' is reported for 'uk-UA' as well.
+  :param file_paths:    Paths to loaded '.mo' files, including fallbacks.
+                        Empty if no files were found or if the catalog was
+                        loaded from a bundle.
+  :param size:          Total size of loaded files in bytes.
+  :param load_duration: Time spent on loading in seconds.
+
+  """
+  locale:        str
+  file_paths:    Tuple[str, ...]
+  size:          int
+  load_duration: float
+
+
+@export
+class CatalogsCacheInfo(NamedTuple):
+  """
+  Statistics of a cache of loaded translations catalogs.
+
+  Counters are not synchronized between threads, so they are approximate
+  under concurrent usage.
+
+  :param hits:         Number of lookups served by loaded catalogs or by
+                       the cache of missing locales.
+  :param misses:       Number of attempts to load catalogs.
+  :param evictions:    Number of catalogs evicted due to cache limits.
+  :param max_catalogs: Max number of loaded catalogs, if limited.
+  :param max_size:     Max total size of loaded catalogs in bytes, if limited.
+  :param catalogs:     Current number of loaded catalogs.
+  :param size:         Current total size of loaded catalogs in bytes.
+
+  """
+  hits:         int
+  misses:       int
+  evictions:    int
+  max_catalogs: Optional[int]
+  max_size:     Optional[int]
+  catalogs:     int
+  size:         int
+
+
 @export
 class NotThreadSafeTranslations:
+  """
+  Registry of translations catalogs of a single domain.
+
+  :param domain:              Name of the domain of translations.
+  :param locale_dir_path:     Path to the directory with translations
+                              catalogs, or a ``verboselib.CatalogBundle``
+                              to load catalogs from.
+  :param catalog_class:       Class used for loading '.mo' files. Defaults to
+                              ``verboselib.DictTranslations``, which loads
+                              each file into a dict. Use
+                              ``verboselib.MmapTranslations`` to memory-map
+                              files and to decode messages lazily.
+  :param max_missing_locales: Max number of locales remembered as having no
+                              catalogs. Lookups for such locales use a shared
+                              null catalog without probing the file system
+                              again.
+  :param max_catalogs:        Max number of catalogs to keep loaded. Least
+                              recently used catalogs are evicted once the
+                              limit is exceeded. Unlimited by default.
+  :param max_catalogs_size:   Max total size of loaded catalogs in bytes,
+                              approximated by sizes of their '.mo' files.
+                              Least recently used catalogs are evicted once
+                              the limit is exceeded. Unlimited by default.
+  :param language_state:      Storage of the current and the default
+                              languages, e.g.,
+                              ``verboselib.ContextVarLanguageState``. The
+                              global one is used if not specified.
+  :param reload_interval:     Check files of loaded catalogs for changes at
+                              most once per the given number of seconds and
+                              reload changed catalogs, e.g., after a hotfix
+                              of translations. Checks are made by lookups
+                              which come after the interval has passed.
+                              Disabled by default. Not supported for
+                              bundles.
+  :param instrumentation:     A ``verboselib.Instrumentation`` which collects
+                              metrics of lookups and loads of catalogs.
+                              Disabled by default.
+
+  """
 
-  def __init__(self, domain: str, locale_dir_path: StringOrPath):
+  def __init__(
+    self,
+    domain: str,
+    locale_dir_path: Union[StringOrPath, CatalogBundle],
+    catalog_class: Type[_gettext.NullTranslations]=DictTranslations,
+    max_missing_locales: int=DEFAULT_MAX_MISSING_LOCALES,
+    max_catalogs: Optional[int]=None,
+    max_catalogs_size: Optional[int]=None,
+    language_state: Optional[LanguageState]=None,
+    reload_interval: Optional[float]=None,
+    instrumentation: Optional["Instrumentation"]=None,
+  ):
     self._domain = domain
-    self._locale_dir_path = str(locale_dir_path)
+
+    if isinstance(locale_dir_path, CatalogBundle):
+      if reload_interval is not None:
+        raise ValueError("catalogs loaded from a bundle cannot be reloaded")
+
+      self._bundle = locale_dir_path
+      self._locale_dir_path = None
+    else:
+      self._bundle = None
+      self._locale_dir_path = str(locale_dir_path)
+
+    self._catalog_class = catalog_class
+    self._null_translation = _gettext.NullTranslations()
+
+    self._get_language = (
+      language_state.get_language
+      if language_state is not None
+      else get_language
+    )
+
+    # languages as they are set by users mapped to loaded catalogs
     self._translations = {
-      None: _gettext.NullTranslations(),
+      None: self._null_translation,
     }
 
+    # normalized locales mapped to loaded catalogs
+    self._catalogs = {}
+    self._catalog_infos = {}
+
+    # normalized locales mapped to stats of files of loaded catalogs
+    self._catalog_stats = {}
+
+    # normalized locales which have no catalogs (oldest first)
+    self._missing_locales = {}
+    self._max_missing_locales = max_missing_locales
+
+    self._max_catalogs = max_catalogs
+    self._max_catalogs_size = max_catalogs_size
+    self._is_cache_bounded = (max_catalogs is not None or max_catalogs_size is not None)
+
+    # catalogs mapped to "timestamps" of their last usage
+    self._last_used = {}
+    self._clock = itertools.count()
+
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+
+    # increases every time when previously loaded catalogs are dropped, which
+    # means their messages can differ after they are loaded again; used for
+    # invalidation of memoized values of lazy translations
+    self.generation = 0
+
+    self._reload_interval = reload_interval
+    self._next_reload_check_at = 0.0
+
+    self._instrumentation = instrumentation
+    self._instrumentation_stats = None
+
+    if instrumentation is not None:
+      self._instrumentation_stats = instrumentation._attach(self, domain)
+
+    _registry.add(self)
+
   def gettext(self, message: str) -> str:
-    return self._get_translation().gettext(message)
+    result = self._get_translation().gettext(message)
 
-  def gettext_lazy(self, message: str) -> LazyString:
-    return LazyString(
-      func=self.gettext,
-      message=message,
-    )
+    if self._instrumentation_stats is not None:
+      self._record_lookup(None, message, message, result)
+
+    return result
+
+  def gettext_lazy(self, message: str) -> LazyTranslation:
+    return LazyTranslation(self.gettext, message)
 
   def ngettext(self, singular: str, plural: str, n: MaybeLazyInteger) -> str:
     if callable(n):
       n = n()
-    return self._get_translation().ngettext(singular, plural, n)
-
-  def ngettext_lazy(self, singular: str, plural: str, n: MaybeLazyInteger) -> LazyString:
-    return LazyString(
-      func=self.ngettext,
-      singular=singular,
-      plural=plural,
-      n=n,
-    )
+    result = self._get_translation().ngettext(singular, plural, n)
+
+    if self._instrumentation_stats is not None:
+      self._record_lookup(None, singular, plural, result)
+
+    return result
+
+  def ngettext_lazy(self, singular: str, plural: str, n: MaybeLazyInteger) -> LazyTranslation:
+    return LazyTranslation(self.ngettext, singular, plural, n)
 
   def pgettext(self, context: str, message: str) -> str:
-    return self._get_translation().pgettext(context, message)
+    result = self._get_translation().pgettext(context, message)
 
-  def pgettext_lazy(self, context: str, message: str) -> LazyString:
-    return LazyString(
-      func=self.pgettext,
-      context=context,
-      message=message,
-    )
+    if self._instrumentation_stats is not None:
+      self._record_lookup(context, message, message, result)
+
+    return result
+
+  def pgettext_lazy(self, context: str, message: str) -> LazyTranslation:
+    return LazyTranslation(self.pgettext, context, message)
 
   def npgettext(self, context: str, singular: str, plural: str, n: MaybeLazyInteger) -> str:
     if callable(n):
       n = n()
-    return self._get_translation().npgettext(context, singular, plural, n)
-
-  def npgettext_lazy(self, context: str, singular: str, plural: str, n: MaybeLazyInteger) -> LazyString:
-    return LazyString(
-      func=self.npgettext,
-      context=context,
-      singular=singular,
-      plural=plural,
-      n=n,
+    result = self._get_translation().npgettext(context, singular, plural, n)
+
+    if self._instrumentation_stats is not None:
+      self._record_lookup(context, singular, plural, result)
+
+    return result
+
+  def npgettext_lazy(self, context: str, singular: str, plural: str, n: MaybeLazyInteger) -> LazyTranslation:
+    return LazyTranslation(self.npgettext, context, singular, plural, n)
+
+  def gettext_many(self, messages: Iterable[str]) -> List[str]:
+    """
+    Translate multiple messages at once.
+
+    The current language and its catalog are resolved only once for all
+    messages.
+
+    """
+    if self._instrumentation_stats is not None:
+      messages = list(messages)
+
+    gettext = self._get_translation().gettext
+    result = [gettext(x) for x in messages]
+
+    if self._instrumentation_stats is not None:
+      self._record_many([(None, x, x) for x in messages], result)
+
+    return result
+
+  def ngettext_many(self, messages: Iterable[Tuple[str, str, MaybeLazyInteger]]) -> List[str]:
+    """
+    Translate multiple messages with plural forms at once.
+
+    :param messages: Tuples of ``(singular, plural, n)``.
+
+    """
+    if self._instrumentation_stats is not None:
+      messages = list(messages)
+
+    ngettext = self._get_translation().ngettext
+    result = [
+      ngettext(singular, plural, (n() if callable(n) else n))
+      for singular, plural, n in messages
+    ]
+
+    if self._instrumentation_stats is not None:
+      self._record_many([(None, singular, plural) for singular, plural, __ in messages], result)
+
+    return result
+
+  def pgettext_many(self, messages: Iterable[Tuple[str, str]]) -> List[str]:
+    """
+    Translate multiple messages with contexts at once.
+
+    :param messages: Tuples of ``(context, message)``.
+
+    """
+    if self._instrumentation_stats is not None:
+      messages = list(messages)
+
+    pgettext = self._get_translation().pgettext
+    result = [
+      pgettext(context, message)
+      for context, message in messages
+    ]
+
+    if self._instrumentation_stats is not None:
+      self._record_many([(context, x, x) for context, x in messages], result)
+
+    return result
+
+  def npgettext_many(self, messages: Iterable[Tuple[str, str, str, MaybeLazyInteger]]) -> List[str]:
+    """
+    Translate multiple messages with contexts and plural forms at once.
+
+    :param messages: Tuples of ``(context, singular, plural, n)``.
+
+    """
+    if self._instrumentation_stats is not None:
+      messages = list(messages)
+
+    npgettext = self._get_translation().npgettext
+    result = [
+      npgettext(context, singular, plural, (n() if callable(n) else n))
+      for context, singular, plural, n in messages
+    ]
+
+    if self._instrumentation_stats is not None:
+      self._record_many([(context, singular, plural) for context, singular, plural, __ in messages], result)
+
+    return result
+
+  def preload(self, languages: Optional[Iterable[str]]=None) -> Dict[str, CatalogInfo]:
+    """
+    Load catalogs in advance, so that the first lookups do not pay for that.
+
+    :param languages: Languages to load catalogs for. If not specified,
+                      catalogs of all locales found in the locale dir
+                      are loaded.
+
+    :returns: Information about catalogs by their languages. Catalogs which
+              had been loaded before are reported as well.
+
+    """
+    if languages is None:
+      languages = self._find_languages()
+
+    result = {}
+
+    for language in languages:
+      if language not in self._translations:
+        self._resolve_translation(language)
+
+      locale = _normalize_locale(language)
+      info = self._catalog_infos.get(self._find_catalog_locale(locale))
+      if info is None:
+        info = CatalogInfo(locale=locale, file_paths=(), size=0, load_duration=0.0)
+
+      result[language] = info
+
+    return result
+
+  def _find_languages(self) -> List[str]:
+    if self._bundle is not None:
+      return sorted(to_language(x) for x in self._bundle.locales(self._domain))
+
+    file_name = f"{self._domain}.mo"
+    result = []
+
+    try:
+      entries = os.scandir(self._locale_dir_path)
+    except FileNotFoundError:
+      return result
+
+    with entries:
+      for entry in entries:
+        file_path = os.path.join(entry.path, "LC_MESSAGES", file_name)
+        if entry.is_dir() and os.path.isfile(file_path):
+          result.append(to_language(entry.name))
+
+    return sorted(result)
+
+  def cache_info(self) -> CatalogsCacheInfo:
+    infos = list(self._catalog_infos.values())
+    return CatalogsCacheInfo(
+      hits=self._hits,
+      misses=self._misses,
+      evictions=self._evictions,
+      max_catalogs=self._max_catalogs,
+      max_size=self._max_catalogs_size,
+      catalogs=len(infos),
+      size=sum(x.size for x in infos),
     )
 
+  def cache_clear(self) -> None:
+    """
+    Unload all catalogs, forget missing locales and reset statistics.
+
+    """
+    catalogs = list(self._catalogs.values())
+
+    self._translations = {
+      None: self._null_translation,
+    }
+    self._catalogs = {}
+    self._catalog_infos = {}
+    self._catalog_stats = {}
+    self._missing_locales = {}
+    self._last_used = {}
+
+    for catalog in catalogs:
+      _close_catalog(catalog)
+
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+
+    self.generation += 1
+
+  def get_language(self) -> Optional[str]:
+    """
+    Get the language which is used for translations by this registry now.
+
+    """
+    # is used by lazy translations to validate their memoized values
+    if self._reload_interval is not None:
+      self._maybe_check_reload()
+
+    return self._get_language()
+
+  def reload_catalogs(self) -> List[str]:
+    """
+    Check files of loaded catalogs for changes and reload changed catalogs
+    right away, regardless of ``reload_interval``. Catalogs whose files are
+    removed are unloaded. Catalogs which fail to load are kept as they are.
+
+    Readers keep using previous catalogs until new ones are swapped in.
+
+    :returns: Locales of reloaded or unloaded catalogs.
+
+    """
+    result = []
+
+    for locale, info in list(self._catalog_infos.items()):
+      if _stat_files(info.file_paths) == self._catalog_stats.get(locale):
+        continue
+
+      try:
+        loaded = self._read_catalog(locale)
+      except (OSError, ValueError):
+        # the file may be incomplete or invalid for a while, so the check
+        # is repeated next time
+        continue
+
+      old = self._catalogs.pop(locale)
+      self._misses += 1
+
+      if loaded is None:
+        del self._catalog_infos[locale]
+        del self._catalog_stats[locale]
+        self._remove_translation(old)
+        self._last_used.pop(old, None)
+        _close_catalog(old)
+
+      else:
+        translation, info, stats = loaded
+        self._record_load(info)
+        self._catalogs[locale] = translation
+        self._catalog_infos[locale] = info
+        self._catalog_stats[locale] = stats
+        self._replace_translation(old, translation)
+
+        if self._is_cache_bounded:
+          self._last_used[translation] = self._last_used.pop(old, next(self._clock))
+          self._evict_catalogs(keep=locale)
+
+        _close_catalog(old)
+
+      result.append(locale)
+
+    if result:
+      self.generation += 1
+
+    return result
+
+  def _try_reload_catalogs(self) -> None:
+    self.reload_catalogs()
+
+  def _maybe_check_reload(self) -> None:
+    """
+    Check files of loaded catalogs for changes, at most once per
+    ``reload_interval``.
+
+    """
+    now = time.monotonic()
+    if now >= self._next_reload_check_at:
+      self._next_reload_check_at = now + self._reload_interval
+      self._try_reload_catalogs()
+
+  def _record_lookup(
+    self,
+    context: Optional[str],
+    singular: str,
+    plural: str,
+    result: str,
+  ) -> None:
+    """
+    Record a lookup of a message into stats of instrumentation. Messages
+    without plural forms are their own plurals.
+
+    """
+    stats = self._instrumentation_stats
+    stats.lookups += 1
+    if result is singular or result is plural:
+      self._instrumentation._record_untranslated(stats, self._get_language(), context, singular)
+
+  def _record_many(
+    self,
+    messages: List[Tuple[Optional[str], str, str]],
+    results: List[str],
+  ) -> None:
+    """
+    Record lookups of multiple messages given as tuples of
+    ``(context, singular, plural)``, where messages without plural forms are
+    their own plurals.
+
+    """
+    stats = self._instrumentation_stats
+    stats.lookups += len(results)
+
+    language = None
+
+    for (context, singular, plural), result in zip(messages, results):
+      if result is singular or result is plural:
+        if language is None:
+          language = self._get_language()
+        self._instrumentation._record_untranslated(stats, language, context, singular)
+
   def _get_translation(self) -> _gettext.NullTranslations:
-    language = get_language()
+    if self._reload_interval is not None:
+      self._maybe_check_reload()
+
+    language = self._get_language()
 
     translation = self._translations.get(language)
-    if not translation:
-      locale = to_locale(language)
-      translation = _gettext.translation(
-        domain=self._domain,
-        localedir=self._locale_dir_path,
-        languages=[locale, ],
-        fallback=True,
-      )
-      self._translations[language] = translation
+    if translation is None:
+      return self._resolve_translation(language)
+
+    if self._is_cache_bounded:
+      self._last_used[translation] = next(self._clock)
+
+    self._hits += 1
+    return translation
+
+  def _resolve_translation(self, language: str) -> _gettext.NullTranslations:
+    locale = _normalize_locale(language)
+
+    if locale in self._missing_locales:
+      self._hits += 1
+      return self._null_translation
+
+    return self._load_translation(language, locale)
 
+  def _load_translation(self, language: str, locale: str) -> _gettext.NullTranslations:
+    if locale in self._missing_locales:
+      return self._null_translation
+
+    translation = self._catalogs.get(locale)
+    if translation is None:
+      translation = self._load_catalog(locale)
+    else:
+      self._hits += 1
+
+    if translation is None:
+      self._add_missing_locale(locale)
+      return self._null_translation
+
+    if self._is_cache_bounded:
+      self._last_used[translation] = next(self._clock)
+
+    self._add_translation(language, translation)
     return translation
 
+  def _read_catalog(
+    self,
+    locale: str,
+  ) -> Optional[Tuple[_gettext.NullTranslations, CatalogInfo, Tuple[_FileStat, ...]]]:
+    """
+    Load files of a catalog without registering it. Returns the catalog, its
+    info and stats of its files, or ``None`` if there are no files.
+
+    """
+    if self._bundle is not None:
+      return self._read_bundle_catalog(locale)
+
+    started_at = time.perf_counter()
+
+    file_paths = _gettext.find(
+      domain=self._domain,
+      localedir=self._locale_dir_path,
+      languages=[locale, ],
+      all=True,
+    )
+    if not file_paths:
+      return None
+
+    result = None
+    stats = []
+
+    for file_path in file_paths:
+      with open(file_path, "rb") as f:
+        stats.append(_make_file_stat(os.fstat(f.fileno())))
+        catalog = self._catalog_class(f)
+
+      if result is None:
+        result = catalog
+      else:
+        result.add_fallback(catalog)
+
+    info = CatalogInfo(
+      locale=locale,
+      file_paths=tuple(file_paths),
+      size=sum(x.size for x in stats),
+      load_duration=(time.perf_counter() - started_at),
+    )
+
+    return result, info, tuple(stats)
+
+  def _read_bundle_catalog(
+    self,
+    locale: str,
+  ) -> Optional[Tuple[_gettext.NullTranslations, CatalogInfo, Tuple[_FileStat, ...]]]:
+    started_at = time.perf_counter()
+
+    locales = self._bundle.find(self._domain, locale)
+    if not locales:
+      return None
+
+    result = None
+    size = 0
+
+    for name in locales:
+      catalog = self._bundle.load(self._domain, name, self._catalog_class)
+      size += len(self._bundle.get(self._domain, name))
+
+      if result is None:
+        result = catalog
+      else:
+        result.add_fallback(catalog)
+
+    info = CatalogInfo(
+      locale=locale,
+      file_paths=(),
+      size=size,
+      load_duration=(time.perf_counter() - started_at),
+    )
+
+    return result, info, ()
+
+  def _find_catalog_locale(self, locale: str) -> Optional[str]:
+    """
+    Find the locale of the catalog which would be loaded for a locale, e.g.,
+    'uk' for 'uk_UA' if there is no catalog of 'uk_UA'. Returns ``None`` if
+    there are no catalogs.
+
+    """
+    if self._bundle is not None:
+      locales = self._bundle.find(self._domain, locale)
+      return locales[0] if locales else None
+
+    file_path = _gettext.find(
+      domain=self._domain,
+      localedir=self._locale_dir_path,
+      languages=[locale, ],
+    )
+    if file_path is None:
+      return None
+
+    # '<locale dir>/<locale>/LC_MESSAGES/<domain>.mo'
+    return os.path.basename(os.path.dirname(os.path.dirname(file_path)))
+
+  def _load_catalog(self, locale: str) -> Optional[_gettext.NullTranslations]:
+    # catalogs are keyed by their own locales rather than by requested ones,
+    # so all variants of a language without catalogs of their own, e.g.,
+    # 'uk_UA' and 'uk_XX', share a single catalog
+    catalog_locale = self._find_catalog_locale(locale)
+
+    if catalog_locale is not None:
+      result = self._catalogs.get(catalog_locale)
+      if result is not None:
+        self._hits += 1
+        return result
+
+    self._misses += 1
+
+    if catalog_locale is None:
+      return None
+
+    loaded = self._read_catalog(catalog_locale)
+    if loaded is None:
+      return None
+
+    result, info, stats = loaded
+    self._record_load(info)
+
+    self._catalogs[catalog_locale] = result
+    self._catalog_infos[catalog_locale] = info
+    self._catalog_stats[catalog_locale] = stats
+
+    if self._is_cache_bounded:
+      self._last_used[result] = next(self._clock)
+      self._evict_catalogs(keep=catalog_locale)
+
+    return result
+
+  def _record_load(self, info: CatalogInfo) -> None:
+    if self._instrumentation_stats is not None:
+      self._instrumentation_stats.load_time.observe(info.load_duration)
+
+  def _is_cache_overflown(self) -> bool:
+    if self._max_catalogs is not None and len(self._catalogs) > self._max_catalogs:
+      return True
+
+    if self._max_catalogs_size is not None:
+      size = sum(x.size for x in self._catalog_infos.values())
+      if size > self._max_catalogs_size:
+        return True
+
+    return False
+
+  def _evict_catalogs(self, keep: str) -> None:
+    while self._is_cache_overflown():
+      candidates = [
+        (self._last_used.get(translation, -1), locale)
+        for locale, translation in self._catalogs.items()
+        if locale != keep
+      ]
+      if not candidates:
+        break
+
+      __, locale = min(candidates)
+      translation = self._catalogs.pop(locale)
+      del self._catalog_infos[locale]
+      del self._catalog_stats[locale]
+      self._remove_translation(translation)
+      _close_catalog(translation)
+      self._evictions += 1
+      self.generation += 1
+
+    # usage of evicted catalogs can still be recorded by concurrent lookups,
+    # so the mapping is rebuilt rather than updated to drop such leftovers
+    loaded = set(self._catalogs.values())
+    self._last_used = {
+      translation: timestamp
+      for translation, timestamp in list(self._last_used.items())
+      if translation in loaded
+    }
+
+  def _add_missing_locale(self, locale: str) -> None:
+    if len(self._missing_locales) >= self._max_missing_locales:
+      oldest = next(iter(self._missing_locales), None)
+      self._missing_locales.pop(oldest, None)
+
+    self._missing_locales[locale] = None
+
+  def _add_translation(self, language: str, translation: _gettext.NullTranslations) -> None:
+    if len(self._translations) > _MAX_LANGUAGES:
+      # languages can come from users, e.g., from headers of requests, so
+      # the oldest ones are forgotten to keep the mapping bounded
+      del self._translations[_get_oldest_language(self._translations)]
+
+    self._translations[language] = translation
+
+  def _remove_translation(self, translation: _gettext.NullTranslations) -> None:
+    for language, value in list(self._translations.items()):
+      if value is translation:
+        del self._translations[language]
+
+  def _replace_translation(
+    self,
+    old: _gettext.NullTranslations,
+    new: _gettext.NullTranslations,
+  ) -> None:
+    for language, value in list(self._translations.items()):
+      if value is old:
+        self._translations[language] = new
+
 
 @export
 class Translations(NotThreadSafeTranslations):
+  """
+  Thread-safe registry of translations catalogs.
+
+  Lookups of already loaded catalogs do not acquire any locks. The mapping of
+  languages to loaded catalogs is never modified in place: it is replaced by
+  an updated copy whenever a new language is added, so readers always see
+  a consistent mapping. Only loading of catalogs, which happens once per
+  locale, is serialized.
 
-  def __init__(self, domain: str, locale_dir_path: StringOrPath):
-    super().__init__(domain=domain, locale_dir_path=locale_dir_path)
+  """
+
+  def __init__(
+    self,
+    domain: str,
+    locale_dir_path: Union[StringOrPath, CatalogBundle],
+    catalog_class: Type[_gettext.NullTranslations]=DictTranslations,
+    max_missing_locales: int=DEFAULT_MAX_MISSING_LOCALES,
+    max_catalogs: Optional[int]=None,
+    max_catalogs_size: Optional[int]=None,
+    language_state: Optional[LanguageState]=None,
+    reload_interval: Optional[float]=None,
+    instrumentation: Optional["Instrumentation"]=None,
+  ):
+    super().__init__(
+      domain=domain,
+      locale_dir_path=locale_dir_path,
+      catalog_class=catalog_class,
+      max_missing_locales=max_missing_locales,
+      max_catalogs=max_catalogs,
+      max_catalogs_size=max_catalogs_size,
+      language_state=language_state,
+      reload_interval=reload_interval,
+      instrumentation=instrumentation,
+    )
     self._lock = threading.RLock()
 
-  def gettext(self, message: str) -> str:
+  def _load_translation(self, language: str, locale: str) -> _gettext.NullTranslations:
     with self._lock:
-      return super().gettext(message=message)
+      # another thread might have loaded the catalog while this one was waiting
+      return super()._load_translation(language, locale)
 
-  def ngettext(self, singular: str, plural: str, n: MaybeLazyInteger) -> str:
+  def cache_clear(self) -> None:
     with self._lock:
-      return super().ngettext(singular=singular, plural=plural, n=n)
+      super().cache_clear()
 
-  def pgettext(self, context: str, message: str) -> str:
+  def reload_catalogs(self) -> List[str]:
     with self._lock:
-      return super().pgettext(context=context, message=message)
+      return super().reload_catalogs()
 
-  def npgettext(self, context: str, singular: str, plural: str, n: MaybeLazyInteger) -> str:
-    with self._lock:
-      return super().npgettext(context=context, singular=singular, plural=plural, n=n)
+  def _try_reload_catalogs(self) -> None:
+    # lookups never wait for a reload made by another thread: they keep
+    # using current catalogs meanwhile
+    if not self._lock.acquire(blocking=False):
+      return
+
+    try:
+      super().reload_catalogs()
+    finally:
+      self._lock.release()
+
+  def _add_translation(self, language: str, translation: _gettext.NullTranslations) -> None:
+    translations = dict(self._translations)
+    if len(translations) > _MAX_LANGUAGES:
+      del translations[_get_oldest_language(translations)]
+
+    translations[language] = translation
+    self._translations = translations
+
+  def _remove_translation(self, translation: _gettext.NullTranslations) -> None:
+    self._translations = {
+      language: value
+      for language, value in self._translations.items()
+      if value is not translation
+    }
+
+  def _replace_translation(
+    self,
+    old: _gettext.NullTranslations,
+    new: _gettext.NullTranslations,
+  ) -> None:
+    self._translations = {
+      language: (new if value is old else value)
+      for language, value in self._translations.items()
+    }
+
+
+@export
+def preload_translations(
+  languages: Optional[Iterable[str]]=None,
+  freeze_gc: bool=False,
+) -> Dict[NotThreadSafeTranslations, Dict[str, CatalogInfo]]:
+  """
+  Preload catalogs of all existing instances of translations registries.
+
+  Intended to be called in a parent process before forking worker processes,
+  e.g., from a ``pre_fork`` hook of ``gunicorn``. This way the cost of loading
+  is paid only once and loaded catalogs are shared with children via
+  copy-on-write memory pages.
+
+  :param languages: Languages to load catalogs for. If not specified, all
+                    catalogs found in locale dirs of registries are loaded.
+  :param freeze_gc: Move all objects tracked by the garbage collector into the
+                    permanent generation via ``gc.freeze()``. This prevents
+                    garbage collections in children from touching (and hence
+                    from copying) memory pages occupied by preloaded catalogs.
+
+  :returns: Information about catalogs by their languages for each registry.
+
+  """
+  if languages is not None:
+    languages = list(languages)
+
+  result = {
+    translations: translations.preload(languages)
+    for translations in list(_registry)
+  }
+
+  if freeze_gc:
+    gc.freeze()
+
+  return result